@@ -56,6 +56,10 @@ class ProgressWindow:
         # NUEVA VARIABLE: Archivo de cancelación específico
         self.cancel_file = self.progress_file.replace('.json', '_cancel.json')
         
+        # Función que pide la cancelación al proceso en ejecución (tubería de entrada estándar);
+        # sin ella se usa el archivo de cancelación
+        self.cancel_handler = None
+        
         # Referencias para contenedores dinámicos
         self.main_container = None
         self.progress_section = None
@@ -156,7 +160,8 @@ class ProgressWindow:
         """FUNCIÓN CORREGIDA: Cancelar el proceso con manejo robusto de errores"""
         if messagebox.askyesno("Confirmar Cancelación", 
                               "¿Está seguro que desea cancelar el proceso de optimización?\n\n"
-                              "Esto detendrá inmediatamente todas las iteraciones en curso."):
+                              "Esto detendrá inmediatamente todas las iteraciones en curso.\n"
+                              "Se mostrarán los mejores modelos encontrados hasta ahora."):
             
             print("Usuario solicitó cancelación del proceso")
             
@@ -164,8 +169,10 @@ class ProgressWindow:
             self.cancelled = True
             self.animation_running = False
             
-            # Intentar crear archivo de cancelación
-            cancel_success = self.create_cancellation_file()
+            # Avisar al proceso por su entrada estándar o, si no es posible, con el archivo de cancelación
+            cancel_success = self.cancel_handler() if self.cancel_handler else False
+            if not cancel_success:
+                cancel_success = self.create_cancellation_file()
             
             # ACTUALIZAR INTERFAZ INMEDIATAMENTE (independiente del éxito del archivo)
             self.update_cancellation_ui()
@@ -323,7 +330,7 @@ class ProgressWindow:
         
         return info_frame
 
-    def create_results_section(self, parent, top_models):
+    def create_results_section(self, parent, top_models, partial=False):
         """NUEVA FUNCIÓN: Crear sección de resultados integrada - COLORES CORPORATIVOS"""
         # Crear frame principal para resultados con el mismo estilo - COLOR CORPORATIVO
         results_frame = tk.Frame(parent, bg='#f0f9f0', relief='solid', bd=1)  # Verde muy claro corporativo
@@ -334,7 +341,7 @@ class ProgressWindow:
         header_frame.pack_propagate(False)
         
         tk.Label(header_frame,
-                text="🎉 RESULTADOS DE LA OPTIMIZACIÓN",
+                text="RESULTADOS PARCIALES DE LA OPTIMIZACIÓN" if partial else "🎉 RESULTADOS DE LA OPTIMIZACIÓN",
                 font=('Segoe UI', 14, 'bold'),
                 bg='#0d9648', fg='white').pack(pady=12)
         
@@ -371,12 +378,14 @@ class ProgressWindow:
         info_frame.pack(fill='x', padx=15, pady=10)
         
         tk.Label(info_frame,
-                text="✅ Bridge de Parámetros Actualizado",
+                text="⚠ Bridge de Parámetros sin Cambios" if partial else "✅ Bridge de Parámetros Actualizado",
                 font=('Segoe UI', 10, 'bold'),
                 bg='#e8f5e8', fg='#0d9648').pack(pady=5)  # Verde oscuro corporativo
         
         tk.Label(info_frame,
-                text="Los presets del selector de parámetros han sido actualizados automáticamente\ncon estos modelos optimizados.",
+                text=("Búsqueda cancelada: estos son los mejores modelos evaluados antes de cancelar.\n"
+                      "Los presets del selector de parámetros se conservan." if partial else
+                      "Los presets del selector de parámetros han sido actualizados automáticamente\ncon estos modelos optimizados."),
                 font=('Segoe UI', 9),
                 bg='#e8f5e8', fg='#0d9648',  # Verde oscuro corporativo
                 justify='center').pack(pady=(0, 5))
@@ -511,14 +520,18 @@ class ProgressWindow:
             print(f"Error en animación: {e}")
             self.animation_running = False
 
-    def update_progress(self, percentage, status, current_model="", iteration_info=""):
-        """Actualizar la información de progreso"""
+    def update_progress(self, percentage, status, current_model="", iteration_info="", remaining_seconds=None):
+        """Actualizar la información de progreso (con presupuesto de tiempo se muestra el tiempo restante)"""
         # Si está cancelado, no actualizar más
         if self.cancelled:
             return
             
         try:
-            self.percentage_var.set(f"{percentage:.1f}%")
+            if remaining_seconds is not None:
+                minutos, segundos = divmod(int(remaining_seconds), 60)
+                self.percentage_var.set(f"{minutos}:{segundos:02d}")
+            else:
+                self.percentage_var.set(f"{percentage:.1f}%")
             self.progress_bar['value'] = percentage
             self.iteration_var.set(status if status else "Procesando...")
             
@@ -550,8 +563,12 @@ class ProgressWindow:
             print(f"Error en check_and_show_results: {e}")
             self.show_completion_message()
 
-    def show_results(self, top_models):
-        """MÉTODO MODIFICADO: Transformar la interfaz para mostrar resultados - COLORES CORPORATIVOS"""
+    def show_results(self, top_models, partial=False):
+        """
+        MÉTODO MODIFICADO: Transformar la interfaz para mostrar resultados - COLORES CORPORATIVOS
+        
+        Con partial=True se muestran los mejores modelos de una búsqueda cancelada, sin actualizar el bridge
+        """
         try:
             if self.results_shown:
                 return
@@ -562,9 +579,14 @@ class ProgressWindow:
             print(f"show_results: Transformando interfaz para mostrar {len(top_models)} modelos")
             
             # PASO 1: Actualizar header - COLOR CORPORATIVO
-            self.title_label.config(text="✅ Optimización Completada Exitosamente",
-                                   bg='#0d9648')  # Verde oscuro corporativo
-            self.header_frame.config(bg='#0d9648')
+            if partial:
+                self.title_label.config(text="⚠ Optimización Cancelada - Resultados Parciales",
+                                       bg='#a1a1a5')  # Color corporativo gris
+                self.header_frame.config(bg='#a1a1a5')
+            else:
+                self.title_label.config(text="✅ Optimización Completada Exitosamente",
+                                       bg='#0d9648')  # Verde oscuro corporativo
+                self.header_frame.config(bg='#0d9648')
             
             # PASO 2: Ocultar sección de progreso
             self.progress_section.pack_forget()
@@ -573,14 +595,14 @@ class ProgressWindow:
             self.info_section.pack_forget()
             
             # PASO 4: Crear y mostrar sección de resultados
-            self.results_section = self.create_results_section(self.main_container, top_models)
+            self.results_section = self.create_results_section(self.main_container, top_models, partial)
             self.results_section.pack(fill='both', expand=True, pady=(0, 15))
             
             # PASO 5: Actualizar botones - COLORES CORPORATIVOS
             self.cancel_btn.configure(
                 state='disabled',
                 bg='#a1a1a5',  # Color corporativo gris
-                text="COMPLETADO"
+                text="CANCELADO" if partial else "COMPLETADO"
             )
             
             self.close_btn.configure(
@@ -589,8 +611,9 @@ class ProgressWindow:
                 text="CERRAR RESULTADOS"
             )
             
-            # PASO 6: Actualizar bridge
-            self.update_bridge_with_results(top_models)
+            # PASO 6: Actualizar bridge (no con los resultados de una búsqueda cancelada)
+            if not partial:
+                self.update_bridge_with_results(top_models)
             
             # PASO 7: Redimensionar ventana si es necesario
             # PASO 7: Redimensionar ventana si es necesario
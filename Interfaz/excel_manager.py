@@ -2,12 +2,18 @@
 """
 Gestor global para manejar la carga y validación de archivos Excel
 """
-import pandas as pd
 import os
-from typing import Optional, Dict, Any
+import time
+import tempfile
+import importlib
+from typing import TYPE_CHECKING, Optional, Dict, Any
 import tkinter as tk
 from tkinter import filedialog, messagebox
 
+if TYPE_CHECKING:
+    # Solo para las anotaciones: pandas se importa al primer uso
+    import pandas as pd
+
 # AGREGAR: Importar sistema de rutas PyInstaller
 try:
     from path_utils import path_manager, get_temp_file, cleanup_old_temp_files, is_frozen
@@ -17,6 +23,19 @@ except ImportError:
     PATH_UTILS_AVAILABLE = False
     print("Sistema de rutas no disponible en excel_manager.py - modo compatibilidad")
 
+
+def _get_backend_module(module_name: str):
+    """Módulo del backend (cache_excel, datos_saidi, serie_compartida, canal_progreso) o None si no está disponible"""
+    # Se importa al primer uso: importa pandas, que la interfaz carga en segundo plano
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        try:
+            return importlib.import_module(f"backend.{module_name}")
+        except ImportError:
+            return None
+
+
 class ExcelManager:
     """Gestor singleton para manejar archivos Excel globalmente"""
     
@@ -24,6 +43,7 @@ class ExcelManager:
     _excel_data = None
     _file_path = None
     _validated = False
+    _shared_data_file = None
     
     def __new__(cls):
         if cls._instance is None:
@@ -58,10 +78,10 @@ class ExcelManager:
             try:
                 # Primero intentar leer la Hoja1, si no existe, leer la primera hoja
                 try:
-                    df = pd.read_excel(file_path, sheet_name="Hoja1")
+                    df = cls.read_sheet(file_path, sheet_name="Hoja1")
                 except:
                     # Si no hay Hoja1, leer la primera hoja disponible
-                    df = pd.read_excel(file_path, sheet_name=0)
+                    df = cls.read_sheet(file_path, sheet_name=0)
                     
             except Exception as e:
                 print(f"Error al leer Excel: {str(e)}")
@@ -74,6 +94,7 @@ class ExcelManager:
                 cls._excel_data = df
                 cls._file_path = file_path
                 cls._validated = True
+                cls._discard_shared_data()
                 
                 print("Archivo Excel cargado y validado exitosamente")
                 print(f"Dimensiones: {df.shape[0]} filas x {df.shape[1]} columnas")
@@ -125,7 +146,7 @@ class ExcelManager:
                 
             # Intentar cargar el archivo
             print(f"Cargando archivo: {file_path}")
-            df = pd.read_excel(file_path, sheet_name="Hoja1")
+            df = cls.read_sheet(file_path, sheet_name="Hoja1")
             
             # Validar estructura del archivo
             validation_result = cls._validate_excel_structure(df, file_path)
@@ -134,6 +155,7 @@ class ExcelManager:
                 cls._excel_data = df
                 cls._file_path = file_path
                 cls._validated = True
+                cls._discard_shared_data()
                 
                 print("Archivo Excel cargado y validado exitosamente")
                 print(f"Dimensiones: {df.shape[0]} filas x {df.shape[1]} columnas")
@@ -171,8 +193,74 @@ class ExcelManager:
             return False
     
     @classmethod
-    def _validate_excel_structure(cls, df: pd.DataFrame, file_path: str) -> Dict[str, Any]:
+    def read_sheet(cls, file_path: str, sheet_name=0, nrows: Optional[int] = None) -> 'pd.DataFrame':
+        """
+        Leer una hoja como pd.read_excel; el libro se lee una sola vez y las lecturas
+        siguientes (de la interfaz o de los scripts del backend) usan la cache de Excel
+        """
+        workbook_cache = _get_backend_module('cache_excel')
+        if workbook_cache is not None:
+            return workbook_cache.leer_hoja(file_path, sheet_name, nrows=nrows)
+        
+        # pandas se importa al primer uso (o antes, en segundo plano, desde main_interface)
+        import pandas as pd
+        return pd.read_excel(file_path, sheet_name=sheet_name, nrows=nrows)
+    
+    @classmethod
+    def describe_workbook(cls, file_path: str) -> Dict[str, tuple]:
+        """Dimensiones (filas, columnas) de cada hoja del libro"""
+        workbook_cache = _get_backend_module('cache_excel')
+        if workbook_cache is not None:
+            return workbook_cache.describir_libro(file_path)
+        
+        import pandas as pd
+        return {name: df.shape for name, df in pd.read_excel(file_path, sheet_name=None).items()}
+    
+    @classmethod
+    def get_shared_data_file(cls, file_path: str) -> Optional[str]:
+        """
+        Archivo binario con la serie ya preparada para los scripts del backend (--data)
+        Se escribe una vez por archivo cargado; None si file_path no es el Excel cargado o si el
+        archivo no se pudo crear (los scripts leen entonces el Excel)
+        """
+        if not cls.is_excel_loaded() or os.path.abspath(file_path) != os.path.abspath(cls._file_path):
+            return None
+        if cls._shared_data_file and os.path.exists(cls._shared_data_file):
+            return cls._shared_data_file
+        
+        datos_saidi = _get_backend_module('datos_saidi')
+        serie_compartida = _get_backend_module('serie_compartida')
+        if datos_saidi is None or serie_compartida is None:
+            return None
+        
+        # Nombre único por carga: en Windows no se puede reemplazar un archivo que otro proceso tiene mapeado
+        file_name = f"serie_compartida_{os.getpid()}_{time.time_ns()}.bin"
+        shared_file = get_temp_file(file_name) if PATH_UTILS_AVAILABLE else os.path.join(tempfile.gettempdir(), file_name)
+        try:
+            datos = datos_saidi.preparar_hoja_saidi(cls._excel_data.copy())
+            serie_compartida.guardar_serie(datos, shared_file)
+        except (OSError, ValueError) as e:
+            print(f"Warning: No se pudo crear la serie compartida: {e}")
+            return None
+        
+        cls._discard_shared_data()
+        cls._shared_data_file = shared_file
+        return shared_file
+    
+    @classmethod
+    def _discard_shared_data(cls):
+        """Eliminar el archivo de serie compartida de la carga anterior (si ningún proceso lo usa)"""
+        shared_file, cls._shared_data_file = cls._shared_data_file, None
+        if shared_file and os.path.exists(shared_file):
+            try:
+                os.remove(shared_file)
+            except OSError:
+                pass
+    
+    @classmethod
+    def _validate_excel_structure(cls, df: 'pd.DataFrame', file_path: str) -> Dict[str, Any]:
         """Validar que el Excel tenga la estructura correcta para SAIDI"""
+        import pandas as pd
         try:
             # Verificar que no esté vacío
             if df.empty:
@@ -233,7 +321,7 @@ class ExcelManager:
         return cls._validated and cls._excel_data is not None
     
     @classmethod
-    def get_excel_data(cls) -> Optional[pd.DataFrame]:
+    def get_excel_data(cls) -> Optional['pd.DataFrame']:
         """Obtener los datos del Excel cargado"""
         if cls.is_excel_loaded():
             return cls._excel_data.copy()  # Retornar copia para evitar modificaciones
@@ -257,6 +345,7 @@ class ExcelManager:
         cls._excel_data = None
         cls._file_path = None
         cls._validated = False
+        cls._discard_shared_data()
         
         # Limpiar archivos temporales si path_utils está disponible
         if PATH_UTILS_AVAILABLE:
@@ -4,21 +4,23 @@ Aplicación principal SAIDI Analysis Pro
 Lógica de negocio con gestión de rutas compatible con PyInstaller
 """
 import tkinter as tk
-from tkinter import messagebox, filedialog
+from tkinter import messagebox, filedialog, simpledialog
 import subprocess
+import importlib
 import sys
 import os
 import threading
 import tempfile
 import json
 import time
-import pandas as pd
 import logging
+from datetime import datetime
 
 # Importar sistema de rutas para PyInstaller
 try:
     from path_utils import (
-        path_manager, get_modelo_script, get_parametro_script, get_visual_script,
+        path_manager, get_modelo_script, get_parametro_script, get_visual_script, get_lote_script,
+        get_analisis_script, get_servidor_script,
         create_progress_file, cleanup_old_temp_files, verify_project_structure,
         is_frozen
     )
@@ -30,10 +32,18 @@ except ImportError as e:
     print("  Funcionando en modo compatibilidad (solo desarrollo)")
 
 # Importar módulos locales
-from excel_manager import ExcelManager
+from excel_manager import ExcelManager, _get_backend_module
 from main_interface_ui import MainInterfaceUI
 from ParametroV import ProgressWindow, PROGRESS_DATA
 from selectorOrder import show_parameter_selector, get_selected_parameters, reset_parameters
+from trabajador_analisis import TrabajadorAnalisis, TrabajadorNoDisponible
+
+# Módulos que la interfaz necesita al cargar el Excel: se importan en segundo plano
+# una vez visible la ventana, no antes de mostrarla
+HEAVY_MODULES = ('pandas', 'openpyxl')
+
+# Cada cuántos milisegundos se verifica la salud del trabajador de análisis
+WORKER_HEALTH_INTERVAL_MS = 60000
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO, format='[MAIN] %(levelname)s: %(message)s')
@@ -49,10 +59,14 @@ class SAIDIAnalysisApp:
         self.is_running_prediction = False
         self.is_running_behavior = False
         self.is_running_optimization = False
+        self.is_running_batch = False
+        self.batch_process = None
+        self.batch_cancel_requested = False
         
         # Variables para archivos temporales y ventanas de progreso
         self.temp_progress_file = None
         self.progress_window = None
+        self.progress_reader = None
         
         # Información del modo de ejecución
         self.is_frozen_app = is_frozen() if PATH_UTILS_AVAILABLE else False
@@ -68,8 +82,10 @@ class SAIDIAnalysisApp:
             'on_window_close': self.on_window_close_attempt,
             'select_excel_file': self.select_excel_file,
             'run_prediction': self.run_prediction,
+            'run_prediction_with_validation': self.run_prediction_with_validation,
             'run_behavior_analysis': self.run_behavior_analysis,
-            'run_parameter_optimization': self.run_parameter_optimization
+            'run_parameter_optimization': self.run_parameter_optimization,
+            'run_batch_forecast': self.run_batch_forecast
         }
         
         # Inicializar UI
@@ -78,6 +94,12 @@ class SAIDIAnalysisApp:
         # Verificar estructura de directorios
         self.verify_directory_structure()
         
+        # Trabajador persistente: importa la pila científica mientras el usuario carga el Excel
+        self.analysis_worker = None
+        self.start_analysis_worker()
+        
+        self.root.after(200, self.preload_heavy_modules)
+        
         # Configurar interfaz
         self.setup_application()
 
@@ -149,7 +171,8 @@ class SAIDIAnalysisApp:
 
     def on_window_close_attempt(self):
         """Manejar intento de cierre de ventana con limpieza mejorada"""
-        if any([self.is_running_prediction, self.is_running_behavior, self.is_running_optimization]):
+        if any([self.is_running_prediction, self.is_running_behavior, self.is_running_optimization,
+                self.is_running_batch]):
             response = messagebox.askyesno(
                 "Procesos en Ejecución", 
                 "Hay procesos ejecutándose en segundo plano.\n\n"
@@ -172,8 +195,70 @@ class SAIDIAnalysisApp:
                 except Exception as e:
                     logger.warning(f"Error limpiando temporales: {e}")
             
+            if self.analysis_worker:
+                self.analysis_worker.detener()
+            
             self.root.destroy()
 
+    # ============================================================================
+    # TRABAJADOR PERSISTENTE DE ANÁLISIS
+    # ============================================================================
+    
+    def start_analysis_worker(self):
+        """Crear el trabajador de análisis y arrancarlo en segundo plano"""
+        if PATH_UTILS_AVAILABLE:
+            server_script = get_servidor_script()
+            cwd = path_manager.base_path
+        else:
+            server_script = os.path.join("backend", "servidor_analisis.py")
+            cwd = os.getcwd()
+        
+        if not os.path.exists(server_script):
+            logger.warning(f"Trabajador de análisis no disponible: {server_script} no existe")
+            return
+        
+        env = os.environ.copy()
+        env['PYTHONIOENCODING'] = 'utf-8'
+        # Los scripts del backend se importan como módulos desde su carpeta
+        backend_dir = os.path.dirname(os.path.abspath(server_script))
+        extra_paths = [backend_dir]
+        if self.is_frozen_app and PATH_UTILS_AVAILABLE:
+            extra_paths.append(path_manager.base_path)
+        if env.get('PYTHONPATH'):
+            extra_paths.append(env['PYTHONPATH'])
+        env['PYTHONPATH'] = os.pathsep.join(extra_paths)
+        
+        creation_flags = subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+        self.analysis_worker = TrabajadorAnalisis(server_script, env=env, cwd=cwd, creationflags=creation_flags)
+        
+        thread = threading.Thread(target=self.analysis_worker.verificar_salud)
+        thread.daemon = True
+        thread.start()
+        self.root.after(WORKER_HEALTH_INTERVAL_MS, self.check_analysis_worker)
+    
+    def preload_heavy_modules(self):
+        """Importar pandas/openpyxl en un hilo para que la primera carga de Excel no espere"""
+        def preload():
+            start = time.perf_counter()
+            for module_name in HEAVY_MODULES:
+                try:
+                    importlib.import_module(module_name)
+                except ImportError as e:
+                    logger.warning(f"No se pudo precargar {module_name}: {e}")
+            logger.info(f"Módulos precargados en segundo plano en {time.perf_counter() - start:.2f} s")
+        
+        thread = threading.Thread(target=preload)
+        thread.daemon = True
+        thread.start()
+    
+    def check_analysis_worker(self):
+        """Verificación periódica de salud (reinicia el trabajador si dejó de responder)"""
+        if self.analysis_worker:
+            thread = threading.Thread(target=self.analysis_worker.verificar_salud)
+            thread.daemon = True
+            thread.start()
+        self.root.after(WORKER_HEALTH_INTERVAL_MS, self.check_analysis_worker)
+
     # ============================================================================
     # GESTIÓN DE ARCHIVOS EXCEL
     # ============================================================================
@@ -245,7 +330,7 @@ class SAIDIAnalysisApp:
             
             # Validación rápida del archivo
             try:
-                df = pd.read_excel(file_path, nrows=5)
+                df = ExcelManager.read_sheet(file_path, nrows=5)
                 if df.empty:
                     messagebox.showerror("Error", "El archivo Excel está vacío.")
                     self.ui.update_status("Error: Archivo vacío")
@@ -317,8 +402,11 @@ class SAIDIAnalysisApp:
     # MÓDULOS DE ANÁLISIS CON RUTAS MEJORADAS
     # ============================================================================
     
-    def run_prediction(self):
-        """Ejecutar análisis predictivo con selector de parámetros"""
+    def run_prediction(self, include_validation=False):
+        """
+        Ejecutar análisis predictivo con selector de parámetros
+        include_validation: generar también la gráfica de validación en la misma ejecución
+        """
         if self.is_running_prediction:
             messagebox.showwarning("Proceso en Ejecución", 
                                  "El análisis predictivo ya se está ejecutando.\n"
@@ -333,9 +421,14 @@ class SAIDIAnalysisApp:
         self.ui.update_status("Configurando parámetros para análisis predictivo...")
         logger.info("Abriendo selector de parámetros para predicción")
         
-        show_parameter_selector(self.root, self.execute_prediction_with_params, "Análisis Predictivo SAIDI")
+        show_parameter_selector(self.root, lambda: self.execute_prediction_with_params(include_validation),
+                                "Análisis Predictivo SAIDI")
         
-    def execute_prediction_with_params(self):
+    def run_prediction_with_validation(self):
+        """Predicción y validación juntas: un solo proceso lee el Excel y ajusta el modelo una vez"""
+        self.run_prediction(include_validation=True)
+        
+    def execute_prediction_with_params(self, include_validation=False):
         """Ejecutar predicción con los parámetros seleccionados"""
         try:
             order, seasonal_order, confirmed = get_selected_parameters()
@@ -350,26 +443,30 @@ class SAIDIAnalysisApp:
             # Marcar como en ejecución y actualizar interfaz
             self.is_running_prediction = True
             self.ui.update_running_state('prediction', True)
+            self.ui.update_running_state('prediction_validation', True)
             
             excel_info = ExcelManager.get_excel_info()
             self.ui.update_status(f"Ejecutando análisis predictivo SARIMAX{order}x{seasonal_order} con {excel_info['file_name']}...")
             
             # Obtener ruta del script con soporte PyInstaller
+            nombre_script = "analisis_combinado.py" if include_validation else "Modelo.py"
             if PATH_UTILS_AVAILABLE:
-                backend_script = get_modelo_script()
+                backend_script = get_analisis_script() if include_validation else get_modelo_script()
             else:
-                backend_script = os.path.join("backend", "Modelo.py")
+                backend_script = os.path.join("backend", nombre_script)
             
             file_path = ExcelManager.get_file_path()
             
             # Ejecutar script con parámetros personalizados
+            descripcion = "Predicción y validación" if include_validation else "Análisis predictivo"
             self.run_script_with_parameters(
                 script_path=backend_script,
-                description=f"Análisis predictivo SARIMAX{order}x{seasonal_order}",
+                description=f"{descripcion} SARIMAX{order}x{seasonal_order}",
                 selected_file=file_path,
                 order=order,
                 seasonal_order=seasonal_order,
-                callback_finished=self.on_prediction_finished
+                callback_finished=self.on_prediction_finished,
+                measure_latency=include_validation
             )
             
         except Exception as e:
@@ -437,8 +534,12 @@ class SAIDIAnalysisApp:
             messagebox.showerror("Error", f"Error al ejecutar análisis de comportamiento: {str(e)}")
             self.on_behavior_finished()
 
-    def run_script_with_parameters(self, script_path, description, selected_file, order, seasonal_order, callback_finished=None):
-        """Ejecutar script con parámetros SARIMAX personalizados y soporte PyInstaller"""
+    def run_script_with_parameters(self, script_path, description, selected_file, order, seasonal_order, callback_finished=None,
+                                   measure_latency=False):
+        """
+        Ejecutar script con parámetros SARIMAX personalizados y soporte PyInstaller
+        measure_latency: pasar --launch-time para que el script reporte la latencia hasta la primera gráfica
+        """
         def run_in_thread():
             try:
                 self.ui.update_status(f"Ejecutando {description}...")
@@ -497,6 +598,14 @@ class SAIDIAnalysisApp:
                 for param in seasonal_order:
                     cmd_args.append(str(param))
                 
+                if measure_latency:
+                    cmd_args += ['--launch-time', str(time.time())]
+                
+                # Serie ya cargada en la interfaz: el script no vuelve a leer el Excel
+                shared_data_file = ExcelManager.get_shared_data_file(selected_file)
+                if shared_data_file:
+                    cmd_args += ['--data', shared_data_file]
+                
                 logger.info(f"Ejecutando comando: {' '.join(cmd_args)}")
                 logger.info(f"Directorio de trabajo: {os.getcwd()}")
                 
@@ -505,15 +614,28 @@ class SAIDIAnalysisApp:
                 if os.name == 'nt':  # Windows
                     creation_flags = subprocess.CREATE_NO_WINDOW
                 
-                process = subprocess.Popen(cmd_args, 
-                                        env=env,
-                                        stdout=subprocess.PIPE,
-                                        stderr=subprocess.PIPE,
-                                        creationflags=creation_flags)
+                # Primero el trabajador persistente; si está ocupado o caído, un proceso nuevo
+                worker_result = None
+                if self.analysis_worker:
+                    try:
+                        worker_result = self.analysis_worker.ejecutar(script_path, cmd_args[2:])
+                    except TrabajadorNoDisponible as e:
+                        logger.warning(f"{e} - ejecutando en un proceso nuevo")
                 
-                # Esperar a que termine el proceso
-                stdout, stderr = process.communicate()
-                return_code = process.returncode
+                if worker_result is not None:
+                    return_code, output, seconds = worker_result
+                    stdout, stderr = output.encode('utf-8'), b''
+                    logger.info(f"{description} ejecutado en el trabajador persistente ({seconds:.2f} s)")
+                else:
+                    process = subprocess.Popen(cmd_args, 
+                                            env=env,
+                                            stdout=subprocess.PIPE,
+                                            stderr=subprocess.PIPE,
+                                            creationflags=creation_flags)
+                    
+                    # Esperar a que termine el proceso
+                    stdout, stderr = process.communicate()
+                    return_code = process.returncode
                 
                 # Log de debug
                 if stdout:
@@ -575,6 +697,14 @@ class SAIDIAnalysisApp:
         response = messagebox.askyesno("Advertencia - Proceso Extenso", warning_msg)
         
         if response:
+            # Presupuesto de tiempo opcional: buscar solo durante los minutos indicados
+            self.optimization_time_budget = simpledialog.askfloat(
+                "Presupuesto de tiempo",
+                "Minutos máximos de búsqueda.\n"
+                "Se finalizará con los mejores modelos encontrados en ese tiempo.\n\n"
+                "Cancelar = sin límite (búsqueda completa)",
+                minvalue=1, parent=self.root)
+            
             # Marcar como en ejecución
             self.is_running_optimization = True
             self.ui.update_running_state('optimization', True)
@@ -610,7 +740,7 @@ class SAIDIAnalysisApp:
                     'status': 'Iniciando proceso...',
                     'current_model': '',
                     'top_models': [],
-                    'timestamp': pd.Timestamp.now().isoformat() if 'pd' in globals() else str(time.time()),
+                    'timestamp': datetime.now().isoformat(),
                     'pid': os.getpid(),
                     'mode': 'PyInstaller' if self.is_frozen_app else 'Development'
                 }
@@ -699,7 +829,13 @@ class SAIDIAnalysisApp:
                 
                 cmd_args = [python_executable, backend_script, 
                         '--file', file_path, 
-                        '--progress', self.temp_progress_file]
+                        '--progress', self.temp_progress_file,
+                        '--cancel-stdin']
+                if getattr(self, 'optimization_time_budget', None):
+                    cmd_args += ['--time-budget', str(self.optimization_time_budget)]
+                shared_data_file = ExcelManager.get_shared_data_file(file_path)
+                if shared_data_file:
+                    cmd_args += ['--data', shared_data_file]
                 
                 logger.info(f"Iniciando proceso con archivo de progreso: {self.temp_progress_file}")
                 logger.info(f"Comando: {' '.join(cmd_args)}")
@@ -715,13 +851,22 @@ class SAIDIAnalysisApp:
                 else:
                     cwd = os.getcwd()
                     
-                process = subprocess.Popen(cmd_args, env=env, cwd=cwd, creationflags=creation_flags)
+                # La entrada estándar es el canal de cancelación (--cancel-stdin)
+                process = subprocess.Popen(cmd_args, env=env, cwd=cwd, creationflags=creation_flags,
+                                           stdin=subprocess.PIPE)
+                if self.progress_window:
+                    self.progress_window.cancel_handler = lambda: self.request_process_cancellation(process)
+                    if self.progress_window.cancelled:
+                        # Cancelado mientras se lanzaba el proceso
+                        self.request_process_cancellation(process)
                 
                 # Monitorear progreso
                 self.monitor_progress()
                 
                 # Esperar a que termine el proceso
                 return_code = process.wait()
+                # Cerrarla antes de que termine el proceso también lo cancelaría
+                process.stdin.close()
                 
                 if return_code == 0:
                     status_msg = "Optimización completada exitosamente"
@@ -739,6 +884,7 @@ class SAIDIAnalysisApp:
                         status_msg += " (Ejecutable)"
                     self.ui.update_status(status_msg)
                     logger.info("Proceso cancelado por el usuario")
+                    self.show_partial_results()
                 else:
                     error_msg = f"Error durante la optimización (código: {return_code})"
                     if self.is_frozen_app:
@@ -761,20 +907,168 @@ class SAIDIAnalysisApp:
         thread.daemon = True
         thread.start()
 
+    def run_batch_forecast(self):
+        """Pronosticar todos los circuitos del libro cargado o de una carpeta de libros Excel"""
+        if self.is_running_batch:
+            messagebox.showwarning("Proceso en Ejecución",
+                                "El pronóstico por lotes ya se está ejecutando.\n"
+                                "Por favor espere a que termine.")
+            return
+        
+        excel_info = ExcelManager.get_excel_info()
+        response = messagebox.askyesnocancel(
+            "Pronóstico por Lotes",
+            f"¿Pronosticar todos los circuitos de {excel_info['file_name']}?\n\n"
+            "Sí = columnas numéricas de todas las hojas del archivo cargado\n"
+            "No = elegir una carpeta con varios libros Excel")
+        if response is None:
+            self.ui.update_status("Pronóstico por lotes cancelado por el usuario")
+            return
+        
+        if response:
+            input_path = ExcelManager.get_file_path()
+        else:
+            input_path = filedialog.askdirectory(title="Carpeta con los libros de circuitos")
+            if not input_path:
+                return
+        
+        output_path = filedialog.asksaveasfilename(
+            title="Guardar resultados del lote",
+            defaultextension=".xlsx",
+            initialfile="resultados_lote.xlsx",
+            filetypes=[("Archivos Excel", "*.xlsx"), ("Archivos CSV", "*.csv")])
+        if not output_path:
+            return
+        
+        self.is_running_batch = True
+        self.batch_cancel_requested = False
+        self.ui.update_running_state('batch', True, cancel_callback=self.cancel_batch_forecast)
+        self.ui.update_status(f"Iniciando pronóstico por lotes de {os.path.basename(input_path)}...")
+        
+        if PATH_UTILS_AVAILABLE:
+            self.batch_progress_file = create_progress_file("saidi_lote")
+            backend_script = get_lote_script()
+        else:
+            self.batch_progress_file = os.path.join(tempfile.gettempdir(), f"saidi_lote_{int(time.time())}.json")
+            backend_script = os.path.join("backend", "lote_circuitos.py")
+        
+        self.start_batch_process(input_path, output_path, backend_script)
+    
+    def start_batch_process(self, input_path, output_path, backend_script):
+        """Ejecutar lote_circuitos.py en un hilo separado y reflejar su progreso en la barra de estado"""
+        def run_batch():
+            try:
+                if not os.path.exists(backend_script):
+                    logger.error(f"Script backend no existe: {backend_script}")
+                    self.ui.update_status("Error: Script backend no encontrado")
+                    return
+                
+                env = os.environ.copy()
+                env['PYTHONIOENCODING'] = 'utf-8'
+                if self.is_frozen_app and PATH_UTILS_AVAILABLE:
+                    current_pythonpath = env.get('PYTHONPATH', '')
+                    if current_pythonpath:
+                        env['PYTHONPATH'] = f"{path_manager.base_path}{os.pathsep}{current_pythonpath}"
+                    else:
+                        env['PYTHONPATH'] = path_manager.base_path
+                
+                cmd_args = [sys.executable, backend_script,
+                        '--input', input_path,
+                        '--output', output_path,
+                        '--progress', self.batch_progress_file,
+                        '--cancel-stdin']
+                logger.info(f"Comando: {' '.join(cmd_args)}")
+                
+                creation_flags = 0
+                if os.name == 'nt':  # Windows
+                    creation_flags = subprocess.CREATE_NO_WINDOW
+                cwd = path_manager.base_path if PATH_UTILS_AVAILABLE else os.getcwd()
+                
+                # La entrada estándar es el canal de cancelación (--cancel-stdin)
+                process = subprocess.Popen(cmd_args, env=env, cwd=cwd, creationflags=creation_flags,
+                                           stdin=subprocess.PIPE)
+                self.batch_process = process
+                if self.batch_cancel_requested:
+                    # Cancelado mientras se lanzaba el proceso
+                    self.request_process_cancellation(process)
+                self.monitor_batch_progress()
+                return_code = process.wait()
+                # Cerrarla antes de que termine el proceso también lo cancelaría
+                process.stdin.close()
+                
+                if return_code == 0:
+                    self.ui.update_status("Pronóstico por lotes completado")
+                    messagebox.showinfo("Pronóstico por Lotes",
+                                        f"Resultados guardados en:\n{output_path}")
+                elif return_code == 130:  # Código de cancelación
+                    self.ui.update_status("Pronóstico por lotes cancelado")
+                    messagebox.showinfo("Pronóstico por Lotes",
+                                        f"Lote cancelado. Los circuitos ya procesados se guardaron en:\n{output_path}")
+                else:
+                    self.ui.update_status("Error en pronóstico por lotes")
+                    messagebox.showerror("Error", f"Error durante el pronóstico por lotes (código: {return_code})")
+                    
+            except Exception as e:
+                self.ui.update_status("Error inesperado")
+                messagebox.showerror("Error", f"Error inesperado: {str(e)}")
+                logger.error(f"Error: {e}")
+            finally:
+                self.root.after(1000, self.on_batch_finished)
+        
+        thread = threading.Thread(target=run_batch)
+        thread.daemon = True
+        thread.start()
+    
+    def cancel_batch_forecast(self):
+        """Cancelar el pronóstico por lotes en curso conservando los circuitos ya procesados"""
+        if not self.is_running_batch or self.batch_cancel_requested:
+            return
+        if not messagebox.askyesno("Cancelar Pronóstico por Lotes",
+                                   "¿Cancelar el pronóstico por lotes en curso?\n\n"
+                                   "Los circuitos ya procesados se guardan en el archivo de resultados."):
+            return
+        
+        self.batch_cancel_requested = True
+        self.ui.update_status("Cancelando pronóstico por lotes...")
+        if self.batch_process is not None:
+            self.request_process_cancellation(self.batch_process)
+    
+    def monitor_batch_progress(self):
+        """Mostrar en la barra de estado el avance reportado por el lote"""
+        reader = self._create_progress_reader(self.batch_progress_file)
+        
+        def update_status():
+            if not self.is_running_batch:
+                return
+            try:
+                data = self._read_progress_data(self.batch_progress_file, reader)
+                if data is not None:
+                    self.ui.update_status(f"Lote {data.get('progress', 0):.0f}% - {data.get('status', '')}")
+            except (FileNotFoundError, json.JSONDecodeError):
+                # El archivo aún no existe o se está escribiendo
+                pass
+            except Exception as e:
+                logger.debug(f"Error leyendo progreso del lote: {e}")
+            self.root.after(1000, update_status)
+        
+        self.root.after(0, update_status)
+
     def monitor_progress(self):
         """Monitorear el progreso del proceso con manejo robusto de errores"""
+        reader = self._create_progress_reader(self.temp_progress_file)
+        self.progress_reader = reader
+        
         def update_progress():
             try:
-                if os.path.exists(self.temp_progress_file):
-                    with open(self.temp_progress_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    
+                data = self._read_progress_data(self.temp_progress_file, reader)
+                if data is not None:
                     # Actualizar variables globales
                     global PROGRESS_DATA
                     PROGRESS_DATA['percentage'] = data.get('progress', 0)
                     PROGRESS_DATA['status'] = data.get('status', '')
                     PROGRESS_DATA['current_model'] = data.get('current_model', '')
                     PROGRESS_DATA['top_models'] = data.get('top_models', [])
+                    PROGRESS_DATA['remaining_seconds'] = data.get('remaining_seconds')
                     
                     logger.debug(f"Progreso: {PROGRESS_DATA['percentage']}%, Top models: {len(PROGRESS_DATA['top_models'])}")
                     
@@ -783,7 +1077,8 @@ class SAIDIAnalysisApp:
                         self.progress_window.update_progress(
                             PROGRESS_DATA['percentage'],
                             PROGRESS_DATA['status'],
-                            PROGRESS_DATA['current_model']
+                            PROGRESS_DATA['current_model'],
+                            remaining_seconds=PROGRESS_DATA['remaining_seconds']
                         )
                         
                         # Si el proceso terminó y hay modelos, mostrar resultados
@@ -832,12 +1127,65 @@ class SAIDIAnalysisApp:
                     self.root.after(1000, update_progress)
                 
         update_progress()
+    
+    def request_process_cancellation(self, process):
+        """Pedir la cancelación al backend escribiendo una línea en su entrada estándar"""
+        try:
+            process.stdin.write(b"cancelar\n")
+            process.stdin.flush()
+            logger.info("Cancelación enviada al proceso del backend")
+            return True
+        except (OSError, ValueError) as e:
+            # El proceso ya terminó (tubería cerrada)
+            logger.warning(f"No se pudo enviar la cancelación al proceso: {e}")
+            return False
+    
+    def show_partial_results(self):
+        """Mostrar los mejores modelos que el backend publicó antes de cancelarse"""
+        try:
+            reader = getattr(self, 'progress_reader', None)
+            if reader is not None:
+                reader.leer()
+                data = reader.estado
+            else:
+                data = self._read_progress_data(self.temp_progress_file, None) or {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"No se pudieron leer los resultados parciales: {e}")
+            return
+        
+        top_models = data.get('top_models') or []
+        if (top_models and self.progress_window and hasattr(self.progress_window, 'window') and
+                self.progress_window.window.winfo_exists() and not self.progress_window.results_shown):
+            logger.info(f"Mostrando resultados parciales - {len(top_models)} modelos")
+            self.progress_window.show_results(top_models, partial=True)
+    
+    def _create_progress_reader(self, progress_file):
+        """Lector incremental del canal de eventos del backend (None si el módulo no está disponible)"""
+        progress_channel = _get_backend_module('canal_progreso')
+        if progress_channel is None:
+            logger.warning("Canal de progreso no disponible - se lee el archivo de progreso completo")
+            return None
+        return progress_channel.LectorProgreso(progress_file)
+    
+    def _read_progress_data(self, progress_file, reader):
+        """
+        Estado de progreso actualizado o None si no hay novedades
+        
+        Con el lector solo se procesan los eventos nuevos; sin él se vuelve a leer el archivo de progreso
+        """
+        if reader is not None:
+            return reader.estado if reader.leer() else None
+        if not os.path.exists(progress_file):
+            return None
+        with open(progress_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
             
     def on_prediction_finished(self):
         """Callback cuando termina el análisis predictivo"""
         logger.info("Análisis predictivo terminado")
         self.is_running_prediction = False
         self.ui.update_running_state('prediction', False)
+        self.ui.update_running_state('prediction_validation', False)
         status_msg = "Análisis predictivo completado. Sistema listo para nuevas operaciones."
         if self.is_frozen_app:
             status_msg += " (Ejecutable)"
@@ -853,6 +1201,28 @@ class SAIDIAnalysisApp:
             status_msg += " (Ejecutable)"
         self.ui.update_status(status_msg)
         
+    def on_batch_finished(self):
+        """Callback cuando termina el pronóstico por lotes"""
+        self.is_running_batch = False
+        self.batch_process = None
+        self.ui.update_running_state('batch', False)
+        
+        if getattr(self, 'batch_progress_file', None):
+            try:
+                self._remove_progress_events(self.batch_progress_file)
+                if os.path.exists(self.batch_progress_file):
+                    os.remove(self.batch_progress_file)
+            except Exception as e:
+                logger.warning(f"No se pudo limpiar archivo temporal: {e}")
+            finally:
+                self.batch_progress_file = None
+        
+    def _remove_progress_events(self, progress_file):
+        """Eliminar el registro de eventos de progreso asociado al archivo de progreso"""
+        progress_channel = _get_backend_module('canal_progreso')
+        if progress_channel is not None:
+            progress_channel.eliminar_eventos(progress_file)
+        
     def on_optimization_finished(self):
         """Callback cuando termina la optimización con limpieza mejorada"""
         self.is_running_optimization = False
@@ -861,6 +1231,7 @@ class SAIDIAnalysisApp:
         # Limpiar archivo temporal al finalizar
         if hasattr(self, 'temp_progress_file') and self.temp_progress_file:
             try:
+                self._remove_progress_events(self.temp_progress_file)
                 if os.path.exists(self.temp_progress_file):
                     os.remove(self.temp_progress_file)
                     logger.info(f"Archivo temporal limpiado: {self.temp_progress_file}")
@@ -7,7 +7,6 @@ ACTUALIZADO CON COLORES CORPORATIVOS: #9fcf67 (verde claro) y #0d9648 (verde osc
 import tkinter as tk
 from tkinter import ttk
 import os
-import pandas as pd
 from excel_manager import ExcelManager
 from ui_components import UIComponents
 
@@ -67,8 +66,10 @@ class MainInterfaceUI:
             main_frame,
             module_callbacks={
                 'prediction': self.callbacks['run_prediction'],
+                'prediction_validation': self.callbacks['run_prediction_with_validation'],
                 'behavior': self.callbacks['run_behavior_analysis'],
-                'optimization': self.callbacks['run_parameter_optimization']
+                'optimization': self.callbacks['run_parameter_optimization'],
+                'batch': self.callbacks['run_batch_forecast']
             }
         )
         
@@ -209,12 +210,8 @@ class MainInterfaceUI:
             
             # Obtener información adicional del Excel
             try:
-                df = pd.read_excel(file_path, nrows=0)  # Solo headers
-                columns_count = len(df.columns)
-                
-                # Contar filas (más eficiente)
-                df_full = pd.read_excel(file_path)
-                rows_count = len(df_full)
+                # Dimensiones de la primera hoja (desde la cache de Excel, sin releer el libro)
+                rows_count, columns_count = next(iter(ExcelManager.describe_workbook(file_path).values()))
                 
                 details_text = f"📋 {rows_count:,} filas, {columns_count} columnas • {file_size_mb:.1f} MB"
                 
@@ -291,11 +288,24 @@ class MainInterfaceUI:
         else:
             print("DEBUG UI: ✗ Error al actualizar botones de módulos")
 
-    def update_running_state(self, module_key, is_running):
-        """Actualizar el estado visual del módulo cuando está ejecutándose"""
+    def update_running_state(self, module_key, is_running, cancel_callback=None):
+        """
+        Actualizar el estado visual del módulo cuando está ejecutándose
+        Con cancel_callback el botón sigue activo durante la ejecución como control de cancelación
+        """
         if module_key in self.module_buttons:
             button = self.module_buttons[module_key]
-            if is_running:
+            if is_running and cancel_callback is not None:
+                button.config(
+                    text="CANCELAR",
+                    bg='#a1a1a5',  # Color terciario para estado de ejecución
+                    state='normal',
+                    cursor='hand2',
+                    command=cancel_callback
+                )
+                button.unbind("<Enter>")
+                button.unbind("<Leave>")
+            elif is_running:
                 # Cambiar apariencia cuando está ejecutándose - COLOR CORPORATIVO TERCIARIO
                 button.config(
                     text="EJECUTANDO...",
@@ -310,14 +320,17 @@ class MainInterfaceUI:
                 # Restaurar estado normal
                 original_texts = {
                     'prediction': 'INICIAR PREDICCIÓN',
+                    'prediction_validation': 'PREDICCIÓN + VALIDACIÓN',
                     'behavior': 'ANÁLISIS DE PRECISIÓN',
-                    'optimization': 'OPTIMIZAR PARÁMETROS'
+                    'optimization': 'OPTIMIZAR PARÁMETROS',
+                    'batch': 'PRONÓSTICO POR LOTES'
                 }
                 button.config(
                     text=original_texts.get(module_key, 'EJECUTAR'),
                     bg=button.original_color,
                     state='normal',
-                    cursor='hand2'
+                    cursor='hand2',
+                    command=button.original_command
                 )
                 # Restaurar hover effects
                 UIComponents.add_hover_effects(
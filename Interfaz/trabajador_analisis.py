@@ -0,0 +1,177 @@
+# trabajador_analisis.py
+"""
+Cliente del trabajador persistente de análisis (backend/servidor_analisis.py)
+Lanza el proceso una vez, le envía trabajos por stdin, verifica su salud con ping y lo
+reinicia si deja de responder o termina inesperadamente.
+"""
+import os
+import sys
+import json
+import queue
+import threading
+import subprocess
+import itertools
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Scripts que el trabajador ejecuta (los demás se lanzan como proceso nuevo)
+SCRIPTS_TRABAJADOR = {'Modelo.py': 'Modelo', 'visual.py': 'visual', 'analisis_combinado.py': 'analisis_combinado'}
+
+# Segundos máximos de espera del arranque (importaciones) y de un ping
+TIEMPO_ARRANQUE = 120
+TIEMPO_PING = 5
+
+
+class TrabajadorNoDisponible(Exception):
+    """El trabajador no pudo arrancar o terminó durante un trabajo"""
+
+
+class TrabajadorAnalisis:
+    """Proceso de análisis de larga duración con verificación de salud y reinicio automático"""
+
+    def __init__(self, script_servidor, env=None, cwd=None, creationflags=0):
+        self.script_servidor = script_servidor
+        self.env = env
+        self.cwd = cwd
+        self.creationflags = creationflags
+        self.process = None
+        self.reinicios = 0
+        self._respuestas = queue.Queue()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    # ------------------------------------------------------------------ ciclo de vida
+
+    def iniciar(self):
+        """Lanzar el proceso y esperar a que termine de importar la pila científica"""
+        self.detener()
+        self._respuestas = queue.Queue()
+        self.process = subprocess.Popen(
+            [sys.executable, self.script_servidor],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            env=self.env, cwd=self.cwd, creationflags=self.creationflags,
+            text=True, encoding='utf-8', bufsize=1
+        )
+        lector = threading.Thread(target=self._leer_respuestas, args=(self.process, self._respuestas))
+        lector.daemon = True
+        lector.start()
+
+        listo = self._esperar('listo', TIEMPO_ARRANQUE)
+        if listo is None:
+            self.detener()
+            raise TrabajadorNoDisponible("El trabajador de análisis no respondió al arrancar")
+        logger.info(f"Trabajador de análisis listo (pid {listo['pid']}, "
+                    f"importaciones {listo['segundos_importacion']:.2f} s)")
+
+    def detener(self):
+        """Terminar el proceso (primero con 'salir', luego por la fuerza)"""
+        process, self.process = self.process, None
+        if process is None or process.poll() is not None:
+            return
+        try:
+            process.stdin.write(json.dumps({'tipo': 'salir'}) + "\n")
+            process.stdin.flush()
+            process.wait(timeout=3)
+        except Exception:
+            process.kill()
+
+    def esta_vivo(self):
+        return self.process is not None and self.process.poll() is None
+
+    @staticmethod
+    def _leer_respuestas(process, respuestas):
+        for linea in process.stdout:
+            try:
+                respuestas.put(json.loads(linea))
+            except json.JSONDecodeError:
+                continue
+        respuestas.put({'tipo': 'terminado'})
+
+    def _enviar(self, mensaje):
+        self.process.stdin.write(json.dumps(mensaje) + "\n")
+        self.process.stdin.flush()
+
+    def _esperar(self, tipo, timeout, id_trabajo=None):
+        """Siguiente respuesta del tipo indicado, o None si se agota el tiempo o el proceso termina"""
+        while True:
+            try:
+                respuesta = self._respuestas.get(timeout=timeout)
+            except queue.Empty:
+                return None
+            if respuesta.get('tipo') == 'terminado':
+                return None
+            if respuesta.get('tipo') == tipo and (id_trabajo is None or respuesta.get('id') == id_trabajo):
+                return respuesta
+
+    # ------------------------------------------------------------------ salud
+
+    def verificar_salud(self):
+        """
+        Ping al trabajador si está libre; lo reinicia si no responde o terminó
+        Returns: True si el trabajador quedó disponible (o está ocupado con un trabajo)
+        """
+        if not self._lock.acquire(blocking=False):
+            # Ocupado con un trabajo: basta con que el proceso siga vivo
+            return self.esta_vivo()
+        try:
+            return self._asegurar_disponible()
+        finally:
+            self._lock.release()
+
+    def _asegurar_disponible(self):
+        if self.esta_vivo():
+            try:
+                self._enviar({'tipo': 'ping'})
+                if self._esperar('pong', TIEMPO_PING) is not None:
+                    return True
+            except (OSError, ValueError):
+                pass
+            logger.warning("El trabajador de análisis no respondió al ping - reiniciando")
+        elif self.process is not None:
+            logger.warning("El trabajador de análisis terminó inesperadamente - reiniciando")
+
+        try:
+            if self.process is not None:
+                self.reinicios += 1
+            self.iniciar()
+            return True
+        except (OSError, TrabajadorNoDisponible) as e:
+            logger.error(f"No se pudo iniciar el trabajador de análisis: {e}")
+            return False
+
+    # ------------------------------------------------------------------ trabajos
+
+    @staticmethod
+    def admite(script_path):
+        return os.path.basename(script_path) in SCRIPTS_TRABAJADOR
+
+    def ejecutar(self, script_path, args):
+        """
+        Ejecutar un script en el trabajador
+
+        Returns:
+            Tupla (codigo, salida, segundos) o None si el trabajador está ocupado con otro
+            trabajo o no está disponible (quien llama lanza entonces un proceso nuevo)
+
+        Raises:
+            TrabajadorNoDisponible: si el trabajador terminó durante el trabajo
+        """
+        if not self.admite(script_path):
+            return None
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            if not self._asegurar_disponible():
+                return None
+            id_trabajo = next(self._ids)
+            self._enviar({'tipo': 'trabajo', 'id': id_trabajo,
+                          'script': SCRIPTS_TRABAJADOR[os.path.basename(script_path)],
+                          'args': [str(arg) for arg in args]})
+            # Sin límite de tiempo: el trabajo termina cuando el usuario cierra las gráficas
+            resultado = self._esperar('resultado', None, id_trabajo)
+            if resultado is None:
+                raise TrabajadorNoDisponible("El trabajador de análisis terminó durante el trabajo")
+            return resultado['codigo'], resultado['salida'], resultado['segundos']
+        finally:
+            self._lock.release()
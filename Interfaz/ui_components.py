@@ -156,11 +156,6 @@ class UIComponents:
         modules_frame = tk.Frame(parent, bg='#f8fafc')
         modules_frame.pack(fill='both', expand=True, pady=10)  # Reducido significativamente
         
-        # Configurar grid para 3 columnas uniformes
-        for i in range(3):
-            modules_frame.columnconfigure(i, weight=1, uniform="modules")  # uniform asegura mismo ancho
-        modules_frame.rowconfigure(0, weight=1)
-        
         module_buttons = {}
         
         # Configuraciones de módulos - COLORES CORPORATIVOS
@@ -172,7 +167,13 @@ class UIComponents:
                 'description': 'Genera predicciones para períodos faltantes utilizando modelos SARIMAX optimizados.',
                 'color': '#9fcf67',  # Verde claro corporativo
                 'button_text': 'INICIAR PREDICCIÓN',
-                'callback': module_callbacks.get('prediction')
+                'callback': module_callbacks.get('prediction'),
+                # Pronóstico y gráfica de validación en una sola ejecución (analisis_combinado.py)
+                'secondary': {
+                    'key': 'prediction_validation',
+                    'button_text': 'PREDICCIÓN + VALIDACIÓN',
+                    'callback': module_callbacks.get('prediction_validation')
+                }
             },
             {
                 'key': 'behavior',
@@ -191,14 +192,30 @@ class UIComponents:
                 'color': '#7bb15a',  # Verde medio armonioso con la paleta
                 'button_text': 'OPTIMIZAR PARÁMETROS',
                 'callback': module_callbacks.get('optimization')
+            },
+            {
+                'key': 'batch',
+                'icon': '🗂️',
+                'title': 'Lote de Circuitos',
+                'description': 'Pronóstico de todos los circuitos de un libro o carpeta en un solo archivo de resultados.',
+                'color': '#0d9648',  # Verde oscuro corporativo
+                'button_text': 'PRONÓSTICO POR LOTES',
+                'callback': module_callbacks.get('batch')
             }
         ]
         
+        # Configurar grid con una columna uniforme por módulo
+        for i in range(len(modules_config)):
+            modules_frame.columnconfigure(i, weight=1, uniform="modules")  # uniform asegura mismo ancho
+        modules_frame.rowconfigure(0, weight=1)
+        
         for i, config in enumerate(modules_config):
             button = UIComponents._create_module_card(
                 modules_frame, 0, i, config
             )
             module_buttons[config['key']] = button
+            if getattr(button, 'secondary_button', None) is not None:
+                module_buttons[config['secondary']['key']] = button.secondary_button
         
         # CRÍTICO: Actualizar estado inmediatamente después de crear botones
         print(f"DEBUG: Botones creados: {list(module_buttons.keys())}")
@@ -275,6 +292,28 @@ class UIComponents:
                 config['color']
             )
         
+        # Acción secundaria del módulo: botón propio, más pequeño, bajo el principal
+        button.secondary_button = None
+        secondary = config.get('secondary')
+        if secondary and secondary.get('callback'):
+            secondary_button = tk.Button(content_frame, text=secondary['button_text'],
+                                         font=('Segoe UI', 7, 'bold'),
+                                         bg=initial_bg, fg='white', relief='flat',
+                                         padx=8, pady=3, cursor='hand2',
+                                         state=initial_state,
+                                         command=secondary['callback'] if excel_loaded else None)
+            secondary_button.pack(pady=(0, 5))
+            secondary_button.original_color = config['color']
+            secondary_button.original_command = secondary['callback']
+            secondary_button.original_text = secondary['button_text']
+            if excel_loaded:
+                UIComponents.add_hover_effects(
+                    secondary_button,
+                    UIComponents.darken_color(config['color']),
+                    config['color']
+                )
+            button.secondary_button = secondary_button
+        
         print(f"DEBUG: Botón {config['key']} creado con estado: {initial_state}, color: {initial_bg}")
         
         return button
@@ -19,12 +19,51 @@ import os
 from tkinter import messagebox
 from statsmodels.tsa.statespace.sarimax import SARIMAX
 import numpy as np
-from sklearn.metrics import mean_squared_error
+from metricas import calcular_metricas_pronostico
+from datos_saidi import cargar_excel_saidi, cargar_datos_compartidos
+from graficas import (validar_ruta_salida, usar_backend_sin_ventana, maximizar_ventana,
+                      mantener_maximizada, exportar_figura)
 
+# Cache persistente de ajustes SARIMAX (compartida con Parametro.py)
+try:
+    import cache_ajustes
+    from cache_ajustes import (ajustar_sarimax, desactivar_cache, metricas_guardadas, guardar_metricas,
+                               describir_artefacto)
+    CACHE_AJUSTES_AVAILABLE = True
+except ImportError:
+    CACHE_AJUSTES_AVAILABLE = False
+
+# Validación con origen móvil sin reajustar (compartida con Parametro.py)
+try:
+    from validacion_origen_movil import pronosticos_origen_movil
+    ORIGEN_MOVIL_AVAILABLE = True
+except ImportError:
+    ORIGEN_MOVIL_AVAILABLE = False
 
-def calcular_metricas_modelo(serie, order, seasonal_order):
+
+def ajustar_modelo(datos, order, seasonal_order):
+    """Ajustar SARIMAX reutilizando la cache de ajustes cuando está disponible"""
+    if CACHE_AJUSTES_AVAILABLE:
+        results = ajustar_sarimax(datos, order, seasonal_order)
+        print(f"Modelo sobre {len(datos)} observaciones: {describir_artefacto(cache_ajustes.ULTIMO_AJUSTE)}")
+        return results
+    
+    model = SARIMAX(
+        datos,
+        order=order,
+        seasonal_order=seasonal_order,
+        enforce_stationarity=False,
+        enforce_invertibility=False
+    )
+    return model.fit(disp=False)
+
+
+def calcular_metricas_modelo(serie, order, seasonal_order, validacion='holdout'):
     """
     Calcula las métricas del modelo SARIMAX con parámetros dinámicos.
+    Con validacion='rolling' se pronostica desde cada origen del período de prueba sin reajustar.
+    Si la búsqueda (o una ejecución anterior) ya validó este modelo con la misma división,
+    se reutilizan sus métricas sin construir el modelo de entrenamiento.
     """
     try:
         # Usar validación dinámica basada en cantidad de datos
@@ -39,65 +78,47 @@ def calcular_metricas_modelo(serie, order, seasonal_order):
         train_data = serie[:-n_test]
         test_data = serie[-n_test:]
         
+        if CACHE_AJUSTES_AVAILABLE:
+            guardadas = metricas_guardadas(train_data, test_data, order, seasonal_order, validacion)
+            if guardadas is not None:
+                print("Métricas de validación reutilizadas del artefacto guardado (sin reajuste)")
+                return dict(guardadas, n_test=n_test, pct_validacion=pct_validacion)
+        
         # Ajustar modelo con datos de entrenamiento
-        model = SARIMAX(
-            train_data,
-            order=order,
-            seasonal_order=seasonal_order,
-            enforce_stationarity=False,
-            enforce_invertibility=False
-        )
-        results = model.fit(disp=False)
+        results = ajustar_modelo(train_data, order, seasonal_order)
         
         # Hacer predicciones para el período de prueba
-        pred = results.get_forecast(steps=n_test)
-        pred_mean = pred.predicted_mean
-        
-        # Calcular múltiples métricas
-        rmse = np.sqrt(mean_squared_error(test_data, pred_mean))
-        mae = np.mean(np.abs(test_data - pred_mean))
-        
-        # Calcular MAPE (Error Porcentual Absoluto Medio)
-        epsilon = 1e-8
-        mape = np.mean(np.abs((test_data - pred_mean) / (test_data + epsilon))) * 100
-        
-        # Calcular coeficiente de determinación (R²) para validación
-        ss_res = np.sum((test_data - pred_mean) ** 2)
-        ss_tot = np.sum((test_data - np.mean(test_data)) ** 2)
-        r2_score = 1 - (ss_res / (ss_tot + epsilon))
-        
-        # Calcular porcentaje de precisión basado en múltiples métricas
-        precision_mape = max(0, 100 - mape)
-        precision_r2 = max(0, r2_score * 100)
-        
-        mean_actual = np.mean(test_data)
-        precision_rmse = max(0, (1 - rmse/mean_actual) * 100)
-        
-        # Precisión compuesta (promedio ponderado)
-        precision_final = (precision_mape * 0.4 + precision_r2 * 0.4 + precision_rmse * 0.2)
-        precision_final = max(0, min(100, precision_final))
+        if validacion == 'rolling' and ORIGEN_MOVIL_AVAILABLE:
+            test_data, pred_mean = pronosticos_origen_movil(results, test_data)
+        else:
+            pred_mean = results.forecast(steps=n_test)
         
-        return {
-            'rmse': rmse,
-            'mae': mae,
-            'mape': mape,
-            'r2_score': r2_score,
-            'precision_final': precision_final,
+        # Calcular múltiples métricas (misma fórmula que Parametro.py y visual.py)
+        metricas = {
+            **calcular_metricas_pronostico(test_data, pred_mean),
             'aic': results.aic,
             'bic': results.bic,
             'n_test': n_test,
-            'pct_validacion': pct_validacion,
-            'precision_mape': precision_mape,
-            'precision_r2': precision_r2,
-            'precision_rmse': precision_rmse
+            'pct_validacion': pct_validacion
         }
+        if CACHE_AJUSTES_AVAILABLE:
+            guardar_metricas(train_data, serie[-n_test:], order, seasonal_order, metricas, validacion)
+        
+        return metricas
         
     except Exception as e:
         print(f"ERROR calculando métricas: {e}")
         return None
 
 
-def analizar_saidi(file_path, order=(4, 0, 0), seasonal_order=(1, 0, 0, 8)):
+def analizar_saidi(file_path, order=(4, 0, 0), seasonal_order=(1, 0, 0, 8), validacion='holdout',
+                   datos=None, mostrar=True, salida=None):
+    """
+    Predicción de los meses faltantes con su gráfica
+    datos: Tupla (df, col_saidi) ya leída con cargar_excel_saidi (evita releer el Excel)
+    mostrar: False deja la figura abierta sin llamar a plt.show (la muestra quien llama)
+    salida: Ruta .png/.svg/.pdf; exporta la figura y la cierra en lugar de mostrarla
+    """
     try:
         # Información del modo de ejecución
         execution_mode = "PyInstaller" if (PATH_UTILS_AVAILABLE and is_frozen()) else "Desarrollo"
@@ -113,24 +134,14 @@ def analizar_saidi(file_path, order=(4, 0, 0), seasonal_order=(1, 0, 0, 8)):
                 print(f"Warning: No se pudieron limpiar archivos temporales: {e}")
         
         # === Cargar datos ===
-        df = pd.read_excel(file_path, sheet_name="Hoja1")
-
-        # Mostrar nombres de columnas detectados (para depuración)
-        print("Columnas encontradas en el Excel:", df.columns.tolist())
-
-        # Detectar columna de fecha
-        if "Fecha" in df.columns:
-            df["Fecha"] = pd.to_datetime(df["Fecha"])
-            df.set_index("Fecha", inplace=True)
+        if datos is not None:
+            df, col_saidi = datos[0].copy(), datos[1]
         else:
-            df.iloc[:, 0] = pd.to_datetime(df.iloc[:, 0])
-            df.set_index(df.columns[0], inplace=True)
-
-        # Detectar columna de SAIDI
-        col_saidi = "SAIDI" if "SAIDI" in df.columns else "SAIDI Histórico"
-        if col_saidi not in df.columns:
-            print("ERROR: No se encontró la columna SAIDI ni SAIDI Histórico.")
-            sys.exit(1)
+            try:
+                df, col_saidi = cargar_excel_saidi(file_path)
+            except ValueError as e:
+                print(f"ERROR: {e}")
+                sys.exit(1)
 
         # Identificar meses faltantes (NaN)
         faltantes = df[df[col_saidi].isna()]
@@ -154,7 +165,7 @@ def analizar_saidi(file_path, order=(4, 0, 0), seasonal_order=(1, 0, 0, 8)):
         print("="*60)
         
         # Calcular métricas del modelo
-        metricas = calcular_metricas_modelo(historico[col_saidi], order, seasonal_order)
+        metricas = calcular_metricas_modelo(historico[col_saidi], order, seasonal_order, validacion)
         
         if metricas:
             print(f"MÉTRICAS DEL MODELO:")
@@ -165,7 +176,8 @@ def analizar_saidi(file_path, order=(4, 0, 0), seasonal_order=(1, 0, 0, 8)):
             print(f"Precisión Final: {metricas['precision_final']:.1f}%")
             print(f"AIC: {metricas['aic']:.2f}")
             print(f"BIC: {metricas['bic']:.2f}")
-            print(f"Validación: {metricas['pct_validacion']*100:.0f}% ({metricas['n_test']} obs.)")
+            print(f"Validación: {metricas['pct_validacion']*100:.0f}% ({metricas['n_test']} obs.)"
+                  + (" con origen móvil" if validacion == 'rolling' else ""))
             
             # Interpretación de precisión
             precision = metricas['precision_final']
@@ -187,14 +199,7 @@ def analizar_saidi(file_path, order=(4, 0, 0), seasonal_order=(1, 0, 0, 8)):
 
         # Ajustar modelo final con todos los datos históricos
         try:
-            model = SARIMAX(
-                historico[col_saidi],
-                order=order,
-                seasonal_order=seasonal_order,
-                enforce_stationarity=False,
-                enforce_invertibility=False
-            )
-            results = model.fit(disp=False)
+            results = ajustar_modelo(historico[col_saidi], order, seasonal_order)
             print("Modelo ajustado exitosamente")
         except Exception as e:
             print(f"ERROR: No se pudo ajustar el modelo: {e}")
@@ -233,22 +238,9 @@ def analizar_saidi(file_path, order=(4, 0, 0), seasonal_order=(1, 0, 0, 8)):
         # Crear figura con tamaño optimizado para pantalla completa
         fig = plt.figure(figsize=(16, 10))
         
-        # Configurar pantalla completa de manera segura
-        mng = fig.canvas.manager
-        try:
-            if hasattr(mng, 'window') and hasattr(mng.window, 'state'):
-                mng.window.state('zoomed')
-                try:
-                    mng.window.resizable(False, False)
-                except:
-                    print("Info: La ventana se maximizó pero puede ser redimensionable")
-            elif hasattr(mng, 'window') and hasattr(mng.window, 'showMaximized'):
-                mng.window.showMaximized()
-            else:
-                if hasattr(mng, 'full_screen_toggle'):
-                    mng.full_screen_toggle()
-        except Exception as e:
-            print(f"Info: Usando configuración de ventana estándar: {e}")
+        # Pantalla completa solo con ventana interactiva (no al exportar con --output)
+        if salida is None:
+            maximizar_ventana(fig)
 
         # Línea azul: datos históricos
         plt.plot(historico.index, historico[col_saidi], label="SAIDI Histórico", 
@@ -362,24 +354,14 @@ def analizar_saidi(file_path, order=(4, 0, 0), seasonal_order=(1, 0, 0, 8)):
                    ha='center', fontsize=12, style='italic', color='darkblue', weight='bold',
                    bbox=dict(boxstyle='round,pad=0.4', facecolor='lightyellow', alpha=0.8))
         
-        # Configurar evento para mantener maximización
-        def on_resize(event):
-            try:
-                if hasattr(mng, 'window') and hasattr(mng.window, 'state'):
-                    current_state = str(mng.window.state()).lower()
-                    if 'zoom' not in current_state and 'normal' in current_state:
-                        mng.window.state('zoomed')
-            except:
-                pass
-        
-        # Conectar el evento de redimensionamiento de manera segura
-        try:
-            fig.canvas.mpl_connect('resize_event', on_resize)
-        except:
-            pass
-        
-        # Mostrar la gráfica
-        plt.show()
+        # Exportar sin ventana, o mostrar la ventana maximizada
+        if salida is not None:
+            exportar_figura(fig, salida)
+        else:
+            mantener_maximizada(fig)
+            if mostrar:
+                plt.show()
+        return fig
 
     except Exception as e:
         print(f"ERROR: Ocurrió un error: {str(e)}")
@@ -394,13 +376,39 @@ def main():
                        help='Parámetros order (p d q) para SARIMAX. Default: 4 0 0')
     parser.add_argument('--seasonal-order', nargs=4, type=int, default=[1, 0, 0, 8],
                        help='Parámetros seasonal_order (P D Q s) para SARIMAX. Default: 1 0 0 8')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='No usar la cache persistente de ajustes SARIMAX')
+    parser.add_argument('--validation', choices=['holdout', 'rolling'], default='holdout',
+                       help='Validación de las métricas: holdout (un pronóstico) o rolling (origen móvil sin reajustar). '
+                            'Default: holdout')
+    parser.add_argument('--data', default=None,
+                       help='Serie ya preparada por la interfaz (archivo binario mapeado en memoria); '
+                            'evita releer el Excel. Si no se puede abrir se lee --file')
+    parser.add_argument('--output', default=None,
+                       help='Exportar la gráfica sin abrir ventana (backend Agg). El formato se toma de la '
+                            'extensión: .png, .svg o .pdf')
     
     args = parser.parse_args()
     
+    if args.no_cache and CACHE_AJUSTES_AVAILABLE:
+        desactivar_cache()
+    
+    if args.output:
+        try:
+            validar_ruta_salida(args.output)
+        except ValueError as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
+        # Sin ventana: Agg no necesita pantalla ni bucle de eventos
+        usar_backend_sin_ventana()
+    
     if not os.path.exists(args.file):
         print(f"ERROR: El archivo {args.file} no existe.")
         sys.exit(1)
     
+    # Serie compartida por la interfaz (si se pasó --data)
+    datos = cargar_datos_compartidos(args.data) if args.data else None
+    
     # Convertir argumentos a tuplas
     order = tuple(args.order)
     seasonal_order = tuple(args.seasonal_order)
@@ -411,7 +419,7 @@ def main():
     print(f"Parámetros: SARIMAX{order}x{seasonal_order}")
     print("="*50)
     
-    analizar_saidi(args.file, order, seasonal_order)
+    analizar_saidi(args.file, order, seasonal_order, validacion=args.validation, datos=datos, salida=args.output)
     print("Proceso completado exitosamente.")
 
 
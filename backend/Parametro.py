@@ -17,13 +17,15 @@ except ImportError:
 from statsmodels.tsa.statespace.sarimax import SARIMAX
 from pmdarima import auto_arima
 import numpy as np
-from sklearn.metrics import mean_squared_error
 import argparse
 import json
 import os
 import sys
 import signal
 import threading
+import multiprocessing
+import time
+from functools import partial
 
 # IMPORTAR EL BRIDGE DE COMUNICACIÓN
 try:
@@ -48,6 +50,27 @@ except ImportError:
         BRIDGE_AVAILABLE = False
         print(f"Bridge de parámetros no disponible: {e}")
 
+# Motor de evaluación paralela (pool de procesos)
+from motor_busqueda import MotorBusquedaParalela, obtener_workers_por_defecto
+
+# Estrategias de búsqueda (exhaustiva, prefiltro, stepwise, bayesiana)
+from estrategias_busqueda import ESTRATEGIAS, ESPACIOS_BUSQUEDA, crear_estrategia
+
+# Cache persistente de ajustes SARIMAX
+import cache_ajustes
+from cache_ajustes import obtener_cache, desactivar_cache, ajustar_sarimax, huella_serie
+from validacion_origen_movil import pronosticos_origen_movil
+from metricas import calcular_metricas_pronostico
+from cortes_grilla import preparar_corte, info_corte
+from perfiles_ajuste import PERFILES_AJUSTE, PERFIL_POR_DEFECTO
+from prefiltro_arma import puntuar_candidatos
+from motor_autorregresivo import es_autorregresivo, evaluar_autorregresivos
+from diario_busqueda import DiarioBusqueda, ruta_diario, limpiar_diarios_antiguos
+from datos_saidi import leer_hoja_excel, preparar_hoja_saidi, cargar_datos_compartidos
+from canal_progreso import obtener_publicador
+from cancelacion import (vigilar_cancelacion, solicitar_cancelacion, cancelacion_solicitada,
+                          punto_interrupcion)
+
 # Variables globales para la interfaz
 PROGRESS_PERCENTAGE = 0
 CURRENT_MODEL = ""
@@ -58,22 +81,21 @@ TOP_3_MODELS = []
 PROCESO_CANCELADO = False
 
 def check_cancellation(progress_file):
-    """NUEVA FUNCIÓN: Verificar si el proceso fue cancelado"""
+    """
+    Verificar si el proceso fue cancelado
+    
+    Solo consulta el evento de cancelación (cancelacion.py), sin acceder al disco; la tubería de
+    la interfaz, las señales o el archivo de cancelación lo activan desde otro hilo
+    """
     global PROCESO_CANCELADO
     
     if PROCESO_CANCELADO:
         return True
         
-    if progress_file and os.path.dirname(progress_file):
-        try:
-            # Verificar si existe el archivo de cancelación
-            cancel_file = progress_file.replace('.json', '_cancel.json')
-            if os.path.exists(cancel_file):
-                print(" CANCELACIÓN DETECTADA - Deteniendo proceso...")
-                PROCESO_CANCELADO = True
-                return True
-        except Exception as e:
-            print(f"Error verificando cancelación: {e}")
+    if cancelacion_solicitada():
+        print(" CANCELACIÓN DETECTADA - Deteniendo proceso...")
+        PROCESO_CANCELADO = True
+        return True
     
     return False
 
@@ -112,8 +134,14 @@ def cleanup_cancellation_files(progress_file):
         except Exception as e:
             print(f"Error eliminando archivo de cancelación: {e}")
 
-def update_progress(progress_file, progress, status, current_model=""):
-    """Actualizar el archivo de progreso para comunicación con frontend - MODIFICADO"""
+def update_progress(progress_file, progress, status, current_model="", remaining_seconds=None, intermedio=False):
+    """
+    Publicar el progreso en el canal de eventos para comunicación con frontend
+    
+    Args:
+        intermedio: True en las actualizaciones por candidato; se publican como mucho cada
+            canal_progreso.INTERVALO_MINIMO segundos (los hitos se publican siempre)
+    """
     global PROGRESS_PERCENTAGE, CURRENT_MODEL, STATUS_MESSAGE, PROCESO_CANCELADO
     
     # VERIFICAR CANCELACIÓN ANTES DE ACTUALIZAR
@@ -138,19 +166,15 @@ def update_progress(progress_file, progress, status, current_model=""):
             
             os.makedirs(progress_dir, exist_ok=True)
             
-            # Escribir archivo de progreso
-            progress_data = {
+            # Un evento con los campos que cambiaron; top_models solo si cambió el ranking
+            obtener_publicador(progress_file).publicar({
                 'progress': progress,
                 'status': status,
                 'current_model': current_model,
                 'top_models': TOP_3_MODELS,
-                'timestamp': pd.Timestamp.now().isoformat(),
-                'pid': os.getpid(),  # NUEVO: Incluir PID del proceso
-                'cancelled': PROCESO_CANCELADO  # NUEVO: Estado de cancelación
-            }
-            
-            with open(progress_file, 'w', encoding='utf-8') as f:
-                json.dump(progress_data, f, ensure_ascii=False, indent=2)
+                'cancelled': PROCESO_CANCELADO,
+                'remaining_seconds': remaining_seconds  # Presupuesto de tiempo restante (None = sin límite)
+            }, intermedio=intermedio)
                 
             return True
             
@@ -175,11 +199,20 @@ def handle_graceful_shutdown(progress_file):
         print(f"   Precisión: {best['precision_final']:.1f}%")
         print(f"   Parámetros: order={best['order']}, seasonal_order={best['seasonal_order']}")
     
-    # Actualizar progreso final
-    if progress_file:
-        update_progress(progress_file, PROGRESS_PERCENTAGE, 
-                       " Proceso cancelado por el usuario", 
-                       "Cancelado - limpiando recursos...")
+    # Publicar el estado final con los mejores modelos hasta ahora: la interfaz los muestra
+    # como resultados parciales (update_progress ya no publica una vez cancelado)
+    if progress_file and os.path.dirname(progress_file):
+        try:
+            obtener_publicador(progress_file).publicar({
+                'progress': PROGRESS_PERCENTAGE,
+                'status': " Proceso cancelado por el usuario",
+                'current_model': (f"Cancelado - {len(TOP_3_MODELS)} mejores modelos hasta ahora"
+                                  if TOP_3_MODELS else "Cancelado - sin modelos evaluados"),
+                'top_models': TOP_3_MODELS,
+                'cancelled': True
+            })
+        except Exception as e:
+            print(f"Error publicando resultados parciales: {e}")
     
     # Limpiar archivos de cancelación
     cleanup_cancellation_files(progress_file)
@@ -194,7 +227,11 @@ def setup_signal_handlers(progress_file):
     """NUEVA FUNCIÓN: Configurar manejadores de señales para cancelación elegante"""
     def signal_handler(signum, frame):
         print(f"\n  Señal {signum} recibida...")
-        handle_graceful_shutdown(progress_file)
+        if cancelacion_solicitada():
+            # Segunda señal: terminar sin esperar al siguiente punto de interrupción
+            handle_graceful_shutdown(progress_file)
+        # El bucle de búsqueda y los ajustes en curso (también en los workers) ven el evento
+        solicitar_cancelacion()
     
     # Configurar manejadores para diferentes señales
     signal.signal(signal.SIGINT, signal_handler)   # Ctrl+C
@@ -217,112 +254,130 @@ def cargar_excel():
         return None
     return file_path
 
-def evaluar_modelo_completo(serie, order, seasonal_order):
-    """Evalúa un modelo SARIMAX con múltiples métricas - CON VERIFICACIÓN DE CANCELACIÓN"""
-    global PROCESO_CANCELADO
+def metricas_modelo_fallido():
+    """Métricas asignadas a un modelo que no pudo ajustarse"""
+    return {
+        'rmse': float('inf'),
+        'mae': float('inf'),
+        'mape': 100,
+        'r2_score': -1,
+        'precision_mape': 0,
+        'precision_r2': 0,
+        'precision_rmse': 0,
+        'precision_final': 0,
+        'aic': float('inf'),
+        'bic': float('inf'),
+        'composite_score': float('inf'),
+        'n_params': 999,
+        'n_test': 0,
+        'pct_validacion': 0
+    }
+
+def calcular_metricas(results, test_data, order, seasonal_order, n_test, pct_validacion, validacion='holdout'):
+    """
+    Métricas de validación de un modelo ajustado sobre el período de entrenamiento
+    validacion='holdout': un único pronóstico de n_test pasos desde el final del entrenamiento
+    validacion='rolling': pronósticos desde cada origen del período de validación, sin reajustar
+    """
+    if validacion == 'rolling':
+        test_data, pred_mean = pronosticos_origen_movil(results, test_data)
+    else:
+        pred_mean = results.forecast(steps=n_test)
     
-    # Verificar cancelación antes de evaluar modelo
-    if PROCESO_CANCELADO:
+    metricas = calcular_metricas_pronostico(test_data, pred_mean)
+    
+    aic = results.aic
+    bic = results.bic
+    
+    complexity_penalty = sum(order) + sum(seasonal_order[:3])
+    composite_score = metricas['rmse'] + (complexity_penalty * 0.1)
+    
+    return {
+        **metricas,
+        'aic': float(aic),
+        'bic': float(bic),
+        'composite_score': float(composite_score),
+        'n_params': complexity_penalty,
+        'n_test': n_test,
+        'pct_validacion': pct_validacion
+    }
+
+def evaluar_modelo_completo(serie, order, seasonal_order, arranque_caliente=False, validacion='holdout',
+                            perfil=PERFIL_POR_DEFECTO):
+    """
+    Evalúa un modelo SARIMAX con múltiples métricas - CON VERIFICACIÓN DE CANCELACIÓN
+    Con arranque_caliente la optimización parte del modelo anidado más cercano ya ajustado
+    validacion: 'holdout' (un pronóstico) o 'rolling' (origen móvil, ver calcular_metricas)
+    perfil: Perfil de ajuste; solo las métricas del perfil preciso se guardan en la cache
+    """
+    # Verificar cancelación antes de evaluar modelo (en los workers, el evento del proceso principal)
+    if cancelacion_solicitada():
         raise InterruptedError("Proceso cancelado por el usuario")
     
+    corte = None
+    
     try:
-        if len(serie) >= 60:
-            pct_validacion = 0.30
-        elif len(serie) >= 36:
-            pct_validacion = 0.25
-        else:
-            pct_validacion = 0.20
-            
-        n_test = max(6, int(len(serie) * pct_validacion))
-        train_data = serie[:-n_test]
-        test_data = serie[-n_test:]
+        # División y huellas compartidas por todo el corte (d, D, s)
+        corte, reutilizado = preparar_corte(serie, order, seasonal_order)
+        info = info_corte(corte, reutilizado)
         
         # Verificar cancelación antes del ajuste del modelo
-        if PROCESO_CANCELADO:
+        if cancelacion_solicitada():
             raise InterruptedError("Proceso cancelado por el usuario")
         
-        model = SARIMAX(
-            train_data,
-            order=order,
-            seasonal_order=seasonal_order,
-            enforce_stationarity=False,
-            enforce_invertibility=False
-        )
-        results = model.fit(disp=False)
+        # Reutilizar métricas de una ejecución anterior sobre los mismos datos
+        cache = obtener_cache()
+        registro = cache.obtener(corte.train, order, seasonal_order, corte.huella_train) if cache is not None else None
+        if registro is not None and registro['metricas'] is not None \
+                and registro['huella_validacion'] == corte.huella_validacion(validacion):
+            return dict(registro['metricas'], desde_cache=True, corte=info)
+        
+        results = ajustar_sarimax(corte.train, order, seasonal_order, registro=registro,
+                                  arranque_caliente=arranque_caliente, huella=corte.huella_train, perfil=perfil)
+        info_ajuste = dict(cache_ajustes.ULTIMO_AJUSTE)
         
         # Verificar cancelación después del ajuste
-        if PROCESO_CANCELADO:
+        if cancelacion_solicitada():
             raise InterruptedError("Proceso cancelado por el usuario")
         
-        pred = results.get_forecast(steps=n_test)
-        pred_mean = pred.predicted_mean
+        metrics = calcular_metricas(results, corte.test, order, seasonal_order, corte.n_test,
+                                    corte.pct_validacion, validacion)
         
-        rmse = np.sqrt(mean_squared_error(test_data, pred_mean))
-        mae = np.mean(np.abs(test_data - pred_mean))
-        
-        epsilon = 1e-8
-        mape = np.mean(np.abs((test_data - pred_mean) / (test_data + epsilon))) * 100
-        
-        ss_res = np.sum((test_data - pred_mean) ** 2)
-        ss_tot = np.sum((test_data - np.mean(test_data)) ** 2)
-        r2_score = 1 - (ss_res / (ss_tot + epsilon))
-        
-        precision_mape = max(0, 100 - mape)
-        precision_r2 = max(0, r2_score * 100)
-        
-        mean_actual = np.mean(test_data)
-        precision_rmse = max(0, (1 - rmse/mean_actual) * 100)
-        
-        precision_final = (precision_mape * 0.4 + precision_r2 * 0.4 + precision_rmse * 0.2)
-        precision_final = max(0, min(100, precision_final))
-        
-        aic = results.aic
-        bic = results.bic
-        
-        complexity_penalty = sum(order) + sum(seasonal_order[:3])
-        composite_score = rmse + (complexity_penalty * 0.1)
-        
-        return {
-            'rmse': rmse,
-            'mae': mae,
-            'mape': mape,
-            'r2_score': r2_score,
-            'precision_mape': precision_mape,
-            'precision_r2': precision_r2, 
-            'precision_rmse': precision_rmse,
-            'precision_final': precision_final,
-            'aic': aic,
-            'bic': bic,
-            'composite_score': composite_score,
-            'n_params': complexity_penalty,
-            'n_test': n_test,
-            'pct_validacion': pct_validacion
-        }
+        if cache is not None and perfil == PERFIL_POR_DEFECTO:
+            cache.guardar(corte.train, order, seasonal_order, metricas=metrics, huella=corte.huella_train,
+                          huella_validacion=corte.huella_validacion(validacion))
+        
+        return dict(metrics, ajuste=info_ajuste, corte=info)
         
     except InterruptedError:
         # Re-lanzar la excepción de cancelación
         raise
     except Exception as e:
         # Verificar si fue una cancelación disfrazada como otra excepción
-        if PROCESO_CANCELADO:
+        if cancelacion_solicitada():
             raise InterruptedError("Proceso cancelado por el usuario")
-            
-        return {
-            'rmse': float('inf'),
-            'mae': float('inf'),
-            'mape': 100,
-            'r2_score': -1,
-            'precision_mape': 0,
-            'precision_r2': 0,
-            'precision_rmse': 0,
-            'precision_final': 0,
-            'aic': float('inf'),
-            'bic': float('inf'),
-            'composite_score': float('inf'),
-            'n_params': 999,
-            'n_test': 0,
-            'pct_validacion': 0
-        }
+        
+        metrics = metricas_modelo_fallido()
+        
+        # Recordar también los modelos que no convergen para no reintentarlos
+        cache = obtener_cache()
+        if cache is not None and corte is not None and perfil == PERFIL_POR_DEFECTO:
+            cache.guardar(corte.train, order, seasonal_order, metricas=metrics, huella=corte.huella_train,
+                          huella_validacion=corte.huella_validacion(validacion))
+        
+        return metrics
+
+
+def formatear_duracion(segundos):
+    """Duración legible (h:mm:ss o m:ss)"""
+    segundos = int(round(segundos))
+    horas, resto = divmod(segundos, 3600)
+    minutos, segundos = divmod(resto, 60)
+    return f"{horas}:{minutos:02d}:{segundos:02d}" if horas else f"{minutos}:{segundos:02d}"
+
+def metrics_para_diario(metrics):
+    """Métricas numéricas de una evaluación, sin la información auxiliar del ajuste"""
+    return {clave: valor for clave, valor in metrics.items() if clave not in ('ajuste', 'desde_cache', 'corte')}
 
 def actualizar_top_3_modelos(order, seasonal_order, metrics):
     """Actualizar la lista de top 3 modelos basado en precisión"""
@@ -389,6 +444,132 @@ def finalizar_analisis_y_guardar_bridge():
     
     print("="*80)
 
+def registrar_estadistica_ajuste(estadisticas, info_ajuste):
+    """Acumular tipo de arranque, iteraciones y tiempo de un ajuste de la búsqueda"""
+    arranque = info_ajuste.get('arranque', 'frio')
+    acumulado = estadisticas.setdefault(arranque, {'ajustes': 0, 'iteraciones': 0, 'segundos': 0.0})
+    acumulado['ajustes'] += 1
+    acumulado['iteraciones'] += info_ajuste.get('iteraciones', 0)
+    acumulado['segundos'] += info_ajuste.get('segundos', 0.0)
+
+def imprimir_resumen_ajustes(estadisticas, segundos_busqueda):
+    """Resumen por ejecución del efecto del arranque en caliente"""
+    print("\n" + "="*80)
+    print("RESUMEN DE AJUSTES SARIMAX DE LA BÚSQUEDA")
+    print("="*80)
+    
+    etiquetas = {
+        'caliente': "Arranque en caliente",
+        'frio': "Arranque por defecto",
+        'respaldo': "Caliente sin converger (reajustado)",
+        'cache': "Parámetros desde cache",
+        'proceso': "Ajuste ya hecho en este proceso"
+    }
+    total_segundos = 0.0
+    for arranque, etiqueta in etiquetas.items():
+        datos = estadisticas.get(arranque)
+        if not datos or not datos['ajustes']:
+            continue
+        total_segundos += datos['segundos']
+        print(f"  {etiqueta}: {datos['ajustes']} ajustes | "
+              f"iteraciones promedio {datos['iteraciones'] / datos['ajustes']:.1f} | "
+              f"tiempo promedio {datos['segundos'] / datos['ajustes'] * 1000:.1f} ms")
+    
+    print(f"  Tiempo total de ajuste: {total_segundos:.1f} s")
+    print(f"  Tiempo total de búsqueda: {segundos_busqueda:.1f} s")
+    print("="*80)
+
+def registrar_estadistica_corte(estadisticas, info_corte):
+    """Acumular por corte (d, D, s) cuántas evaluaciones reutilizaron su preparación"""
+    clave = tuple(info_corte['clave'])
+    acumulado = estadisticas.setdefault(clave, {'evaluaciones': 0, 'reutilizadas': 0, 'segundos_preparacion': 0.0})
+    acumulado['evaluaciones'] += 1
+    if info_corte['reutilizado']:
+        acumulado['reutilizadas'] += 1
+        acumulado['segundos_preparacion'] += info_corte['segundos_preparacion']
+
+def imprimir_resumen_cortes(estadisticas):
+    """Reutilización de la preparación compartida por cada corte (d, D, s) de la grilla"""
+    if not estadisticas:
+        return
+    
+    print("\nPREPARACIÓN COMPARTIDA POR CORTE (d, D, s): división entrenamiento/validación y huellas")
+    print("  SARIMAX reconstruye su espacio de estados en cada candidato; solo se ahorra la división y el hashing")
+    total_ahorro = 0.0
+    for (d, D, s), datos in sorted(estadisticas.items()):
+        total_ahorro += datos['segundos_preparacion']
+        print(f"  d={d}, D={D}, s={s}: {datos['evaluaciones']} evaluaciones | "
+              f"{datos['reutilizadas']} reutilizaron la preparación | "
+              f"ahorro estimado {datos['segundos_preparacion'] * 1000:.1f} ms")
+    print(f"  Ahorro total estimado (división y huellas): {total_ahorro:.2f} s")
+
+def completar_top_fuera_de_presupuesto(estrategia, funcion_evaluacion, serie, al_completar):
+    """
+    Presupuesto de tiempo agotado con menos de 3 modelos en el TOP 3: evaluar en este proceso,
+    fuera del presupuesto, los siguientes candidatos de la estrategia hasta completarlo, para que
+    la búsqueda termine igualmente con el bridge actualizado y un modelo final
+    """
+    candidatos = estrategia.siguientes_candidatos(3 - len(TOP_3_MODELS))
+    if candidatos:
+        print(f"TOP 3 incompleto al agotarse el presupuesto - evaluando {len(candidatos)} "
+              "candidatos más de la estrategia fuera de él")
+    for order, seasonal_order in candidatos:
+        if cancelacion_solicitada():
+            raise InterruptedError("Proceso cancelado por el usuario")
+        try:
+            metrics, error = funcion_evaluacion(serie, order, seasonal_order), None
+        except InterruptedError:
+            raise
+        except Exception as e:
+            metrics, error = None, e
+        al_completar(order, seasonal_order, metrics, error)
+
+def ajustar_modelo_final(serie, ranking, max_intentos=3):
+    """
+    Etapa final de la búsqueda: ajustar sobre todo el histórico el mejor modelo del ranking.
+    Si no converge, se intenta con los siguientes (hasta max_intentos).
+    
+    Returns:
+        Tupla (resultados, (order, seasonal_order)) o (None, None) si ninguno se pudo ajustar
+    """
+    for posicion, (order, seasonal_order) in enumerate(ranking[:max_intentos], 1):
+        if cancelacion_solicitada():
+            raise InterruptedError("Proceso cancelado por el usuario")
+        try:
+            print(f"Ajuste final #{posicion}: order={order}, seasonal_order={seasonal_order}")
+            return ajustar_sarimax(serie, order, seasonal_order), (order, seasonal_order)
+        except InterruptedError:
+            raise
+        except Exception as e:
+            print(f"No se pudo ajustar el modelo final order={order}, seasonal_order={seasonal_order}: {e}")
+    
+    return None, None
+
+def preparar_artefactos_presets(serie, modelos, validacion='holdout'):
+    """
+    Dejar en la cache de ajustes los artefactos que usan Modelo.py y visual.py para cada preset del
+    bridge: parámetros y métricas del ajuste preciso de entrenamiento, y parámetros del ajuste sobre
+    todo el histórico. Así un preset elegido en selectorOrder.py se pronostica y valida sin reajustar.
+    Los modelos ya guardados (por ejemplo el ganador del ajuste final) solo se consultan.
+    """
+    if obtener_cache() is None:
+        return
+    
+    inicio = time.time()
+    for modelo in modelos:
+        if cancelacion_solicitada():
+            raise InterruptedError("Proceso cancelado por el usuario")
+        order, seasonal_order = tuple(modelo['order']), tuple(modelo['seasonal_order'])
+        try:
+            evaluar_modelo_completo(serie, order, seasonal_order, validacion=validacion)
+            ajustar_sarimax(serie, order, seasonal_order)
+        except InterruptedError:
+            raise
+        except Exception as e:
+            print(f"No se pudo guardar el artefacto de order={order}, seasonal_order={seasonal_order}: {e}")
+    print(f"Artefactos de {len(modelos)} presets disponibles para Modelo.py y visual.py "
+          f"({time.time() - inicio:.1f} s)")
+
 class AutoArimaWithMultipleMetrics:
     """Wrapper personalizado para auto_arima con comunicación frontend - CON CANCELACIÓN"""
     
@@ -404,14 +585,41 @@ class AutoArimaWithMultipleMetrics:
         self.mejor_params_composite = None
         self.mejor_params_precision = None
         self.resultados = []
+        self.presupuesto_tiempo = None
+        self.fin_presupuesto = None
         
     def set_total_iterations(self, total):
         """Establecer el total de iteraciones para calcular progreso"""
         self.total_iteraciones = total
         print(f"Total de combinaciones a evaluar: {total}")
+    
+    def set_time_budget(self, segundos):
+        """Limitar la búsqueda a un tiempo máximo; el progreso pasa a reflejar el tiempo restante"""
+        self.presupuesto_tiempo = segundos
+        self.fin_presupuesto = time.monotonic() + segundos
+        print(f"Presupuesto de tiempo: {formatear_duracion(segundos)}")
+    
+    def tiempo_restante(self):
+        """Segundos restantes del presupuesto (None si no hay presupuesto)"""
+        if self.fin_presupuesto is None:
+            return None
+        return max(0.0, self.fin_presupuesto - time.monotonic())
+    
+    def presupuesto_agotado(self):
+        restante = self.tiempo_restante()
+        return restante is not None and restante <= 0
+    
+    def calcular_progreso(self):
+        """Porcentaje de avance y segundos restantes del presupuesto (si lo hay)"""
+        porcentaje = (self.iteracion / self.total_iteraciones) * 100 if self.total_iteraciones > 0 else 0
+        restante = self.tiempo_restante()
+        if restante is not None:
+            # Con presupuesto la búsqueda termina por tiempo antes que por número de modelos
+            porcentaje = min(100.0, max(porcentaje, 100 * (1 - restante / self.presupuesto_tiempo)))
+        return porcentaje, restante
         
     def evaluar_y_mostrar(self, order, seasonal_order):
-        """Evalúa un modelo y actualiza progreso para la interfaz - CON CANCELACIÓN"""
+        """Evalúa un modelo en este proceso y actualiza progreso para la interfaz - CON CANCELACIÓN"""
         global PROCESO_CANCELADO
         
         # VERIFICAR CANCELACIÓN AL INICIO DE CADA ITERACIÓN
@@ -419,70 +627,93 @@ class AutoArimaWithMultipleMetrics:
             print(f"Cancelación detectada en iteración {self.iteracion + 1}")
             handle_graceful_shutdown.iteraciones = self.iteracion  # Guardar contador
             handle_graceful_shutdown(self.progress_file)
-            
-        self.iteracion += 1
-        
-        progress_percentage = (self.iteracion / self.total_iteraciones) * 100 if self.total_iteraciones > 0 else 0
-        
-        if self.progress_file and self.total_iteraciones > 0:
-            model_info = f"order={order}, seasonal_order={seasonal_order}"
-            status = f"Evaluando modelo {self.iteracion} de {self.total_iteraciones} ({progress_percentage:.1f}%)"
-            
-            # Verificar cancelación durante actualización de progreso
-            if not update_progress(self.progress_file, progress_percentage, status, model_info):
-                print(f"Cancelación durante actualización de progreso - iteración {self.iteracion}")
-                handle_graceful_shutdown.iteraciones = self.iteracion
-                handle_graceful_shutdown(self.progress_file)
         
         try:
-            # VERIFICAR CANCELACIÓN ANTES DE EVALUAR MODELO
+            metrics = evaluar_modelo_completo(self.serie, order, seasonal_order)
+            return self.registrar_resultado(order, seasonal_order, metrics)
+            
+        except InterruptedError:
+            # Manejar cancelación elegante
+            print(f"Proceso interrumpido en iteración {self.iteracion}")
+            handle_graceful_shutdown.iteraciones = self.iteracion
+            handle_graceful_shutdown(self.progress_file)
+        except Exception as e:
             if PROCESO_CANCELADO:
                 handle_graceful_shutdown.iteraciones = self.iteracion
                 handle_graceful_shutdown(self.progress_file)
-            
-            metrics = evaluar_modelo_completo(self.serie, order, seasonal_order)
-            actualizar_top_3_modelos(order, seasonal_order, metrics)
-            
-            print(f"[{progress_percentage:5.1f}%] Modelo {self.iteracion:3d}/{self.total_iteraciones}: "
-                  f"order={order}, seasonal_order={seasonal_order}")
-            print(f"         RMSE={metrics['rmse']:.4f}, Precisión={metrics['precision_final']:.1f}%, "
-                  f"MAPE={metrics['mape']:.1f}%, R²={metrics['r2_score']:.3f}")
-            
-            self.resultados.append({
-                'order': order,
-                'seasonal_order': seasonal_order,
-                'metrics': metrics
-            })
-            
+            else:
+                print(f"Error en iteración {self.iteracion}: {e}")
+                return float('inf')
+    
+    def registrar_resultado(self, order, seasonal_order, metrics, mostrar=True):
+        """Registrar un modelo ya evaluado (en este proceso, en un worker o en el diario) y actualizar progreso"""
+        self.iteracion += 1
+        
+        progress_percentage, restante = self.calcular_progreso()
+        
+        actualizar_top_3_modelos(order, seasonal_order, metrics)
+        
+        self.resultados.append({
+            'order': order,
+            'seasonal_order': seasonal_order,
+            'metrics': metrics
+        })
+        
+        if not mostrar:
+            # Resultado recuperado del diario: solo actualizar los mejores, sin progreso ni salida
             if metrics['rmse'] < self.mejor_rmse:
                 self.mejor_rmse = metrics['rmse']
                 self.mejor_params_rmse = (order, seasonal_order)
-                print(f"         *** NUEVO MEJOR RMSE: {metrics['rmse']:.4f} ***")
-            
             if metrics['composite_score'] < self.mejor_composite:
                 self.mejor_composite = metrics['composite_score']
                 self.mejor_params_composite = (order, seasonal_order)
-                print(f"         *** NUEVO MEJOR SCORE COMPUESTO: {metrics['composite_score']:.4f} ***")
-            
             if metrics['precision_final'] > self.mejor_precision:
                 self.mejor_precision = metrics['precision_final']
                 self.mejor_params_precision = (order, seasonal_order)
-                print(f"         *** NUEVA MEJOR PRECISIÓN: {metrics['precision_final']:.1f}% ***")
-            
             return metrics['rmse']
+        
+        if self.progress_file and self.total_iteraciones > 0:
+            model_info = f"order={order}, seasonal_order={seasonal_order}"
+            if restante is None:
+                status = f"Evaluado modelo {self.iteracion} de {self.total_iteraciones} ({progress_percentage:.1f}%)"
+            else:
+                status = f"Evaluados {self.iteracion} modelos - tiempo restante {formatear_duracion(restante)}"
             
-        except InterruptedError:
-            # Manejar cancelación elegante
-            print(f"Proceso interrumpido en iteración {self.iteracion}")
-            handle_graceful_shutdown.iteraciones = self.iteracion
-            handle_graceful_shutdown(self.progress_file)
-        except Exception as e:
-            if PROCESO_CANCELADO:
+            # Verificar cancelación durante actualización de progreso
+            if not update_progress(self.progress_file, progress_percentage, status, model_info, restante,
+                                   intermedio=True):
+                print(f"Cancelación durante actualización de progreso - iteración {self.iteracion}")
                 handle_graceful_shutdown.iteraciones = self.iteracion
                 handle_graceful_shutdown(self.progress_file)
-            else:
-                print(f"Error en iteración {self.iteracion}: {e}")
-                return float('inf')
+        
+        print(f"[{progress_percentage:5.1f}%] Modelo {self.iteracion:3d}/{self.total_iteraciones}: "
+              f"order={order}, seasonal_order={seasonal_order}")
+        print(f"         RMSE={metrics['rmse']:.4f}, Precisión={metrics['precision_final']:.1f}%, "
+              f"MAPE={metrics['mape']:.1f}%, R²={metrics['r2_score']:.3f}")
+        
+        if metrics['rmse'] < self.mejor_rmse:
+            self.mejor_rmse = metrics['rmse']
+            self.mejor_params_rmse = (order, seasonal_order)
+            print(f"         *** NUEVO MEJOR RMSE: {metrics['rmse']:.4f} ***")
+        
+        if metrics['composite_score'] < self.mejor_composite:
+            self.mejor_composite = metrics['composite_score']
+            self.mejor_params_composite = (order, seasonal_order)
+            print(f"         *** NUEVO MEJOR SCORE COMPUESTO: {metrics['composite_score']:.4f} ***")
+        
+        if metrics['precision_final'] > self.mejor_precision:
+            self.mejor_precision = metrics['precision_final']
+            self.mejor_params_precision = (order, seasonal_order)
+            print(f"         *** NUEVA MEJOR PRECISIÓN: {metrics['precision_final']:.1f}% ***")
+        
+        return metrics['rmse']
+    
+    def ranking_compuesto(self, top_k=None):
+        """Combinaciones evaluadas ordenadas por score compuesto (menor es mejor)"""
+        validos = [r for r in self.resultados if np.isfinite(r['metrics']['composite_score'])]
+        validos.sort(key=lambda r: r['metrics']['composite_score'])
+        ranking = [(r['order'], r['seasonal_order']) for r in validos]
+        return ranking[:top_k] if top_k else ranking
     
     def get_resumen_final(self):
         """Proporciona un resumen final con los mejores modelos"""
@@ -518,8 +749,27 @@ class AutoArimaWithMultipleMetrics:
         print("="*80)
         return self.mejor_params_composite
 
-def analizar_saidi(file_path, progress_file=None):
-    """Función principal de análisis SAIDI - MODIFICADA CON CANCELACIÓN Y PYINSTALLER"""
+def analizar_saidi(file_path, progress_file=None, workers=None, arranque_caliente=False, estrategia="exhaustive",
+                   espacio="standard", max_evaluaciones=None, reanudar=False, presupuesto_tiempo=None,
+                   validacion="holdout", perfil_busqueda=PERFIL_POR_DEFECTO, fraccion_prefiltro=None, motor_ar='sarimax', datos=None):
+    """Función principal de análisis SAIDI - MODIFICADA CON CANCELACIÓN Y PYINSTALLER
+    
+    Args:
+        file_path: Ruta del archivo Excel
+        progress_file: Archivo de progreso para comunicación con frontend
+        workers: Procesos para evaluar combinaciones (None = número de núcleos)
+        arranque_caliente: Iniciar cada ajuste desde el modelo anidado más cercano ya ajustado
+        estrategia: Nombre de la estrategia de búsqueda (exhaustive, prescreen, stepwise, bayesian)
+        espacio: Rangos de parámetros a explorar ("standard" o "wide")
+        max_evaluaciones: Presupuesto de modelos para stepwise y bayesian (None = valor por defecto)
+        reanudar: Continuar una búsqueda anterior interrumpida a partir de su diario
+        presupuesto_tiempo: Segundos máximos de búsqueda; al agotarse se finaliza con lo mejor encontrado
+        validacion: Esquema de validación de cada modelo ("holdout" u origen móvil "rolling")
+        perfil_busqueda: Perfil de ajuste de las evaluaciones completas (el modelo final usa siempre el preciso)
+        fraccion_prefiltro: Fracción de la grilla que el prefiltro envía al ajuste completo (None = valor por defecto)
+        motor_ar: Motor de los candidatos AR puros: 'sarimax' (ajuste individual) o 'levinson' (todos a la vez)
+        datos: Tupla (df, col_saidi) ya preparada por la interfaz (--data); si es None se lee el Excel
+    """
     global PROCESO_CANCELADO
     
     try:
@@ -554,30 +804,26 @@ def analizar_saidi(file_path, progress_file=None):
         if check_cancellation(progress_file):
             handle_graceful_shutdown(progress_file)
         
-        # Cargar datos
-        df = pd.read_excel(file_path, sheet_name="Hoja1")
-        print("Columnas encontradas:", df.columns.tolist())
-
-        # Verificar cancelación
-        if check_cancellation(progress_file):
-            handle_graceful_shutdown(progress_file)
-
-        # Detectar columna de fecha
-        if "Fecha" in df.columns:
-            df["Fecha"] = pd.to_datetime(df["Fecha"])
-            df.set_index("Fecha", inplace=True)
+        # Cargar datos (serie compartida por la interfaz o el Excel)
+        if datos is not None:
+            df, col_saidi = datos
         else:
-            df.iloc[:, 0] = pd.to_datetime(df.iloc[:, 0])
-            df.set_index(df.columns[0], inplace=True)
+            df = leer_hoja_excel(file_path, "Hoja1")
+            print("Columnas encontradas:", df.columns.tolist())
 
-        # Detectar columna de SAIDI
-        col_saidi = "SAIDI" if "SAIDI" in df.columns else "SAIDI Histórico"
-        if col_saidi not in df.columns:
-            error_msg = "No se encontró la columna SAIDI ni SAIDI Histórico."
-            print(error_msg)
-            if progress_file:
-                update_progress(progress_file, 0, f"Error: {error_msg}", "")
-            return
+            # Verificar cancelación
+            if check_cancellation(progress_file):
+                handle_graceful_shutdown(progress_file)
+
+            # Fecha como índice y detección de la columna SAIDI
+            try:
+                df, col_saidi = preparar_hoja_saidi(df)
+            except ValueError as e:
+                error_msg = str(e)
+                print(error_msg)
+                if progress_file:
+                    update_progress(progress_file, 0, f"Error: {error_msg}", "")
+                return
 
         if progress_file:
             update_progress(progress_file, 10, "Datos cargados correctamente. Preparando análisis...", "")
@@ -607,73 +853,125 @@ def analizar_saidi(file_path, progress_file=None):
         if check_cancellation(progress_file):
             handle_graceful_shutdown(progress_file)
 
-        # Búsqueda exhaustiva de parámetros
+        # Diario de la búsqueda: cada evaluación queda en disco para poder reanudar
+        huella = huella_serie(historico[col_saidi])
+        diario = DiarioBusqueda(ruta_diario(huella, estrategia, espacio), huella, estrategia, espacio,
+                                validacion=validacion, perfil_busqueda=perfil_busqueda, motor_ar=motor_ar)
+        previos = diario.cargar() if reanudar else []
+        limpiar_diarios_antiguos(excepto=diario.ruta)
+        
+        # Búsqueda de parámetros con la estrategia seleccionada
+        espacio_busqueda = ESPACIOS_BUSQUEDA[espacio]
+        opciones_estrategia = {
+            'funcion_prefiltro': partial(puntuar_candidatos, historico[col_saidi])
+        }
+        if fraccion_prefiltro:
+            opciones_estrategia['fraccion_conservada'] = fraccion_prefiltro
+        if max_evaluaciones:
+            opciones_estrategia['max_evaluaciones'] = max_evaluaciones
+        if presupuesto_tiempo:
+            opciones_estrategia['por_complejidad'] = True
+            opciones_estrategia['tiempo_restante'] = evaluador.tiempo_restante
+        estrategia_busqueda = crear_estrategia(estrategia, espacio_busqueda, **opciones_estrategia)
+        
         print("\n" + "="*80)
-        print("BÚSQUEDA EXHAUSTIVA DE PARÁMETROS ÓPTIMOS")
+        print(f"BÚSQUEDA DE PARÁMETROS ÓPTIMOS - ESTRATEGIA: {estrategia_busqueda.nombre.upper()} "
+              f"({estrategia_busqueda.descripcion})")
         print(f"Dataset: {len(historico)} observaciones desde {historico.index[0].strftime('%Y-%m')} hasta {historico.index[-1].strftime('%Y-%m')}")
+        print(f"Espacio de búsqueda: {espacio_busqueda.describir()}")
         print("="*80)
         
-        from itertools import product
-        
-        # Rangos de parámetros
-        p_range = range(0, 6)   
-        d_range = range(0, 2)  
-        q_range = range(0, 6)   
-        P_range = range(0, 6)   
-        D_range = range(0, 2)   
-        Q_range = range(0, 6)   
-       
-        s_range = [12]  
-        
-        mejor_modelo_global = None
-        total_combinations = len(p_range) * len(d_range) * len(q_range) * len(P_range) * len(D_range) * len(Q_range) * len(s_range)
+        total_evaluaciones = estrategia_busqueda.total_evaluaciones()
+        evaluador.set_total_iterations(total_evaluaciones)
         
-        evaluador.set_total_iterations(total_combinations)
+        if reanudar:
+            if previos:
+                # Restaurar TOP 3, ranking y progreso, y que la estrategia no repita lo ya evaluado
+                for order, seasonal_order, metrics in previos:
+                    evaluador.registrar_resultado(order, seasonal_order, metrics, mostrar=False)
+                estrategia_busqueda.precargar({(order, seasonal_order): metrics for order, seasonal_order, metrics in previos})
+                print(f"Reanudando búsqueda desde el diario {diario.ruta}: {len(previos)} modelos evaluados")
+            else:
+                print("No hay diario de una búsqueda anterior compatible - se inicia desde el principio")
+        diario.abrir(reanudar=reanudar)
         
         if progress_file:
-            update_progress(progress_file, 15, f"Iniciando evaluación de {total_combinations} combinaciones", 
-                          "Preparando búsqueda exhaustiva...")
+            update_progress(progress_file, 15, f"Iniciando evaluación de hasta {total_evaluaciones} modelos", 
+                          f"Preparando búsqueda ({estrategia_busqueda.descripcion})...")
         
         # Verificar cancelación antes del bucle principal
         if check_cancellation(progress_file):
             handle_graceful_shutdown(progress_file)
         
-        # Evaluar combinaciones - CON VERIFICACIÓN DE CANCELACIÓN EN CADA ITERACIÓN
+        reutilizados = [0]  # Combinaciones cuyas métricas vienen de la cache
+        estadisticas_ajuste = {}
+        estadisticas_cortes = {}
+        
+        def al_completar(order, seasonal_order, metrics, error):
+            if error is not None:
+                print(f"Error evaluando order={order}, seasonal_order={seasonal_order}: {error}")
+                metrics = metricas_modelo_fallido()
+            
+            if metrics.get('desde_cache'):
+                reutilizados[0] += 1
+            elif 'ajuste' in metrics:
+                registrar_estadistica_ajuste(estadisticas_ajuste, metrics['ajuste'])
+            if 'corte' in metrics:
+                registrar_estadistica_corte(estadisticas_cortes, metrics['corte'])
+            
+            diario.registrar(order, seasonal_order, metrics_para_diario(metrics))
+            evaluador.registrar_resultado(order, seasonal_order, metrics)
+            return metrics
+        
+        print(f"Arranque en caliente: {'activado' if arranque_caliente else 'desactivado'}")
+        print(f"Validación: {'origen móvil (sin reajustar)' if validacion == 'rolling' else 'holdout único'}")
+        print(f"Perfil de ajuste de la búsqueda: {perfil_busqueda} ({PERFILES_AJUSTE[perfil_busqueda]['descripcion']})")
+        if presupuesto_tiempo:
+            evaluador.set_time_budget(presupuesto_tiempo)
+        inicio_busqueda = time.perf_counter()
+        
+        if motor_ar == 'levinson':
+            if estrategia_busqueda.cubre_grilla:
+                # Todos los AR puros de la grilla en una pasada; la estrategia no los vuelve a ajustar
+                autorregresivos = [c for c in espacio_busqueda.candidatos()
+                                   if es_autorregresivo(c) and c not in estrategia_busqueda.evaluados]
+                inicio_ar = time.perf_counter()
+                resultados_ar = evaluar_autorregresivos(historico[col_saidi], autorregresivos, validacion)
+                segundos_ar = time.perf_counter() - inicio_ar
+                for (order, seasonal_order), metrics in resultados_ar.items():
+                    al_completar(order, seasonal_order, metrics, None)
+                estrategia_busqueda.precargar(resultados_ar)
+                print(f"Motor Levinson-Durbin: {len(resultados_ar)} de {len(autorregresivos)} candidatos AR puros "
+                      f"evaluados en {segundos_ar:.3f} s (el resto, sin muestra suficiente, queda para SARIMAX)")
+            else:
+                print(f"Motor Levinson-Durbin: no se usa con la estrategia {estrategia_busqueda.nombre} "
+                      "(sus modelos cuentan dentro del presupuesto de evaluaciones)")
+        
+        motor = MotorBusquedaParalela(
+            historico[col_saidi],
+            partial(evaluar_modelo_completo, arranque_caliente=arranque_caliente, validacion=validacion,
+                    perfil=perfil_busqueda),
+            workers=workers,
+            verificar_cancelacion=lambda: check_cancellation(progress_file) or evaluador.presupuesto_agotado()
+        )
+        print(f"Workers de evaluación: {motor.workers}")
+        
+        completado = False
         try:
-            for p, d, q in product(p_range, d_range, q_range):
-                for P, D, Q in product(P_range, D_range, Q_range):
-                    for s in s_range:
-                        # VERIFICACIÓN CRÍTICA: Cancelación en cada iteración del bucle
-                        if check_cancellation(progress_file):
-                            print("Cancelación detectada en bucle principal")
-                            handle_graceful_shutdown(progress_file)
-                        
-                        order = (p, d, q)
-                        seasonal_order = (P, D, Q, s)
-
-                        rmse = evaluador.evaluar_y_mostrar(order, seasonal_order)
-                        
-                        try:
-                            # Verificar cancelación antes de crear modelo temporal
-                            if PROCESO_CANCELADO or check_cancellation(progress_file):
-                                handle_graceful_shutdown(progress_file)
-                            
-                            temp_model = SARIMAX(
-                                historico[col_saidi],
-                                order=order,
-                                seasonal_order=seasonal_order,
-                                enforce_stationarity=False,
-                                enforce_invertibility=False
-                            )
-                            temp_results = temp_model.fit(disp=False)
-                            
-                            if order == evaluador.mejor_params_composite[0] and seasonal_order == evaluador.mejor_params_composite[1]:
-                                mejor_modelo_global = temp_results
-                                
-                        except Exception as e:
-                            if PROCESO_CANCELADO:
-                                handle_graceful_shutdown(progress_file)
-                            continue
+            with motor:
+                completado = estrategia_busqueda.ejecutar(motor, al_completar)
+            
+            if not completado and evaluador.presupuesto_agotado() and not check_cancellation(progress_file):
+                # Fin por tiempo: se finaliza igual que una búsqueda completa con lo evaluado hasta ahora
+                print(f"\nPresupuesto de tiempo agotado: {len(evaluador.resultados)} modelos evaluados "
+                      f"de {total_evaluaciones} posibles")
+                if len(TOP_3_MODELS) < 3:
+                    completar_top_fuera_de_presupuesto(estrategia_busqueda, motor.funcion_evaluacion,
+                                                       historico[col_saidi], al_completar)
+            elif not completado:
+                print("Cancelación detectada en bucle principal")
+                handle_graceful_shutdown.iteraciones = evaluador.iteracion
+                handle_graceful_shutdown(progress_file)
         
         except KeyboardInterrupt:
             print("Interrupción por teclado (Ctrl+C)")
@@ -681,6 +979,16 @@ def analizar_saidi(file_path, progress_file=None):
         except InterruptedError:
             print("Proceso interrumpido")
             handle_graceful_shutdown(progress_file)
+        finally:
+            if completado:
+                diario.eliminar()
+            else:
+                # Búsqueda cortada por tiempo, cancelada o con error: se conserva para --resume
+                diario.cerrar()
+        
+        print(f"Combinaciones reutilizadas desde la cache de ajustes: {reutilizados[0]} de {len(evaluador.resultados)}")
+        imprimir_resumen_ajustes(estadisticas_ajuste, time.perf_counter() - inicio_busqueda)
+        imprimir_resumen_cortes(estadisticas_cortes)
         
         # Verificar cancelación antes de finalizar
         if check_cancellation(progress_file):
@@ -694,6 +1002,26 @@ def analizar_saidi(file_path, progress_file=None):
         
         # *** LLAMAR A LA NUEVA FUNCIÓN DE BRIDGE ***
         finalizar_analisis_y_guardar_bridge()
+        
+        # ETAPA FINAL: ajustar sobre todo el histórico solo el modelo ganador
+        # (o el siguiente del ranking si el ganador no converge)
+        if progress_file:
+            update_progress(progress_file, 90, "Ajustando modelo final sobre todo el histórico", 
+                          f"Modelo: order={mejor_params_final[0]}, seasonal_order={mejor_params_final[1]}"
+                          if mejor_params_final else "")
+        
+        if check_cancellation(progress_file):
+            handle_graceful_shutdown(progress_file)
+        
+        mejor_modelo_global, mejor_params_final = ajustar_modelo_final(
+            historico[col_saidi], evaluador.ranking_compuesto()
+        )
+        
+        # Presets del bridge listos para Predicción y Validación sin nuevos ajustes
+        if progress_file:
+            update_progress(progress_file, 93, "Guardando artefactos de los presets",
+                          f"{len(TOP_3_MODELS)} modelos")
+        preparar_artefactos_presets(historico[col_saidi], TOP_3_MODELS, validacion)
 
         # Usar auto_arima como respaldo si es necesario
         if mejor_modelo_global is None:
@@ -726,11 +1054,10 @@ def analizar_saidi(file_path, progress_file=None):
                 enforce_stationarity=False,
                 enforce_invertibility=False
             )
-            results = model.fit(disp=False)
+            results = model.fit(disp=False, callback=punto_interrupcion)
         else:
             results = mejor_modelo_global
-            order = mejor_params_final[0]
-            seasonal_order = mejor_params_final[1]
+            order, seasonal_order = mejor_params_final
 
         print(f"\nModelo final seleccionado:")
         print(f"order={order}")
@@ -768,7 +1095,11 @@ def analizar_saidi(file_path, progress_file=None):
         
         # Progreso final con top 3 modelos
         if progress_file:
-            final_status = f"Proceso completado. Predicciones: {len(pred_mean)}. Top modelo: {TOP_3_MODELS[0]['precision_final']:.1f}% precisión"
+            if TOP_3_MODELS:
+                final_status = (f"Proceso completado. Predicciones: {len(pred_mean)}. "
+                                f"Top modelo: {TOP_3_MODELS[0]['precision_final']:.1f}% precisión")
+            else:
+                final_status = f"Proceso completado. Predicciones: {len(pred_mean)}. Modelo de respaldo (auto_arima)"
             update_progress(progress_file, 100, final_status, 
                           f"Finalizado - {len(TOP_3_MODELS)} modelos evaluados")
 
@@ -796,9 +1127,62 @@ def main():
     parser = argparse.ArgumentParser(description='Análisis SAIDI con optimización de parámetros')
     parser.add_argument('--file', type=str, help='Ruta del archivo Excel')
     parser.add_argument('--progress', type=str, help='Archivo de progreso para comunicación con frontend')
+    parser.add_argument('--cancel-stdin', action='store_true',
+                       help='Cancelar al recibir una línea (o el cierre) por la entrada estándar, '
+                            'en lugar de vigilar el archivo de cancelación. Lo usa la interfaz')
+    parser.add_argument('--workers', type=int, default=None,
+                       help=f'Procesos para evaluar combinaciones en paralelo. Default: núcleos disponibles ({obtener_workers_por_defecto()})')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='No usar la cache persistente de ajustes SARIMAX')
+    parser.add_argument('--strategy', choices=list(ESTRATEGIAS), default='exhaustive',
+                       help='Estrategia de búsqueda: exhaustive (toda la grilla), prescreen (prefiltro Hannan-Rissanen '
+                            'en NumPy y ajuste completo '
+                            'de los no dominados), stepwise (vecindario desde modelos iniciales) o bayesian '
+                            '(optimización secuencial TPE). Default: exhaustive')
+    parser.add_argument('--search-space', choices=list(ESPACIOS_BUSQUEDA), default='standard',
+                       help='Rangos de parámetros: standard (p,q,P,Q 0-5; d,D 0-1) o wide '
+                            '(p,q 0-10; d 0-2; P,Q 0-5; D 0-1). Default: standard')
+    parser.add_argument('--max-evals', type=int, default=None,
+                       help='Máximo de modelos a evaluar con stepwise/bayesian. Default: 300 stepwise, 200 bayesian')
+    parser.add_argument('--resume', action='store_true',
+                       help='Reanudar una búsqueda interrumpida desde su diario, sin repetir los modelos ya evaluados '
+                            '(mismo archivo, estrategia y espacio de búsqueda)')
+    parser.add_argument('--time-budget', type=float, default=None,
+                       help='Minutos máximos de búsqueda: se evalúan primero los modelos más simples y al agotarse '
+                            'el tiempo se finaliza con los mejores encontrados')
+    parser.add_argument('--validation', choices=['holdout', 'rolling'], default='holdout',
+                       help='Validación de cada modelo: holdout (un pronóstico desde el final del entrenamiento) o '
+                            'rolling (pronósticos de hasta 12 pasos desde cada origen del período de validación, '
+                            'con un solo ajuste). Default: holdout')
+    parser.add_argument('--search-profile', choices=list(PERFILES_AJUSTE), default=PERFIL_POR_DEFECTO,
+                       help='Perfil de ajuste de cada combinación evaluada: accurate (valores por defecto de '
+                            'statsmodels) o fast (varianza concentrada, maxiter=30, sin covarianzas). '
+                            'El modelo final siempre se ajusta con accurate. Default: accurate')
+    parser.add_argument('--prescreen-keep', type=float, default=None,
+                       help='Fracción de la grilla que el prefiltro de prescreen envía al ajuste completo '
+                            '(mínimo 30 combinaciones). Default: 0.25')
+    parser.add_argument('--ar-engine', choices=['sarimax', 'levinson'], default='sarimax',
+                       help='Motor de los candidatos AR puros (q=0, Q=0) con exhaustive o prescreen: '
+                            'sarimax (un ajuste por máxima verosimilitud cada uno) o levinson (todos los órdenes '
+                            'de cada diferenciación en una recursión de Levinson-Durbin/Burg, con pronósticos '
+                            'vectorizados). El modelo final siempre se ajusta con SARIMAX. Default: sarimax')
+    parser.add_argument('--warm-start', action='store_true',
+                       help='Iniciar cada ajuste desde el modelo anidado más cercano ya ajustado (menos iteraciones; '
+                            'puede converger a óptimos distintos a los del arranque por defecto)')
+    parser.add_argument('--data', type=str, default=None,
+                       help='Serie ya preparada por la interfaz (archivo binario mapeado en memoria); '
+                            'evita releer el Excel. Si no se puede abrir se lee --file')
     
     args = parser.parse_args()
     
+    if args.time_budget is not None and args.time_budget <= 0:
+        parser.error("--time-budget debe ser mayor que 0")
+    if args.prescreen_keep is not None and not 0 < args.prescreen_keep <= 1:
+        parser.error("--prescreen-keep debe estar entre 0 y 1")
+    
+    if args.no_cache:
+        desactivar_cache()
+    
     try:
         # Verificar argumentos
         if args.file:
@@ -817,9 +1201,17 @@ def main():
             
             # Limpiar archivos de cancelación previos al inicio
             cleanup_cancellation_files(args.progress)
+            vigilar_cancelacion(args.progress, usar_entrada=args.cancel_stdin)
             
             try:
-                analizar_saidi(file_path, args.progress)
+                analizar_saidi(file_path, args.progress, workers=args.workers,
+                               arranque_caliente=args.warm_start, estrategia=args.strategy,
+                               espacio=args.search_space, max_evaluaciones=args.max_evals,
+                               reanudar=args.resume,
+                               presupuesto_tiempo=args.time_budget * 60 if args.time_budget else None,
+                               validacion=args.validation, perfil_busqueda=args.search_profile,
+                               fraccion_prefiltro=args.prescreen_keep, motor_ar=args.ar_engine,
+                               datos=cargar_datos_compartidos(args.data) if args.data else None)
                 if not PROCESO_CANCELADO:
                     print("Análisis completado exitosamente.")
                     # Limpiar archivos de cancelación al completar exitosamente
@@ -849,4 +1241,6 @@ def main():
         sys.exit(130)
 
 if __name__ == "__main__":
+    # Necesario para el pool de procesos en el ejecutable PyInstaller (Windows)
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,319 @@
+# backend/agregacion_eventos.py - SAIDI mensual a partir de registros de interrupciones
+"""
+Convierte un registro de eventos de interrupción (inicio, fin, usuarios afectados, circuito)
+en la serie mensual SAIDI que usan la interfaz y los scripts del backend.
+
+El archivo se lee por bloques (CSV con pandas, Parquet con pyarrow), de modo que puede ser
+más grande que la memoria: de cada bloque solo se conservan los usuario-minuto acumulados por
+mes y circuito. Un evento que cruza el cambio de mes se reparte entre los meses según los
+minutos que dura en cada uno.
+
+    SAIDI del mes = usuario-minutos interrumpidos en el mes / usuarios atendidos
+
+La salida es un libro con la hoja Hoja1 (Fecha, SAIDI del sistema) y la hoja Circuitos (Fecha
+y una columna por circuito: su SAIDI si se indican los usuarios de cada circuito, o su aporte
+al SAIDI del sistema si no), que se puede abrir en la interfaz o procesar con lote_circuitos.py.
+
+Uso:
+    python agregacion_eventos.py --input eventos.csv --customers 125000 [--output saidi_mensual.xlsx]
+                                 [--circuit-customers usuarios_circuito.csv] [--min-minutes 3]
+"""
+import warnings
+warnings.filterwarnings('ignore')
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Nombres de columna por defecto del registro de eventos
+COLUMNAS_POR_DEFECTO = {'inicio': 'inicio', 'fin': 'fin', 'usuarios': 'usuarios', 'circuito': 'circuito'}
+
+# Filas leídas por bloque
+TAMANO_BLOQUE = 500_000
+
+# Duración mínima (minutos) de una interrupción que cuenta para SAIDI; las momentáneas se excluyen
+MINUTOS_MINIMOS_POR_DEFECTO = 3.0
+
+# Eventos más largos se consideran errores de registro (evita repartir años de un fin mal digitado)
+MAX_DURACION_DIAS = 90
+
+# Circuito asignado a los eventos sin circuito
+CIRCUITO_SIN_DATO = 'SIN CIRCUITO'
+
+UN_MINUTO = np.timedelta64(60, 's')
+
+
+def detectar_separador(ruta):
+    """Coma o punto y coma según la primera línea (Excel en español exporta con punto y coma)"""
+    with open(ruta, 'r', encoding='utf-8', errors='replace') as f:
+        encabezado = f.readline()
+    return ';' if encabezado.count(';') > encabezado.count(',') else ','
+
+
+def leer_bloques(ruta, columnas, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Bloques del registro de eventos con solo las columnas necesarias
+
+    Raises:
+        ValueError: si el formato no es CSV/Parquet o falta pyarrow para Parquet
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension in ('.csv', '.txt'):
+        yield from pd.read_csv(ruta, usecols=columnas, chunksize=tamano_bloque, sep=detectar_separador(ruta))
+    elif extension in ('.parquet', '.pq'):
+        if not PYARROW_AVAILABLE:
+            raise ValueError("Para leer Parquet se necesita pyarrow (pip install pyarrow) o convertir el registro a CSV")
+        archivo = pq.ParquetFile(ruta)
+        for lote in archivo.iter_batches(batch_size=tamano_bloque, columns=columnas):
+            yield lote.to_pandas()
+    else:
+        raise ValueError(f"Formato de registro no admitido: '{extension}'. Use .csv o .parquet")
+
+
+def repartir_por_mes(inicio, fin, usuarios, circuitos):
+    """
+    Usuario-minutos de cada evento en cada mes que abarca (vectorizado)
+
+    Args:
+        inicio, fin: arrays datetime64[ns]
+        usuarios: array float de usuarios afectados
+        circuitos: array de circuitos
+
+    Returns:
+        DataFrame con columnas mes (datetime64[ns], primer día), circuito y usuario_minutos
+    """
+    mes_inicio = inicio.astype('datetime64[M]')
+    # Un evento que termina justo a las 00:00 del día 1 no aporta al mes siguiente
+    mes_fin = (fin - np.timedelta64(1, 'ns')).astype('datetime64[M]')
+    meses_por_evento = (mes_fin - mes_inicio).astype(np.int64) + 1
+
+    # Una fila por (evento, mes): la mayoría de los eventos ocupan un solo mes
+    evento = np.repeat(np.arange(len(inicio)), meses_por_evento)
+    desplazamiento = np.arange(len(evento)) - np.repeat(np.cumsum(meses_por_evento) - meses_por_evento,
+                                                        meses_por_evento)
+    mes = mes_inicio[evento] + desplazamiento.astype('timedelta64[M]')
+
+    desde = np.maximum(inicio[evento], mes.astype('datetime64[ns]'))
+    hasta = np.minimum(fin[evento], (mes + np.timedelta64(1, 'M')).astype('datetime64[ns]'))
+    minutos = (hasta - desde) / UN_MINUTO
+
+    return pd.DataFrame({
+        'mes': mes.astype('datetime64[ns]'),
+        'circuito': circuitos[evento],
+        'usuario_minutos': minutos * usuarios[evento]
+    })
+
+
+def agregar_bloque(bloque, columnas, minutos_minimos, formato_fecha=None):
+    """
+    Usuario-minutos por (mes, circuito) de un bloque y conteo de eventos descartados
+
+    Returns:
+        Tupla (Series con índice (mes, circuito), dict de descartes por motivo)
+    """
+    inicio = pd.to_datetime(bloque[columnas['inicio']], format=formato_fecha, errors='coerce').to_numpy('datetime64[ns]')
+    fin = pd.to_datetime(bloque[columnas['fin']], format=formato_fecha, errors='coerce').to_numpy('datetime64[ns]')
+    usuarios = pd.to_numeric(bloque[columnas['usuarios']], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    if columnas['circuito'] in bloque.columns:
+        circuitos = bloque[columnas['circuito']].astype(str).to_numpy(dtype=object)
+        circuitos[bloque[columnas['circuito']].isna().to_numpy()] = CIRCUITO_SIN_DATO
+    else:
+        circuitos = np.full(len(bloque), CIRCUITO_SIN_DATO, dtype=object)
+
+    duracion = (fin - inicio) / UN_MINUTO
+    incompletos = np.isnat(inicio) | np.isnat(fin) | np.isnan(usuarios) | (usuarios < 0)
+    invertidos = ~incompletos & (duracion < 0)
+    excesivos = ~incompletos & (duracion > MAX_DURACION_DIAS * 24 * 60)
+    momentaneos = ~incompletos & ~invertidos & (duracion < minutos_minimos)
+    validos = ~(incompletos | invertidos | excesivos | momentaneos) & (duracion > 0)
+
+    descartes = {'incompletos': int(incompletos.sum()), 'fin_antes_de_inicio': int(invertidos.sum()),
+                 f'mas_de_{MAX_DURACION_DIAS}_dias': int(excesivos.sum()), 'momentaneos': int(momentaneos.sum())}
+
+    repartido = repartir_por_mes(inicio[validos], fin[validos], usuarios[validos], circuitos[validos])
+    return repartido.groupby(['mes', 'circuito'])['usuario_minutos'].sum(), descartes
+
+
+def acumular_eventos(ruta, columnas=None, minutos_minimos=MINUTOS_MINIMOS_POR_DEFECTO, formato_fecha=None,
+                     tamano_bloque=TAMANO_BLOQUE):
+    """
+    Recorrer el registro por bloques acumulando usuario-minutos por mes y circuito
+
+    Returns:
+        Tupla (Series de usuario-minutos con índice (mes, circuito), resumen de la lectura)
+    """
+    columnas = {**COLUMNAS_POR_DEFECTO, **(columnas or {})}
+    leidas = [columnas['inicio'], columnas['fin'], columnas['usuarios']]
+    con_circuito = bool(columnas['circuito'])
+    if con_circuito:
+        leidas.append(columnas['circuito'])
+
+    acumulado = pd.Series(dtype=float)
+    descartes = {}
+    eventos = 0
+    inicio_lectura = time.perf_counter()
+    for numero, bloque in enumerate(leer_bloques(ruta, leidas, tamano_bloque), start=1):
+        parcial, descartes_bloque = agregar_bloque(bloque, columnas, minutos_minimos, formato_fecha)
+        acumulado = acumulado.add(parcial, fill_value=0) if len(acumulado) else parcial
+        for motivo, cantidad in descartes_bloque.items():
+            descartes[motivo] = descartes.get(motivo, 0) + cantidad
+        eventos += len(bloque)
+
+        segundos = time.perf_counter() - inicio_lectura
+        print(f"Bloque {numero}: {eventos:,} eventos leídos ({eventos / max(segundos, 1e-9):,.0f} eventos/s)")
+
+    resumen = {'eventos': eventos, 'descartados': descartes,
+               'segundos': round(time.perf_counter() - inicio_lectura, 2)}
+    return acumulado, resumen
+
+
+def leer_usuarios_circuito(ruta, columna_circuito='circuito', columna_usuarios='usuarios'):
+    """Usuarios atendidos por circuito desde un CSV (circuito, usuarios)"""
+    df = pd.read_csv(ruta, sep=detectar_separador(ruta))
+    for columna in (columna_circuito, columna_usuarios):
+        if columna not in df.columns:
+            raise ValueError(f"El archivo de usuarios por circuito no tiene la columna '{columna}'")
+    usuarios = pd.to_numeric(df[columna_usuarios], errors='coerce')
+    return pd.Series(usuarios.to_numpy(), index=df[columna_circuito].astype(str)).dropna()
+
+
+def calcular_saidi_mensual(acumulado, usuarios_atendidos, usuarios_circuito=None, meses_a_pronosticar=0):
+    """
+    Series mensuales SAIDI del sistema y por circuito
+
+    Args:
+        acumulado: usuario-minutos con índice (mes, circuito), de acumular_eventos
+        usuarios_atendidos: usuarios atendidos por el sistema
+        usuarios_circuito: Series {circuito: usuarios}; sin ella cada circuito aporta su parte del SAIDI del sistema
+        meses_a_pronosticar: meses vacíos (NaN) agregados al final para que el modelo los pronostique
+
+    Returns:
+        Tupla (hoja1, circuitos): DataFrames con la columna Fecha primero; los meses sin eventos valen 0
+    """
+    por_mes_circuito = acumulado.unstack('circuito', fill_value=0.0).sort_index()
+    meses = pd.date_range(por_mes_circuito.index.min(), por_mes_circuito.index.max(), freq='MS')
+    por_mes_circuito = por_mes_circuito.reindex(meses, fill_value=0.0)
+
+    saidi = por_mes_circuito.sum(axis=1) / usuarios_atendidos
+    if usuarios_circuito is not None:
+        faltantes = [c for c in por_mes_circuito.columns if c not in usuarios_circuito.index]
+        if faltantes:
+            print(f"Warning: {len(faltantes)} circuitos sin usuarios en el archivo de usuarios; "
+                  f"se reporta su aporte al SAIDI del sistema: {', '.join(map(str, faltantes[:5]))}"
+                  f"{'...' if len(faltantes) > 5 else ''}")
+        divisor = pd.Series(usuarios_atendidos, index=por_mes_circuito.columns, dtype=float)
+        divisor.update(usuarios_circuito[usuarios_circuito > 0])
+        circuitos = por_mes_circuito / divisor
+    else:
+        circuitos = por_mes_circuito / usuarios_atendidos
+
+    if meses_a_pronosticar:
+        futuros = pd.date_range(meses[-1] + pd.DateOffset(months=1), periods=meses_a_pronosticar, freq='MS')
+        saidi = saidi.reindex(saidi.index.append(futuros))
+        circuitos = circuitos.reindex(circuitos.index.append(futuros))
+
+    hoja1 = pd.DataFrame({'Fecha': saidi.index, 'SAIDI': saidi.to_numpy()})
+    circuitos = circuitos.rename_axis('Fecha').reset_index()
+    circuitos.columns = [str(columna) for columna in circuitos.columns]
+    return hoja1, circuitos
+
+
+def escribir_saidi(hoja1, circuitos, ruta_salida):
+    """Libro con Hoja1 y Circuitos; con extensión .csv, la serie del sistema y <nombre>_circuitos.csv"""
+    os.makedirs(os.path.dirname(os.path.abspath(ruta_salida)), exist_ok=True)
+    if ruta_salida.lower().endswith('.csv'):
+        hoja1.to_csv(ruta_salida, index=False)
+        circuitos.to_csv(os.path.splitext(ruta_salida)[0] + '_circuitos.csv', index=False)
+    else:
+        with pd.ExcelWriter(ruta_salida) as writer:
+            hoja1.to_excel(writer, sheet_name='Hoja1', index=False)
+            circuitos.to_excel(writer, sheet_name='Circuitos', index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SAIDI mensual a partir de un registro de interrupciones')
+    parser.add_argument('--input', required=True, help='Registro de eventos .csv o .parquet (puede superar la memoria)')
+    parser.add_argument('--customers', type=float, required=True,
+                       help='Usuarios atendidos por el sistema (divisor del SAIDI)')
+    parser.add_argument('--output', default=None,
+                       help='Libro .xlsx (hojas Hoja1 y Circuitos) o .csv. Default: saidi_mensual.xlsx junto a la entrada')
+    parser.add_argument('--circuit-customers', default=None,
+                       help='CSV con columnas circuito y usuarios para calcular el SAIDI de cada circuito. '
+                            'Sin él, la hoja Circuitos muestra el aporte de cada circuito al SAIDI del sistema')
+    parser.add_argument('--start-col', default=COLUMNAS_POR_DEFECTO['inicio'],
+                       help=f"Columna de inicio del evento. Default: {COLUMNAS_POR_DEFECTO['inicio']}")
+    parser.add_argument('--end-col', default=COLUMNAS_POR_DEFECTO['fin'],
+                       help=f"Columna de fin del evento. Default: {COLUMNAS_POR_DEFECTO['fin']}")
+    parser.add_argument('--customers-col', default=COLUMNAS_POR_DEFECTO['usuarios'],
+                       help=f"Columna de usuarios afectados. Default: {COLUMNAS_POR_DEFECTO['usuarios']}")
+    parser.add_argument('--circuit-col', default=COLUMNAS_POR_DEFECTO['circuito'],
+                       help=f"Columna de circuito (vacío para no separar por circuito). "
+                            f"Default: {COLUMNAS_POR_DEFECTO['circuito']}")
+    parser.add_argument('--date-format', default=None,
+                       help='Formato de fecha de inicio y fin (ej. %%d/%%m/%%Y %%H:%%M); acelera la lectura. '
+                            'Default: detección automática')
+    parser.add_argument('--min-minutes', type=float, default=MINUTOS_MINIMOS_POR_DEFECTO,
+                       help=f'Duración mínima de una interrupción para contar en SAIDI (las momentáneas se '
+                            f'excluyen). Default: {MINUTOS_MINIMOS_POR_DEFECTO:g}')
+    parser.add_argument('--forecast-months', type=int, default=0,
+                       help='Meses vacíos agregados al final de la serie para que Modelo.py los pronostique. Default: 0')
+    parser.add_argument('--chunk-size', type=int, default=TAMANO_BLOQUE,
+                       help=f'Eventos por bloque de lectura (limita la memoria). Default: {TAMANO_BLOQUE}')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"ERROR: El archivo {args.input} no existe.")
+        sys.exit(1)
+    if args.customers <= 0:
+        parser.error("--customers debe ser mayor que 0")
+
+    usuarios_circuito = None
+    if args.circuit_customers:
+        try:
+            usuarios_circuito = leer_usuarios_circuito(args.circuit_customers)
+        except (OSError, ValueError) as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
+
+    columnas = {'inicio': args.start_col, 'fin': args.end_col, 'usuarios': args.customers_col,
+                'circuito': args.circuit_col}
+    print(f"Agregando eventos de {args.input} en bloques de {args.chunk_size:,}")
+    print("=" * 80)
+    try:
+        acumulado, resumen = acumular_eventos(args.input, columnas, args.min_minutes, args.date_format,
+                                              args.chunk_size)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    if acumulado.empty:
+        print("ERROR: Ningún evento válido en el registro.")
+        sys.exit(1)
+
+    hoja1, circuitos = calcular_saidi_mensual(acumulado, args.customers, usuarios_circuito, args.forecast_months)
+    ruta_salida = args.output or os.path.join(os.path.dirname(os.path.abspath(args.input)), 'saidi_mensual.xlsx')
+    escribir_saidi(hoja1, circuitos, ruta_salida)
+
+    motivos = ', '.join(f"{motivo} {cantidad:,}" for motivo, cantidad in resumen['descartados'].items() if cantidad)
+    observados = int(hoja1['SAIDI'].notna().sum())
+    print("=" * 80)
+    print(f"Eventos leídos: {resumen['eventos']:,} | descartados {sum(resumen['descartados'].values()):,}"
+          f"{f' ({motivos})' if motivos else ''}")
+    print(f"Meses: {observados} ({hoja1['Fecha'].iloc[0]:%Y-%m} a {hoja1['Fecha'].iloc[observados - 1]:%Y-%m}) | "
+          f"circuitos: {circuitos.shape[1] - 1} | tiempo {resumen['segundos']:.1f} s")
+    if observados < 12:
+        print("Warning: La interfaz y los modelos necesitan al menos 12 meses históricos.")
+    print(f"SAIDI mensual guardado en: {os.path.abspath(ruta_salida)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# backend/analisis_combinado.py - Predicción y validación en una sola ejecución
+"""
+Genera la gráfica de predicción (Modelo.py) y la de validación (visual.py) en un mismo proceso:
+el Excel se lee una vez, el modelo de entrenamiento y el de todo el histórico se ajustan una
+vez cada uno (visual.py reutiliza el ajuste de entrenamiento de Modelo.py) y las dos figuras
+se muestran juntas. Reporta la latencia desde el lanzamiento hasta la primera gráfica: la de
+predicción se muestra sin bloquear antes de construir la de validación.
+"""
+import time
+
+# Antes de las importaciones pesadas (pandas, statsmodels, matplotlib)
+INICIO_PROCESO = time.time()
+
+import warnings
+warnings.filterwarnings('ignore')
+import argparse
+import os
+import sys
+import matplotlib.pyplot as plt
+
+import Modelo
+import visual
+from datos_saidi import cargar_excel_saidi, cargar_datos_compartidos
+
+try:
+    from cache_ajustes import desactivar_cache
+    CACHE_AJUSTES_AVAILABLE = True
+except ImportError:
+    CACHE_AJUSTES_AVAILABLE = False
+
+FIN_IMPORTACIONES = time.time()
+
+# Solo la primera ejecución del proceso paga las importaciones de este módulo
+_IMPORTACIONES_PENDIENTES = True
+
+
+def _tiempo_importaciones(inicio_lanzamiento):
+    """
+    Segundos de importación del módulo si ocurrió dentro de esta ejecución, o None si ya estaba
+    importado (trabajador persistente: lo importa al arrancar, antes de lanzarse el trabajo)
+    """
+    global _IMPORTACIONES_PENDIENTES
+    pendientes, _IMPORTACIONES_PENDIENTES = _IMPORTACIONES_PENDIENTES, False
+    if not pendientes or (inicio_lanzamiento is not None and inicio_lanzamiento > INICIO_PROCESO):
+        return None
+    return FIN_IMPORTACIONES - INICIO_PROCESO
+
+
+def analisis_combinado(file_path, order=(4, 0, 0), seasonal_order=(1, 0, 0, 8), validacion='holdout',
+                       inicio_lanzamiento=None, mostrar=True, datos=None):
+    """
+    Predicción y validación del mismo modelo con una sola lectura de datos
+
+    Args:
+        inicio_lanzamiento: time.time() del momento en que se lanzó el proceso o el trabajo (por
+                            defecto, el inicio de este módulo si se importó en esta ejecución,
+                            que no incluye el arranque del intérprete, o el de esta llamada)
+        mostrar: False deja las figuras abiertas sin llamar a plt.show; la latencia medida es
+                 entonces la de la primera figura construida
+        datos: Tupla (df, col_saidi) ya preparada (serie compartida por la interfaz); si es None
+               se lee el Excel
+
+    Returns:
+        Dict con los tiempos de cada etapa y la latencia hasta la primera gráfica (segundos);
+        'importaciones' es None si el módulo ya estaba importado
+    """
+    inicio_llamada = time.time()
+    tiempos = {'importaciones': _tiempo_importaciones(inicio_lanzamiento)}
+    if inicio_lanzamiento is None:
+        inicio_lanzamiento = INICIO_PROCESO if tiempos['importaciones'] is not None else inicio_llamada
+
+    inicio = time.time()
+    if datos is None:
+        try:
+            datos = cargar_excel_saidi(file_path)
+        except ValueError as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
+    tiempos['carga'] = time.time() - inicio
+
+    inicio = time.time()
+    Modelo.analizar_saidi(file_path, order, seasonal_order, validacion, datos=datos, mostrar=False)
+    tiempos['prediccion'] = time.time() - inicio
+    if mostrar:
+        # Mostrar la predicción sin bloquear mientras se construye la validación
+        plt.show(block=False)
+        plt.pause(0.001)
+    tiempos['primera_grafica'] = time.time() - inicio_lanzamiento
+
+    inicio = time.time()
+    visual.generar_grafica_validacion(file_path, order, seasonal_order, datos=datos, mostrar=False)
+    tiempos['validacion'] = time.time() - inicio
+    tiempos['ambas_graficas'] = time.time() - inicio_lanzamiento
+
+    importaciones = (f"{tiempos['importaciones']:.2f} s" if tiempos['importaciones'] is not None
+                     else "- (módulos ya cargados)")
+    print(f"\nTiempos: importaciones {importaciones} | carga {tiempos['carga']:.2f} s | "
+          f"predicción {tiempos['prediccion']:.2f} s | validación {tiempos['validacion']:.2f} s")
+    etapa = "mostrada" if mostrar else "construida"
+    print(f"Latencia hasta la primera gráfica {etapa}: {tiempos['primera_grafica']:.2f} s "
+          f"(ambas gráficas: {tiempos['ambas_graficas']:.2f} s)")
+
+    if mostrar:
+        plt.show()
+    return tiempos
+
+
+def main():
+    """Función principal con soporte para argumentos de línea de comandos y parámetros dinámicos"""
+    parser = argparse.ArgumentParser(description='Predicción y validación SAIDI en una sola ejecución')
+    parser.add_argument('--file', required=True, help='Ruta del archivo Excel')
+    parser.add_argument('--order', nargs=3, type=int, default=[4, 0, 0],
+                       help='Parámetros order (p d q) para SARIMAX. Default: 4 0 0')
+    parser.add_argument('--seasonal-order', nargs=4, type=int, default=[1, 0, 0, 8],
+                       help='Parámetros seasonal_order (P D Q s) para SARIMAX. Default: 1 0 0 8')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='No usar la cache persistente de ajustes SARIMAX')
+    parser.add_argument('--validation', choices=['holdout', 'rolling'], default='holdout',
+                       help='Validación de las métricas de la predicción: holdout o rolling. Default: holdout')
+    parser.add_argument('--launch-time', type=float, default=None,
+                       help='time.time() del proceso que lanzó este script, para medir la latencia '
+                            'hasta la primera gráfica incluyendo el arranque de Python')
+    parser.add_argument('--data', default=None,
+                       help='Serie ya preparada por la interfaz (archivo binario mapeado en memoria); '
+                            'evita releer el Excel. Si no se puede abrir se lee --file')
+
+    args = parser.parse_args()
+
+    if args.no_cache and CACHE_AJUSTES_AVAILABLE:
+        desactivar_cache()
+
+    if not os.path.exists(args.file):
+        print(f"ERROR: El archivo {args.file} no existe.")
+        sys.exit(1)
+
+    order = tuple(args.order)
+    seasonal_order = tuple(args.seasonal_order)
+
+    print("PREDICCIÓN Y VALIDACIÓN SAIDI EN UNA SOLA EJECUCIÓN")
+    print("="*50)
+    print(f"Parámetros: SARIMAX{order}x{seasonal_order}")
+    print("="*50)
+
+    datos = cargar_datos_compartidos(args.data) if args.data else None
+    analisis_combinado(args.file, order, seasonal_order, args.validation, inicio_lanzamiento=args.launch_time,
+                       datos=datos)
+    print("Proceso completado exitosamente.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# backend/benchmark_perfiles.py - Comparación de perfiles de ajuste SARIMAX
+"""
+Benchmark de los perfiles de ajuste (perfiles_ajuste.py) sobre un libro Excel SAIDI:
+tiempo por modelo y precisión de cada perfil sobre una muestra de la grilla de búsqueda,
+y concordancia del ranking del perfil rápido con el del preciso
+
+Uso:
+    python benchmark_perfiles.py --file datos.xlsx [--candidates 60] [--seed 0] [--validation holdout]
+"""
+import warnings
+warnings.filterwarnings('ignore')
+
+import argparse
+import random
+import sys
+import os
+import time
+import numpy as np
+import pandas as pd
+
+import cache_ajustes
+from estrategias_busqueda import ESPACIOS_BUSQUEDA
+from perfiles_ajuste import PERFILES_AJUSTE
+from Parametro import evaluar_modelo_completo
+from datos_saidi import leer_hoja_excel
+
+
+def cargar_historico(file_path):
+    """Serie SAIDI histórica (sin meses faltantes) con el mismo formato que lee Parametro.py"""
+    df = leer_hoja_excel(file_path, "Hoja1")
+    if "Fecha" in df.columns:
+        df["Fecha"] = pd.to_datetime(df["Fecha"])
+        df.set_index("Fecha", inplace=True)
+    else:
+        df.iloc[:, 0] = pd.to_datetime(df.iloc[:, 0])
+        df.set_index(df.columns[0], inplace=True)
+
+    col_saidi = "SAIDI" if "SAIDI" in df.columns else "SAIDI Histórico"
+    if col_saidi not in df.columns:
+        raise ValueError("No se encontró la columna SAIDI ni SAIDI Histórico.")
+    return df[df[col_saidi].notna()][col_saidi]
+
+
+def rangos(valores):
+    """Posición de cada valor (0 = mayor precisión)"""
+    orden = np.argsort(-np.asarray(valores), kind='stable')
+    posiciones = np.empty(len(valores))
+    posiciones[orden] = np.arange(len(valores))
+    return posiciones
+
+
+def evaluar_perfil(serie, candidatos, perfil, validacion):
+    precisiones = []
+    fallidos = 0
+    inicio = time.perf_counter()
+    for order, seasonal_order in candidatos:
+        metrics = evaluar_modelo_completo(serie, order, seasonal_order, validacion=validacion, perfil=perfil)
+        if not np.isfinite(metrics['composite_score']):
+            fallidos += 1
+        precisiones.append(metrics['precision_final'])
+    return np.array(precisiones), time.perf_counter() - inicio, fallidos
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de perfiles de ajuste SARIMAX')
+    parser.add_argument('--file', required=True, help='Ruta del archivo Excel')
+    parser.add_argument('--candidates', type=int, default=60,
+                       help='Combinaciones de la grilla estándar a evaluar. Default: 60')
+    parser.add_argument('--seed', type=int, default=0, help='Semilla de la muestra de combinaciones')
+    parser.add_argument('--validation', choices=['holdout', 'rolling'], default='holdout',
+                       help='Validación de las métricas. Default: holdout')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        print(f"Error: El archivo {args.file} no existe.")
+        sys.exit(1)
+
+    # Medir ajustes reales, sin reutilizar parámetros guardados
+    cache_ajustes.desactivar_cache()
+
+    serie = cargar_historico(args.file)
+    candidatos = ESPACIOS_BUSQUEDA['standard'].candidatos()
+    random.Random(args.seed).shuffle(candidatos)
+    candidatos = candidatos[:args.candidates]
+
+    print(f"Serie: {len(serie)} observaciones | {len(candidatos)} combinaciones | validación {args.validation}")
+    print("="*80)
+
+    resultados = {}
+    for perfil, definicion in PERFILES_AJUSTE.items():
+        precisiones, segundos, fallidos = evaluar_perfil(serie, candidatos, perfil, args.validation)
+        resultados[perfil] = precisiones
+        print(f"{perfil:>9}: {segundos:7.1f} s | {segundos / len(candidatos) * 1000:7.1f} ms/modelo | "
+              f"precisión media {np.mean(precisiones):5.1f}% | fallidos {fallidos} | {definicion['descripcion']}")
+
+    referencia = resultados['accurate']
+    mejores_referencia = set(np.argsort(-referencia, kind='stable')[:5])
+    print("-"*80)
+    for perfil, precisiones in resultados.items():
+        if perfil == 'accurate':
+            continue
+        diferencia = np.abs(precisiones - referencia)
+        correlacion = np.corrcoef(rangos(precisiones), rangos(referencia))[0, 1]
+        coincidencias = len(mejores_referencia & set(np.argsort(-precisiones, kind='stable')[:5]))
+        mejor = candidatos[int(np.argmax(precisiones))]
+        print(f"{perfil} vs accurate: |Δ precisión| media {np.mean(diferencia):.2f} pts (máx {np.max(diferencia):.2f}) | "
+              f"correlación de rangos {correlacion:.3f} | top 5 compartidos {coincidencias}/5")
+        print(f"  Mejor modelo: {mejor[0]}x{mejor[1]} "
+              f"({'igual' if int(np.argmax(precisiones)) == int(np.argmax(referencia)) else 'distinto'} al de accurate)")
+
+
+if __name__ == "__main__":
+    main()
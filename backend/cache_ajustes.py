@@ -0,0 +1,501 @@
+# backend/cache_ajustes.py - Cache persistente de ajustes SARIMAX
+"""
+Cache en disco (SQLite) de ajustes SARIMAX compartida por Parametro.py, Modelo.py y visual.py
+Cada registro se identifica por la huella de los datos ajustados y por (order, seasonal_order),
+y guarda los parámetros estimados, AIC/BIC, las métricas de validación y los metadatos del
+artefacto (herramienta que lo ajustó, versión de statsmodels, observaciones y fecha)
+"""
+import os
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import tempfile
+from collections import OrderedDict
+import numpy as np
+import statsmodels
+from perfiles_ajuste import PERFIL_POR_DEFECTO, crear_modelo_sarimax, ajustar_con_perfil
+
+try:
+    from path_utils import path_manager
+    PATH_UTILS_AVAILABLE = True
+except ImportError:
+    PATH_UTILS_AVAILABLE = False
+
+NOMBRE_ARCHIVO_CACHE = "cache_ajustes_sarimax.sqlite"
+
+# Tamaño máximo de la cache; al superarlo se eliminan los registros menos usados
+TAMANO_MAXIMO_POR_DEFECTO = 64 * 1024 * 1024
+
+# Variable de entorno para desactivar la cache (la heredan también los workers del pool)
+VARIABLE_DESACTIVAR = "SAIDI_CACHE_DESACTIVADA"
+
+# Cada cuántas escrituras se revisa el tamaño de la cache
+INTERVALO_REVISION_TAMANO = 200
+
+# Ajustes recientes en memoria de este proceso (fuente de arranques en caliente)
+MAX_AJUSTES_RECIENTES = 512
+_AJUSTES_RECIENTES = OrderedDict()
+
+# Resultados completos de los últimos ajustes precisos de este proceso: un mismo proceso que
+# pronostica y valida (analisis_combinado.py) no repite ni el filtro de Kalman
+MAX_RESULTADOS_PROCESO = 4
+_RESULTADOS_PROCESO = OrderedDict()
+
+# Información del último ajuste ejecutado en este proceso (tipo de arranque, iteraciones, tiempo)
+ULTIMO_AJUSTE = {}
+
+
+def obtener_ruta_cache():
+    """Ruta del archivo de cache (directorio de configuración persistente si existe)"""
+    if PATH_UTILS_AVAILABLE:
+        try:
+            return path_manager.get_config_file(NOMBRE_ARCHIVO_CACHE)
+        except OSError as e:
+            print(f"Warning: Directorio de configuración no disponible para la cache: {e}")
+
+    cache_dir = os.path.join(tempfile.gettempdir(), "SAIDI_Analysis_Pro")
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, NOMBRE_ARCHIVO_CACHE)
+
+
+def huella_serie(serie):
+    """Huella de una serie: valores y fechas (no depende del archivo de origen)"""
+    valores = np.ascontiguousarray(np.asarray(serie, dtype=np.float64))
+    h = hashlib.blake2b(valores.tobytes(), digest_size=16)
+
+    indice = getattr(serie, 'index', None)
+    if indice is not None:
+        try:
+            h.update(np.asarray(indice.asi8, dtype=np.int64).tobytes())
+        except (AttributeError, TypeError):
+            h.update(repr(list(indice)).encode('utf-8'))
+
+    h.update(str(len(valores)).encode('utf-8'))
+    return h.hexdigest()
+
+
+def huella_de_validacion(validacion, modo='holdout'):
+    """Huella del período de validación y del modo con que se calcularon las métricas"""
+    huella = huella_serie(validacion)
+    return huella if modo == 'holdout' else f"{huella}:{modo}"
+
+
+def origen_proceso():
+    """Nombre del script que escribe los artefactos de este proceso (Parametro.py, Modelo.py, ...)"""
+    return os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else "python"
+
+
+def _clave_orden(order, seasonal_order):
+    return f"{tuple(int(v) for v in order)}x{tuple(int(v) for v in seasonal_order)}"
+
+
+class CacheAjustes:
+    """Cache SQLite de ajustes SARIMAX con expulsión por tamaño (menos usados primero)"""
+
+    def __init__(self, ruta=None, tamano_maximo=TAMANO_MAXIMO_POR_DEFECTO):
+        self.ruta = ruta or obtener_ruta_cache()
+        self.tamano_maximo = tamano_maximo
+        self.aciertos = 0
+        self.fallos = 0
+        self._escrituras = 0
+        self._pid = None
+        self._conexion = None
+
+    @property
+    def conexion(self):
+        # Un proceso hijo (fork) no debe reutilizar la conexión del padre
+        if self._conexion is None or self._pid != os.getpid():
+            self._conexion = sqlite3.connect(self.ruta, timeout=30)
+            self._pid = os.getpid()
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            self._conexion.execute("PRAGMA synchronous=NORMAL")
+            self._conexion.execute("""
+                CREATE TABLE IF NOT EXISTS ajustes (
+                    huella_datos TEXT NOT NULL,
+                    orden TEXT NOT NULL,
+                    params BLOB,
+                    aic REAL,
+                    bic REAL,
+                    huella_validacion TEXT,
+                    metricas TEXT,
+                    tamano INTEGER NOT NULL DEFAULT 0,
+                    ultimo_acceso REAL NOT NULL,
+                    PRIMARY KEY (huella_datos, orden)
+                )
+            """)
+            self._conexion.execute(
+                "CREATE INDEX IF NOT EXISTS idx_ajustes_acceso ON ajustes (ultimo_acceso)"
+            )
+            # Caches creadas antes de guardar metadatos de los artefactos
+            columnas = {fila[1] for fila in self._conexion.execute("PRAGMA table_info(ajustes)")}
+            if 'metadatos' not in columnas:
+                self._conexion.execute("ALTER TABLE ajustes ADD COLUMN metadatos TEXT")
+            self._conexion.commit()
+        return self._conexion
+
+    def obtener(self, datos, order, seasonal_order, huella=None):
+        """
+        Buscar un ajuste en la cache (huella: la de datos si ya se calculó)
+
+        Returns:
+            Dict con params (np.ndarray o None), aic, bic, huella_validacion, metricas y
+            metadatos, o None si no existe
+        """
+        huella = huella or huella_serie(datos)
+        orden = _clave_orden(order, seasonal_order)
+        try:
+            fila = self.conexion.execute(
+                "SELECT params, aic, bic, huella_validacion, metricas, metadatos FROM ajustes "
+                "WHERE huella_datos = ? AND orden = ?",
+                (huella, orden)
+            ).fetchone()
+
+            if fila is None:
+                self.fallos += 1
+                return None
+
+            self.conexion.execute(
+                "UPDATE ajustes SET ultimo_acceso = ? WHERE huella_datos = ? AND orden = ?",
+                (time.time(), huella, orden)
+            )
+            self.conexion.commit()
+        except sqlite3.Error as e:
+            print(f"Warning: Error leyendo cache de ajustes: {e}")
+            return None
+
+        self.aciertos += 1
+        params, aic, bic, huella_validacion, metricas, metadatos = fila
+        return {
+            'params': np.frombuffer(params, dtype=np.float64).copy() if params is not None else None,
+            'aic': aic,
+            'bic': bic,
+            'huella_validacion': huella_validacion,
+            'metricas': json.loads(metricas) if metricas else None,
+            'metadatos': json.loads(metadatos) if metadatos else None
+        }
+
+    def guardar(self, datos, order, seasonal_order, params=None, aic=None, bic=None,
+                validacion=None, metricas=None, modo_validacion='holdout', huella=None, huella_validacion=None):
+        """
+        Guardar (o completar) un ajuste. Los campos en None conservan el valor ya guardado,
+        de modo que un ajuste sin métricas no borra las métricas de una búsqueda anterior.
+        huella y huella_validacion evitan recalcular huellas ya conocidas
+        """
+        huella = huella or huella_serie(datos)
+        orden = _clave_orden(order, seasonal_order)
+        params_blob = np.asarray(params, dtype=np.float64).tobytes() if params is not None else None
+        metricas_json = json.dumps(metricas) if metricas is not None else None
+        # Los metadatos describen el ajuste: solo se escriben junto con los parámetros
+        metadatos_json = json.dumps({
+            'origen': origen_proceso(),
+            'statsmodels': statsmodels.__version__,
+            'nobs': len(datos),
+            'creado': time.time()
+        }) if params is not None else None
+        if huella_validacion is None and validacion is not None:
+            huella_validacion = huella_de_validacion(validacion, modo_validacion)
+        tamano = len(params_blob or b'') + len(metricas_json or '') + len(metadatos_json or '')
+
+        try:
+            self.conexion.execute("""
+                INSERT INTO ajustes (huella_datos, orden, params, aic, bic, huella_validacion,
+                                     metricas, metadatos, tamano, ultimo_acceso)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (huella_datos, orden) DO UPDATE SET
+                    params = COALESCE(excluded.params, params),
+                    aic = COALESCE(excluded.aic, aic),
+                    bic = COALESCE(excluded.bic, bic),
+                    huella_validacion = COALESCE(excluded.huella_validacion, huella_validacion),
+                    metricas = COALESCE(excluded.metricas, metricas),
+                    metadatos = COALESCE(excluded.metadatos, metadatos),
+                    tamano = MAX(excluded.tamano, tamano),
+                    ultimo_acceso = excluded.ultimo_acceso
+            """, (huella, orden, params_blob, aic, bic, huella_validacion,
+                  metricas_json, metadatos_json, tamano, time.time()))
+            self.conexion.commit()
+        except sqlite3.Error as e:
+            print(f"Warning: Error escribiendo cache de ajustes: {e}")
+            return
+
+        self._escrituras += 1
+        if self._escrituras % INTERVALO_REVISION_TAMANO == 1:
+            self.limitar_tamano()
+
+    def limitar_tamano(self):
+        """Eliminar los registros menos usados hasta quedar por debajo del 80% del máximo"""
+        try:
+            total = self.conexion.execute("SELECT COALESCE(SUM(tamano), 0) FROM ajustes").fetchone()[0]
+            if total <= self.tamano_maximo:
+                return 0
+
+            objetivo = total - int(self.tamano_maximo * 0.8)
+            liberado = 0
+            eliminar = []
+            for huella, orden, tamano in self.conexion.execute(
+                "SELECT huella_datos, orden, tamano FROM ajustes ORDER BY ultimo_acceso ASC"
+            ):
+                eliminar.append((huella, orden))
+                liberado += tamano
+                if liberado >= objetivo:
+                    break
+
+            self.conexion.executemany(
+                "DELETE FROM ajustes WHERE huella_datos = ? AND orden = ?", eliminar
+            )
+            self.conexion.commit()
+            print(f"Cache de ajustes: {len(eliminar)} registros antiguos eliminados")
+            return len(eliminar)
+        except sqlite3.Error as e:
+            print(f"Warning: Error limitando tamaño de la cache: {e}")
+            return 0
+
+    def resumen(self):
+        """Texto corto con aciertos y fallos de este proceso"""
+        total = self.aciertos + self.fallos
+        tasa = (self.aciertos / total * 100) if total else 0
+        return f"{self.aciertos} aciertos, {self.fallos} fallos ({tasa:.1f}% reutilizado)"
+
+    def cerrar(self):
+        if self._conexion is not None and self._pid == os.getpid():
+            self._conexion.close()
+        self._conexion = None
+
+
+# Instancia por proceso (se crea al primer uso)
+_CACHE_GLOBAL = None
+
+
+def cache_habilitada():
+    return os.environ.get(VARIABLE_DESACTIVAR, "") not in ("1", "true", "True")
+
+
+def desactivar_cache():
+    """Desactivar la cache en este proceso y en los procesos hijos"""
+    os.environ[VARIABLE_DESACTIVAR] = "1"
+
+
+def obtener_cache():
+    """Cache global del proceso, o None si está desactivada o no se puede abrir"""
+    global _CACHE_GLOBAL
+
+    if not cache_habilitada():
+        return None
+
+    if _CACHE_GLOBAL is None:
+        try:
+            _CACHE_GLOBAL = CacheAjustes()
+            _CACHE_GLOBAL.conexion
+        except (sqlite3.Error, OSError) as e:
+            print(f"Warning: Cache de ajustes no disponible: {e}")
+            desactivar_cache()
+            _CACHE_GLOBAL = None
+
+    return _CACHE_GLOBAL
+
+
+def metricas_guardadas(train_data, test_data, order, seasonal_order, modo='holdout'):
+    """
+    Métricas de validación ya calculadas para este modelo y esta misma división
+    (por la búsqueda de Parametro.py o por una ejecución anterior de Modelo.py / visual.py)
+
+    Returns:
+        Dict de métricas o None si no existen, corresponden a otra validación o el modelo falló
+    """
+    cache = obtener_cache()
+    if cache is None:
+        return None
+    registro = cache.obtener(train_data, order, seasonal_order)
+    if registro is None or registro['metricas'] is None \
+            or registro['huella_validacion'] != huella_de_validacion(test_data, modo):
+        return None
+    metricas = registro['metricas']
+    return metricas if np.isfinite(metricas.get('rmse', float('inf'))) else None
+
+
+def guardar_metricas(train_data, test_data, order, seasonal_order, metricas, modo='holdout'):
+    """
+    Guardar las métricas de validación calculadas por Modelo.py o visual.py junto a los parámetros
+    del ajuste de entrenamiento, con la misma estructura que las de la búsqueda (composite_score
+    y n_params) para que Parametro.py también pueda reutilizarlas
+    """
+    cache = obtener_cache()
+    if cache is None:
+        return
+    complejidad = sum(order) + sum(seasonal_order[:3])
+    metricas = {nombre: float(valor) if isinstance(valor, (float, np.floating)) else valor
+                for nombre, valor in metricas.items()}
+    metricas.update({
+        'composite_score': float(metricas['rmse'] + complejidad * 0.1),
+        'n_params': complejidad
+    })
+    cache.guardar(train_data, order, seasonal_order, metricas=metricas, validacion=test_data,
+                  modo_validacion=modo)
+
+
+def describir_artefacto(info_ajuste):
+    """Texto con el origen de un ajuste (ULTIMO_AJUSTE) para los mensajes de Modelo.py y visual.py"""
+    if info_ajuste.get('arranque') == 'proceso':
+        return "ajuste reutilizado de este mismo proceso (sin reajuste)"
+    if info_ajuste.get('arranque') != 'cache':
+        return f"ajustado en {info_ajuste.get('segundos', 0.0):.2f} s"
+    metadatos = info_ajuste.get('metadatos') or {}
+    if not metadatos:
+        return "parámetros reutilizados de la cache (sin reajuste)"
+    creado = time.strftime('%Y-%m-%d %H:%M', time.localtime(metadatos.get('creado', 0)))
+    return f"parámetros reutilizados de {metadatos.get('origen', '?')} ({creado}, sin reajuste)"
+
+
+def nombres_parametros(order, seasonal_order):
+    """Nombres de los parámetros de un SARIMAX sin tendencia ni exógenas (mismo orden que statsmodels)"""
+    p, _, q = order
+    P, _, Q, s = seasonal_order
+    return ([f"ar.L{i}" for i in range(1, p + 1)] +
+            [f"ma.L{i}" for i in range(1, q + 1)] +
+            [f"ar.S.L{s * i}" for i in range(1, P + 1)] +
+            [f"ma.S.L{s * i}" for i in range(1, Q + 1)] +
+            ["sigma2"])
+
+
+def ordenes_anidados(order, seasonal_order):
+    """Modelos vecinos con un término AR/MA menos (mismas diferencias), más cercano primero"""
+    p, d, q = order
+    P, D, Q, s = seasonal_order
+    vecinos = []
+    if q > 0:
+        vecinos.append(((p, d, q - 1), seasonal_order))
+    if p > 0:
+        vecinos.append(((p - 1, d, q), seasonal_order))
+    if Q > 0:
+        vecinos.append((order, (P, D, Q - 1, s)))
+    if P > 0:
+        vecinos.append((order, (P - 1, D, Q, s)))
+    return vecinos
+
+
+def _recordar_ajuste(huella, order, seasonal_order, params):
+    clave = (huella, _clave_orden(order, seasonal_order))
+    _AJUSTES_RECIENTES[clave] = np.asarray(params, dtype=np.float64)
+    _AJUSTES_RECIENTES.move_to_end(clave)
+    while len(_AJUSTES_RECIENTES) > MAX_AJUSTES_RECIENTES:
+        _AJUSTES_RECIENTES.popitem(last=False)
+
+
+def _recordar_resultados(clave, results):
+    _RESULTADOS_PROCESO[clave] = results
+    while len(_RESULTADOS_PROCESO) > MAX_RESULTADOS_PROCESO:
+        _RESULTADOS_PROCESO.popitem(last=False)
+    return results
+
+
+def parametros_iniciales(model, datos, order, seasonal_order, huella=None):
+    """
+    Parámetros de arranque tomados del modelo anidado más cercano ya ajustado sobre los mismos datos.
+    Los coeficientes compartidos se copian y los términos nuevos empiezan en cero, así el punto
+    de partida reproduce exactamente el ajuste del modelo anidado.
+    
+    Returns:
+        Tupla (start_params, (order, seasonal_order) del modelo origen) o (None, None)
+    """
+    huella = huella or huella_serie(datos)
+    cache = obtener_cache()
+
+    for order_vecino, seasonal_vecino in ordenes_anidados(order, seasonal_order):
+        params = _AJUSTES_RECIENTES.get((huella, _clave_orden(order_vecino, seasonal_vecino)))
+
+        if params is None and cache is not None:
+            # Con la huella de quien llama: datos puede ser un array sin fechas (cortes_grilla)
+            # y los vecinos se guardaron con la huella de la serie con fechas
+            registro = cache.obtener(datos, order_vecino, seasonal_vecino, huella)
+            if registro is not None:
+                params = registro['params']
+
+        nombres_vecino = nombres_parametros(order_vecino, seasonal_vecino)
+        if params is None or len(params) != len(nombres_vecino) or not np.all(np.isfinite(params)):
+            continue
+
+        valores = dict(zip(nombres_vecino, params))
+        start_params = np.array([valores.get(nombre, 0.0) for nombre in model.param_names])
+        return start_params, (order_vecino, seasonal_vecino)
+
+    return None, None
+
+
+def ajustar_sarimax(datos, order, seasonal_order, registro=None, arranque_caliente=False, huella=None,
+                    perfil=PERFIL_POR_DEFECTO):
+    """
+    Ajustar un SARIMAX reutilizando los parámetros de la cache si existen.
+    Con parámetros en cache solo se ejecuta el filtro de Kalman (sin optimización)
+    
+    Args:
+        registro: Registro ya leído con CacheAjustes.obtener (evita repetir la consulta)
+        arranque_caliente: Iniciar la optimización desde el modelo anidado más cercano ya
+                           ajustado; si no converge se repite con los valores por defecto
+        huella: Huella de datos ya calculada (obligatoria si datos es un array sin fechas
+                y se quiere compartir la cache con quien ajusta la serie con fechas)
+        perfil: Perfil de ajuste (perfiles_ajuste). Los ajustes que no usan el perfil por
+                defecto no se guardan: la cache solo contiene parámetros del ajuste preciso
+    """
+    global ULTIMO_AJUSTE
+    preciso = perfil == PERFIL_POR_DEFECTO
+    huella = huella or huella_serie(datos)
+
+    # Los resultados se construyeron sobre el mismo tipo de datos (con o sin fechas)
+    clave_proceso = (huella, _clave_orden(order, seasonal_order), hasattr(datos, 'index'))
+    if preciso and clave_proceso in _RESULTADOS_PROCESO:
+        _RESULTADOS_PROCESO.move_to_end(clave_proceso)
+        ULTIMO_AJUSTE = {'arranque': 'proceso', 'iteraciones': 0, 'segundos': 0.0}
+        return _RESULTADOS_PROCESO[clave_proceso]
+
+    model = crear_modelo_sarimax(datos, order, seasonal_order, perfil)
+    inicio = time.perf_counter()
+
+    cache = obtener_cache() if preciso else None
+    if cache is not None:
+        if registro is None:
+            registro = cache.obtener(datos, order, seasonal_order, huella)
+        if registro is not None and registro['params'] is not None \
+                and len(registro['params']) == model.k_params:
+            ULTIMO_AJUSTE = {'arranque': 'cache', 'iteraciones': 0, 'segundos': 0.0,
+                             'metadatos': registro.get('metadatos')}
+            _recordar_ajuste(huella, order, seasonal_order, registro['params'])
+            return _recordar_resultados(clave_proceso, model.filter(registro['params']))
+
+    results = None
+    arranque = 'frio'
+
+    if arranque_caliente and preciso:
+        start_params, origen = parametros_iniciales(model, datos, order, seasonal_order, huella)
+        if start_params is not None:
+            try:
+                results = ajustar_con_perfil(model, perfil, start_params=start_params)
+                if results.mle_retvals.get('converged', True):
+                    arranque = 'caliente'
+                else:
+                    print(f"Arranque en caliente desde {origen} no convergió para "
+                          f"order={order}, seasonal_order={seasonal_order} - usando valores por defecto")
+                    results = None
+                    arranque = 'respaldo'
+            except InterruptedError:
+                raise
+            except Exception:
+                results = None
+                arranque = 'respaldo'
+
+    if results is None:
+        results = ajustar_con_perfil(model, perfil)
+
+    ULTIMO_AJUSTE = {
+        'arranque': arranque,
+        'iteraciones': int((getattr(results, 'mle_retvals', None) or {}).get('iterations', 0)),
+        'segundos': time.perf_counter() - inicio
+    }
+
+    if preciso:
+        _recordar_ajuste(huella, order, seasonal_order, results.params)
+        _recordar_resultados(clave_proceso, results)
+    if cache is not None:
+        cache.guardar(datos, order, seasonal_order, results.params, results.aic, results.bic, huella=huella)
+
+    return results
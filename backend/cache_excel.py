@@ -0,0 +1,254 @@
+# backend/cache_excel.py - Cache de libros Excel ya leídos
+"""
+Cache en disco de los libros Excel SAIDI compartida por la interfaz, Parametro.py, Modelo.py,
+visual.py y los scripts por lotes. Cada libro se lee con openpyxl una sola vez: todas sus
+hojas se guardan como DataFrames serializados (pickle de pandas, columnar por bloques, con los
+mismos tipos que devuelve pd.read_excel) y las lecturas siguientes cargan ese artefacto.
+
+Un artefacto se identifica por la huella del contenido del archivo. Un índice por ruta guarda
+tamaño, fecha de modificación y huella: si tamaño y fecha no cambiaron se usa la huella
+registrada sin volver a leer el archivo; si cambiaron se recalcula la huella, de modo que un
+libro copiado o guardado sin cambios reutiliza su artefacto y uno editado se vuelve a leer.
+"""
+import os
+import json
+import hashlib
+import tempfile
+from collections import OrderedDict
+import pandas as pd
+
+try:
+    from path_utils import path_manager
+    PATH_UTILS_AVAILABLE = True
+except ImportError:
+    PATH_UTILS_AVAILABLE = False
+
+NOMBRE_CARPETA_CACHE = "cache_excel"
+NOMBRE_INDICE = "indice.json"
+
+# Libros conservados en disco y espacio que pueden ocupar; al superar cualquiera de los dos
+# límites se eliminan los menos usados
+MAX_ARTEFACTOS = 64
+TAMANO_MAXIMO = 256 * 1024 * 1024
+
+# Rutas recordadas en el índice (varias copias del mismo libro comparten artefacto)
+MAX_ENTRADAS_INDICE = 4 * MAX_ARTEFACTOS
+
+# Variable de entorno para desactivar la cache (la heredan también los procesos hijos)
+VARIABLE_DESACTIVAR = "SAIDI_CACHE_EXCEL_DESACTIVADA"
+
+# Libros ya cargados en este proceso (la interfaz lee el mismo libro varias veces)
+MAX_LIBROS_PROCESO = 4
+_LIBROS_PROCESO = OrderedDict()
+
+# Bloque de lectura para calcular la huella del archivo
+TAMANO_BLOQUE_HUELLA = 1024 * 1024
+
+
+def obtener_carpeta_cache():
+    """Carpeta de los artefactos (directorio de configuración persistente si existe)"""
+    if PATH_UTILS_AVAILABLE:
+        try:
+            carpeta = path_manager.get_config_file(NOMBRE_CARPETA_CACHE)
+            os.makedirs(carpeta, exist_ok=True)
+            return carpeta
+        except OSError as e:
+            print(f"Warning: Directorio de configuración no disponible para la cache de Excel: {e}")
+
+    # Scripts lanzados sin path_utils en el PYTHONPATH (desarrollo): la misma carpeta config/
+    # del proyecto que usa la interfaz, para que ambos compartan los artefactos
+    carpeta = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config",
+                           NOMBRE_CARPETA_CACHE)
+    try:
+        os.makedirs(carpeta, exist_ok=True)
+        return carpeta
+    except OSError:
+        pass
+
+    carpeta = os.path.join(tempfile.gettempdir(), "SAIDI_Analysis_Pro", NOMBRE_CARPETA_CACHE)
+    os.makedirs(carpeta, exist_ok=True)
+    return carpeta
+
+
+def cache_habilitada():
+    return os.environ.get(VARIABLE_DESACTIVAR, "") not in ("1", "true", "True")
+
+
+def desactivar_cache():
+    """Desactivar la cache de Excel en este proceso y en los procesos hijos"""
+    os.environ[VARIABLE_DESACTIVAR] = "1"
+
+
+def huella_archivo(ruta):
+    """Huella del contenido del archivo (no depende de su nombre ni de su fecha)"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(ruta, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(TAMANO_BLOQUE_HUELLA), b''):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def _leer_indice(carpeta):
+    try:
+        with open(os.path.join(carpeta, NOMBRE_INDICE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _escribir_atomico(ruta, escribir):
+    """Escribir en un temporal y renombrar: otro proceso nunca ve un archivo a medias"""
+    descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta), suffix='.tmp')
+    os.close(descriptor)
+    try:
+        escribir(temporal)
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
+
+def _guardar_indice(carpeta, indice):
+    def escribir(temporal):
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(indice, f, ensure_ascii=False, indent=1)
+    _escribir_atomico(os.path.join(carpeta, NOMBRE_INDICE), escribir)
+
+
+def _ruta_artefacto(carpeta, huella):
+    return os.path.join(carpeta, f"{huella}.pkl")
+
+
+def _limitar_artefactos(carpeta, indice):
+    """Eliminar los artefactos menos usados y las entradas del índice que apuntan a ellos"""
+    artefactos = []
+    for nombre in os.listdir(carpeta):
+        if nombre.endswith('.pkl'):
+            try:
+                estado = os.stat(os.path.join(carpeta, nombre))
+            except OSError:
+                continue
+            artefactos.append((estado.st_mtime, estado.st_size, nombre))
+
+    # Más antiguos primero: se eliminan hasta cumplir el número y el tamaño máximos
+    artefactos.sort()
+    total = sum(tamano for _, tamano, _ in artefactos)
+    restantes = len(artefactos)
+    for _, tamano, nombre in artefactos:
+        if restantes <= MAX_ARTEFACTOS and total <= TAMANO_MAXIMO:
+            break
+        try:
+            os.remove(os.path.join(carpeta, nombre))
+        except OSError:
+            pass
+        total -= tamano
+        restantes -= 1
+
+    for ruta in list(indice):
+        if not os.path.exists(_ruta_artefacto(carpeta, indice[ruta]['huella'])):
+            del indice[ruta]
+    # Las entradas nuevas o actualizadas se agregan al final: las primeras son las más antiguas
+    for ruta in list(indice)[:max(0, len(indice) - MAX_ENTRADAS_INDICE)]:
+        del indice[ruta]
+
+
+def _recordar_libro(huella, hojas):
+    _LIBROS_PROCESO[huella] = hojas
+    _LIBROS_PROCESO.move_to_end(huella)
+    while len(_LIBROS_PROCESO) > MAX_LIBROS_PROCESO:
+        _LIBROS_PROCESO.popitem(last=False)
+
+
+def _dimensiones(hojas):
+    return {str(nombre): list(df.shape) for nombre, df in hojas.items()}
+
+
+def _cargar_libro(ruta):
+    """
+    Todas las hojas del libro, desde la cache o leyendo el Excel (y guardando el artefacto)
+
+    Returns:
+        Tupla (hojas, entrada del índice) - los DataFrames no deben modificarse
+    """
+    if not cache_habilitada():
+        hojas = pd.read_excel(ruta, sheet_name=None)
+        return hojas, {'dimensiones': _dimensiones(hojas)}
+
+    ruta_abs = os.path.abspath(ruta)
+    estado = os.stat(ruta_abs)
+    carpeta = obtener_carpeta_cache()
+    indice = _leer_indice(carpeta)
+
+    entrada = indice.get(ruta_abs)
+    if entrada is None or entrada['tamano'] != estado.st_size or entrada['mtime_ns'] != estado.st_mtime_ns:
+        entrada = {'tamano': estado.st_size, 'mtime_ns': estado.st_mtime_ns, 'huella': huella_archivo(ruta_abs)}
+    huella = entrada['huella']
+
+    ruta_artefacto = _ruta_artefacto(carpeta, huella)
+    hojas = _LIBROS_PROCESO.get(huella)
+    if hojas is None and os.path.exists(ruta_artefacto):
+        try:
+            hojas = pd.read_pickle(ruta_artefacto)
+            os.utime(ruta_artefacto)  # marca de uso para _limitar_artefactos
+        except Exception as e:
+            print(f"Warning: Artefacto de Excel ilegible, se vuelve a leer el libro: {e}")
+            hojas = None
+
+    if hojas is None:
+        hojas = pd.read_excel(ruta_abs, sheet_name=None)
+    if not os.path.exists(ruta_artefacto):
+        try:
+            _escribir_atomico(ruta_artefacto, lambda temporal: pd.to_pickle(hojas, temporal))
+        except OSError as e:
+            print(f"Warning: No se pudo guardar el artefacto de Excel: {e}")
+
+    entrada = {**entrada, 'dimensiones': _dimensiones(hojas)}
+    if indice.get(ruta_abs) != entrada:
+        indice.pop(ruta_abs, None)
+        indice[ruta_abs] = entrada
+        try:
+            _limitar_artefactos(carpeta, indice)
+            _guardar_indice(carpeta, indice)
+        except OSError as e:
+            print(f"Warning: No se pudo actualizar el índice de la cache de Excel: {e}")
+
+    _recordar_libro(huella, hojas)
+    return hojas, entrada
+
+
+def leer_hojas(ruta):
+    """Todas las hojas del libro, como pd.read_excel(ruta, sheet_name=None)"""
+    hojas, _ = _cargar_libro(ruta)
+    return {nombre: df.copy() for nombre, df in hojas.items()}
+
+
+def leer_hoja(ruta, sheet_name=0, nrows=None):
+    """
+    Una hoja del libro, como pd.read_excel(ruta, sheet_name=sheet_name, nrows=nrows)
+
+    Raises:
+        ValueError: si la hoja no existe
+    """
+    hojas, _ = _cargar_libro(ruta)
+    nombres = list(hojas)
+    if isinstance(sheet_name, int):
+        if not 0 <= sheet_name < len(nombres):
+            raise ValueError(f"El libro tiene {len(nombres)} hojas; no existe la hoja {sheet_name}")
+        sheet_name = nombres[sheet_name]
+    elif sheet_name not in hojas:
+        raise ValueError(f"Worksheet named '{sheet_name}' not found")
+
+    df = hojas[sheet_name]
+    return (df.head(nrows) if nrows is not None else df).copy()
+
+
+def describir_libro(ruta):
+    """
+    Dimensiones de cada hoja sin copiar los datos
+
+    Returns:
+        Dict {hoja: (filas, columnas)} en el orden del libro
+    """
+    _, entrada = _cargar_libro(ruta)
+    return {nombre: tuple(forma) for nombre, forma in entrada['dimensiones'].items()}
@@ -0,0 +1,211 @@
+# backend/canal_progreso.py - Canal de progreso entre los scripts del backend y la interfaz
+"""
+En lugar de reescribir el JSON de progreso completo por cada modelo evaluado, el script agrega
+eventos a un registro JSONL junto al archivo de progreso (<progreso>_eventos.jsonl). Cada evento
+es una línea compacta escrita con una sola llamada a write sobre un descriptor en modo append,
+y solo lleva los campos que cambiaron respecto al último evento publicado: el porcentaje y el
+estado casi siempre, el modelo actual si es otro y top_models únicamente cuando cambia el
+ranking.
+
+Las actualizaciones intermedias (una por candidato) se publican como mucho cada
+INTERVALO_MINIMO segundos; los hitos, el 100 %, los errores y la cancelación se publican
+siempre. El archivo de progreso original se sigue escribiendo de forma atómica (temporal y
+renombrado), con menor frecuencia, para quien lo lea directamente.
+
+La interfaz usa LectorProgreso: guarda la posición leída y en cada consulta procesa solo las
+líneas nuevas y completas, sin volver a abrir y parsear un archivo a medio escribir.
+"""
+import os
+import json
+import time
+import tempfile
+from datetime import datetime
+
+SUFIJO_EVENTOS = '_eventos.jsonl'
+
+# Separación mínima entre actualizaciones intermedias publicadas (segundos)
+INTERVALO_MINIMO = 0.2
+
+# Separación mínima entre reescrituras del archivo de progreso (segundos)
+INTERVALO_INSTANTANEA = 1.0
+
+# Campos del estado publicado, con el nombre que usa el archivo de progreso
+CAMPOS_ESTADO = ('progress', 'status', 'current_model', 'remaining_seconds', 'top_models', 'cancelled')
+
+# Publicadores abiertos en este proceso, por archivo de progreso
+_PUBLICADORES = {}
+
+# Marca de campo todavía no publicado (None es un valor válido de remaining_seconds)
+_SIN_PUBLICAR = object()
+
+
+def ruta_eventos(progress_file):
+    """Registro de eventos asociado a un archivo de progreso (mismo criterio que _cancel.json)"""
+    base = progress_file[:-len('.json')] if progress_file.endswith('.json') else progress_file
+    return base + SUFIJO_EVENTOS
+
+
+def eliminar_eventos(progress_file):
+    """Eliminar el registro de eventos de una ejecución (sin error si no existe)"""
+    try:
+        os.remove(ruta_eventos(progress_file))
+    except FileNotFoundError:
+        pass
+
+
+def _escribir_json_atomico(ruta, datos):
+    descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(ruta)), suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
+
+class PublicadorProgreso:
+    """Publica el progreso de un proceso como eventos en el registro JSONL"""
+
+    def __init__(self, progress_file, intervalo_minimo=INTERVALO_MINIMO, intervalo_instantanea=INTERVALO_INSTANTANEA):
+        self.progress_file = progress_file
+        self.intervalo_minimo = intervalo_minimo
+        self.intervalo_instantanea = intervalo_instantanea
+        # Cada ejecución empieza un registro nuevo (el mismo --progress puede reutilizarse)
+        self._descriptor = os.open(ruta_eventos(progress_file),
+                                   os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_APPEND, 0o644)
+        self._publicado = {}
+        self._ultima_publicacion = 0.0
+        self._ultima_instantanea = 0.0
+        self._secuencia = 0
+        self.eventos_publicados = 0
+        self.eventos_omitidos = 0
+
+    def publicar(self, estado, intermedio=False):
+        """
+        Publicar el estado si corresponde
+
+        Args:
+            estado: Dict con los campos de CAMPOS_ESTADO (los ausentes no cambian)
+            intermedio: True para las actualizaciones por candidato, que se limitan a una cada
+                intervalo_minimo segundos; los hitos se publican siempre
+
+        Returns:
+            True si se escribió un evento
+        """
+        ahora = time.monotonic()
+        forzar = (not intermedio or estado.get('cancelled') or
+                  (estado.get('progress') or 0) >= 100)
+        if not forzar and ahora - self._ultima_publicacion < self.intervalo_minimo:
+            self.eventos_omitidos += 1
+            return False
+
+        # Solo los campos que cambiaron: top_models viaja únicamente cuando cambia el ranking
+        cambios = {campo: valor for campo, valor in estado.items()
+                   if campo in CAMPOS_ESTADO and self._publicado.get(campo, _SIN_PUBLICAR) != valor}
+        if not cambios:
+            return False
+
+        self._secuencia += 1
+        evento = {'seq': self._secuencia, 't': round(time.time(), 3), **cambios}
+        linea = json.dumps(evento, ensure_ascii=False, separators=(',', ':')) + '\n'
+        # Una sola escritura en modo append: el lector nunca ve una línea de otro evento intercalada
+        os.write(self._descriptor, linea.encode('utf-8'))
+        self._publicado.update({campo: _copiar(valor) for campo, valor in cambios.items()})
+        self._ultima_publicacion = ahora
+        self.eventos_publicados += 1
+
+        if forzar or ahora - self._ultima_instantanea >= self.intervalo_instantanea:
+            self._guardar_instantanea()
+            self._ultima_instantanea = ahora
+        return True
+
+    def _guardar_instantanea(self):
+        """Reescribir el archivo de progreso con el estado publicado (atómico)"""
+        datos = {campo: self._publicado.get(campo) for campo in CAMPOS_ESTADO}
+        datos['top_models'] = datos['top_models'] or []
+        datos['cancelled'] = bool(datos['cancelled'])
+        datos['timestamp'] = datetime.now().isoformat()
+        datos['pid'] = os.getpid()
+        try:
+            _escribir_json_atomico(self.progress_file, datos)
+        except OSError as e:
+            print(f"Error actualizando archivo de progreso: {e}")
+
+    def cerrar(self):
+        if self._descriptor is not None:
+            os.close(self._descriptor)
+            self._descriptor = None
+
+
+def _copiar(valor):
+    # top_models es una lista de dicts que el script sigue modificando
+    if isinstance(valor, list):
+        return [dict(elemento) if isinstance(elemento, dict) else elemento for elemento in valor]
+    return valor
+
+
+def obtener_publicador(progress_file):
+    """Publicador del archivo de progreso para este proceso (se crea al primer uso)"""
+    publicador = _PUBLICADORES.get(progress_file)
+    if publicador is None:
+        publicador = PublicadorProgreso(progress_file)
+        _PUBLICADORES[progress_file] = publicador
+    return publicador
+
+
+class LectorProgreso:
+    """Lectura incremental del registro de eventos (lado de la interfaz)"""
+
+    def __init__(self, progress_file):
+        self.ruta = ruta_eventos(progress_file)
+        self.estado = {'progress': 0, 'status': '', 'current_model': '', 'remaining_seconds': None,
+                       'top_models': [], 'cancelled': False}
+        self.ultima_secuencia = 0
+        self._posicion = 0
+        self._fragmento = b''
+
+    def leer(self):
+        """
+        Aplicar los eventos nuevos al estado acumulado
+
+        Returns:
+            Número de eventos nuevos (0 si el registro no existe todavía o no cambió)
+        """
+        try:
+            with open(self.ruta, 'rb') as f:
+                tamano = os.fstat(f.fileno()).st_size
+                if tamano < self._posicion:
+                    # El script reinició el registro: volver a leerlo desde el principio
+                    self._posicion = 0
+                    self._fragmento = b''
+                    self.ultima_secuencia = 0
+                if tamano == self._posicion:
+                    return 0
+                f.seek(self._posicion)
+                datos = f.read(tamano - self._posicion)
+        except FileNotFoundError:
+            return 0
+        self._posicion += len(datos)
+
+        # La última línea puede estar incompleta: se guarda hasta la próxima lectura
+        lineas = (self._fragmento + datos).split(b'\n')
+        self._fragmento = lineas.pop()
+
+        nuevos = 0
+        for linea in lineas:
+            if not linea.strip():
+                continue
+            try:
+                evento = json.loads(linea)
+            except ValueError:
+                continue
+            secuencia = evento.pop('seq', 0)
+            evento.pop('t', None)
+            if secuencia and secuencia <= self.ultima_secuencia:
+                continue
+            self.ultima_secuencia = secuencia or self.ultima_secuencia
+            self.estado.update(evento)
+            nuevos += 1
+        return nuevos
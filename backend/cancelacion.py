@@ -0,0 +1,135 @@
+# backend/cancelacion.py - Cancelación por evento para Parametro.py y lote_circuitos.py
+"""
+La cancelación es un multiprocessing.Event compartido por el proceso principal y los workers
+del pool (se les entrega en el inicializador). Nadie consulta el disco para saber si se canceló:
+
+- La interfaz lanza el script con --cancel-stdin y escribe una línea en su entrada estándar;
+  un hilo bloqueado en esa tubería activa el evento. Si la interfaz se cierra, la tubería
+  llega a fin de archivo y el proceso también se cancela en lugar de quedar huérfano.
+- SIGINT/SIGTERM (Parametro.setup_signal_handlers) activan el mismo evento.
+- Sin --cancel-stdin se conserva el archivo <progreso>_cancel.json de versiones anteriores,
+  vigilado por un hilo aparte, fuera del bucle de búsqueda.
+
+punto_interrupcion se pasa como callback del optimizador de statsmodels: un ajuste en curso,
+aunque sea de orden alto y lento, se detiene en la siguiente iteración del optimizador.
+"""
+import os
+import sys
+import threading
+import multiprocessing
+from concurrent.futures import Future
+
+# Segundos entre comprobaciones del archivo de cancelación (solo sin --cancel-stdin)
+INTERVALO_ARCHIVO = 0.5
+
+_EVENTO = None
+_AVISO = None
+# Reentrante: solicitar_cancelacion también se llama desde los manejadores de señales
+_CERROJO = threading.RLock()
+
+
+class CancelacionSolicitada(InterruptedError):
+    """Ajuste o evaluación interrumpidos por la cancelación del usuario"""
+
+    def __init__(self, mensaje="Proceso cancelado por el usuario"):
+        super().__init__(mensaje)
+
+
+def obtener_evento():
+    """Evento de cancelación del proceso (se crea en el proceso principal al primer uso)"""
+    global _EVENTO
+    with _CERROJO:
+        if _EVENTO is None:
+            _EVENTO = multiprocessing.Event()
+        return _EVENTO
+
+
+def instalar_evento(evento):
+    """Usar el evento del proceso principal (inicializador de los workers del pool)"""
+    global _EVENTO
+    _EVENTO = evento
+
+
+def cancelacion_solicitada():
+    return _EVENTO is not None and _EVENTO.is_set()
+
+
+def aviso_cancelacion():
+    """
+    Future que se completa al solicitarse la cancelación: incluido en concurrent.futures.wait
+    despierta al bucle que espera resultados del pool en cuanto el usuario cancela
+    """
+    global _AVISO
+    with _CERROJO:
+        if _AVISO is None:
+            _AVISO = Future()
+            if _EVENTO is not None and _EVENTO.is_set():
+                _AVISO.set_result(True)
+        return _AVISO
+
+
+def solicitar_cancelacion():
+    """Activar el evento (visible en los workers) y despertar a quien espera el aviso"""
+    obtener_evento().set()
+    with _CERROJO:
+        aviso = _AVISO
+    if aviso is not None and not aviso.done():
+        try:
+            aviso.set_result(True)
+        except Exception:
+            # Otro hilo lo completó entre la comprobación y set_result
+            pass
+
+
+def punto_interrupcion(*args):
+    """Callback por iteración del optimizador: lanza CancelacionSolicitada si se canceló"""
+    if _EVENTO is not None and _EVENTO.is_set():
+        raise CancelacionSolicitada()
+
+
+def ruta_cancelacion(progress_file):
+    """Archivo de cancelación asociado a un archivo de progreso (<progreso>_cancel.json)"""
+    return progress_file.replace('.json', '_cancel.json')
+
+
+def _vigilar_entrada(descriptor):
+    # Lectura directa del descriptor: un hilo bloqueado en sys.stdin retendría el cerrojo de su
+    # buffer y los workers creados con fork quedarían bloqueados al cerrar su copia de stdin
+    try:
+        while True:
+            datos = os.read(descriptor, 64)
+            # Una línea o el cierre de la tubería (b'') por parte de la interfaz
+            if not datos or b'\n' in datos:
+                break
+    except OSError:
+        return
+    solicitar_cancelacion()
+
+
+def _vigilar_archivo(ruta):
+    evento = obtener_evento()
+    while not evento.wait(INTERVALO_ARCHIVO):
+        if os.path.exists(ruta):
+            print(" CANCELACIÓN DETECTADA (archivo de cancelación)")
+            solicitar_cancelacion()
+            return
+
+
+def vigilar_cancelacion(progress_file=None, usar_entrada=False):
+    """
+    Iniciar el hilo que activa el evento de cancelación
+
+    Args:
+        progress_file: Archivo de progreso; sin usar_entrada se vigila su _cancel.json
+        usar_entrada: True si la interfaz cancela escribiendo en la entrada estándar (--cancel-stdin)
+    """
+    obtener_evento()
+    if usar_entrada and sys.stdin is not None:
+        objetivo, argumentos = _vigilar_entrada, (sys.stdin.fileno(),)
+    elif progress_file and os.path.dirname(progress_file):
+        objetivo, argumentos = _vigilar_archivo, (ruta_cancelacion(progress_file),)
+    else:
+        return None
+    hilo = threading.Thread(target=objetivo, args=argumentos, name='vigilancia-cancelacion', daemon=True)
+    hilo.start()
+    return hilo
@@ -0,0 +1,99 @@
+# backend/cortes_grilla.py - Preparación compartida por corte (d, D, s) de la grilla de búsqueda
+"""
+Artefactos que dependen solo de la serie y de (d, D, s), no de (p, q, P, Q): la división
+entrenamiento/validación como arrays y las huellas para la cache de ajustes. Se calculan
+una vez por proceso y corte y se reutilizan en todas las combinaciones de ese corte.
+
+No se comparten series diferenciadas, entradas de simple_differencing ni estado inicial entre
+los ajustes SARIMAX: cada candidato construye su propio espacio de estados y diferencia dentro
+de él. Para esos ajustes la reutilización del corte ahorra solo la división y el cálculo de las
+huellas. La serie de entrenamiento diferenciada la usan el motor Levinson-Durbin y el prefiltro
+de Hannan-Rissanen; se calcula la primera vez que alguno la pide.
+"""
+import time
+from functools import cached_property
+import numpy as np
+from statsmodels.tsa.statespace.tools import diff
+
+from cache_ajustes import huella_serie, huella_de_validacion
+
+# Cortes preparados en este proceso: {(d, D, s): PreparacionCorte}
+_CORTES = {}
+
+# Estadísticas de este proceso: {(d, D, s): {'creaciones', 'reutilizaciones', 'segundos'}}
+ESTADISTICAS = {}
+
+
+def dividir_entrenamiento_validacion(serie):
+    """División dinámica entrenamiento/validación según la cantidad de datos"""
+    if len(serie) >= 60:
+        pct_validacion = 0.30
+    elif len(serie) >= 36:
+        pct_validacion = 0.25
+    else:
+        pct_validacion = 0.20
+
+    n_test = max(6, int(len(serie) * pct_validacion))
+    return serie[:-n_test], serie[-n_test:], n_test, pct_validacion
+
+
+class PreparacionCorte:
+    """Datos de un corte (d, D, s) listos para ajustar cualquier (p, q, P, Q)"""
+
+    def __init__(self, serie, d, D, s):
+        self.serie = serie
+        self.clave = (d, D, s)
+
+        train_data, test_data, self.n_test, self.pct_validacion = dividir_entrenamiento_validacion(serie)
+        self.train = np.ascontiguousarray(train_data, dtype=np.float64)
+        self.test = np.ascontiguousarray(test_data, dtype=np.float64)
+
+        # Huellas de las series con fechas: coinciden con las que calculan Modelo.py y visual.py
+        self.huella_train = huella_serie(train_data)
+        self._test_data = test_data
+        self._huellas_validacion = {}
+
+    @cached_property
+    def train_diferenciada(self):
+        """Entrenamiento con las diferencias (d, D, s) aplicadas (motor Levinson-Durbin y prefiltro)"""
+        d, D, s = self.clave
+        return diff(self.train, k_diff=d, k_seasonal_diff=D, seasonal_periods=s)
+
+    def huella_validacion(self, modo='holdout'):
+        if modo not in self._huellas_validacion:
+            self._huellas_validacion[modo] = huella_de_validacion(self._test_data, modo)
+        return self._huellas_validacion[modo]
+
+
+def preparar_corte(serie, order, seasonal_order):
+    """
+    Preparación del corte (d, D, s) de una combinación, creada en la primera llamada
+
+    Returns:
+        Tupla (PreparacionCorte, reutilizada)
+    """
+    clave = (order[1], seasonal_order[1], seasonal_order[3])
+    estadisticas = ESTADISTICAS.setdefault(clave, {'creaciones': 0, 'reutilizaciones': 0, 'segundos': 0.0})
+
+    preparacion = _CORTES.get(clave)
+    # La referencia a la serie evita confundir una serie nueva con otra ya liberada
+    if preparacion is not None and preparacion.serie is serie:
+        estadisticas['reutilizaciones'] += 1
+        return preparacion, True
+
+    inicio = time.perf_counter()
+    preparacion = PreparacionCorte(serie, *clave)
+    _CORTES[clave] = preparacion
+    estadisticas['creaciones'] += 1
+    estadisticas['segundos'] += time.perf_counter() - inicio
+    return preparacion, False
+
+
+def info_corte(preparacion, reutilizada):
+    """Resumen de la preparación para acompañar las métricas de una evaluación"""
+    estadisticas = ESTADISTICAS[preparacion.clave]
+    return {
+        'clave': list(preparacion.clave),
+        'reutilizado': reutilizada,
+        'segundos_preparacion': estadisticas['segundos'] / max(1, estadisticas['creaciones'])
+    }
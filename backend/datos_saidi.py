@@ -0,0 +1,84 @@
+# backend/datos_saidi.py - Lectura del Excel SAIDI compartida por los scripts del backend
+import pandas as pd
+
+# Cache de libros ya leídos (evita volver a leer el .xlsx con openpyxl)
+try:
+    from cache_excel import leer_hoja, leer_hojas
+    CACHE_EXCEL_AVAILABLE = True
+except ImportError:
+    CACHE_EXCEL_AVAILABLE = False
+
+
+def leer_hoja_excel(file_path, sheet_name="Hoja1"):
+    """Una hoja del libro como pd.read_excel, desde la cache de Excel si está disponible"""
+    if CACHE_EXCEL_AVAILABLE:
+        return leer_hoja(file_path, sheet_name)
+    return pd.read_excel(file_path, sheet_name=sheet_name)
+
+
+def leer_hojas_excel(file_path):
+    """Todas las hojas del libro como pd.read_excel(sheet_name=None), desde la cache si está disponible"""
+    if CACHE_EXCEL_AVAILABLE:
+        return leer_hojas(file_path)
+    return pd.read_excel(file_path, sheet_name=None)
+
+
+def preparar_hoja_saidi(df):
+    """
+    Fecha como índice y detección de la columna SAIDI de una hoja ya leída
+
+    Returns:
+        Tupla (df, col_saidi)
+
+    Raises:
+        ValueError: si no existe la columna SAIDI ni SAIDI Histórico
+    """
+    # Detectar columna de fecha
+    if "Fecha" in df.columns:
+        df["Fecha"] = pd.to_datetime(df["Fecha"])
+        df.set_index("Fecha", inplace=True)
+    else:
+        df.iloc[:, 0] = pd.to_datetime(df.iloc[:, 0])
+        df.set_index(df.columns[0], inplace=True)
+
+    # Detectar columna de SAIDI
+    col_saidi = "SAIDI" if "SAIDI" in df.columns else "SAIDI Histórico"
+    if col_saidi not in df.columns:
+        raise ValueError("No se encontró la columna SAIDI ni SAIDI Histórico.")
+
+    return df, col_saidi
+
+
+def cargar_excel_saidi(file_path, sheet_name="Hoja1"):
+    """
+    Leer la hoja SAIDI con la fecha como índice
+
+    Returns:
+        Tupla (df, col_saidi)
+
+    Raises:
+        ValueError: si no existe la columna SAIDI ni SAIDI Histórico
+    """
+    df = leer_hoja_excel(file_path, sheet_name)
+
+    # Mostrar nombres de columnas detectados (para depuración)
+    print("Columnas encontradas en el Excel:", df.columns.tolist())
+
+    return preparar_hoja_saidi(df)
+
+
+def cargar_datos_compartidos(data_path):
+    """
+    Serie ya preparada por la interfaz (--data), abierta sin releer el Excel
+
+    Returns:
+        Tupla (df, col_saidi), o None si el archivo no se puede abrir (se lee entonces --file)
+    """
+    try:
+        from serie_compartida import cargar_serie
+        datos = cargar_serie(data_path)
+    except (ImportError, OSError, ValueError) as e:
+        print(f"Warning: No se pudo abrir la serie compartida {data_path}: {e} - se lee el Excel")
+        return None
+    print(f"Serie compartida por la interfaz: {len(datos[0])} filas, columnas {datos[0].columns.tolist()}")
+    return datos
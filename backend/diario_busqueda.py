@@ -0,0 +1,173 @@
+# backend/diario_busqueda.py - Diario de la búsqueda de parámetros para poder reanudarla
+"""
+Diario en disco (JSON Lines, solo se agregan líneas) con cada combinación evaluada por Parametro.py
+Permite reanudar con --resume una búsqueda cancelada o interrumpida sin repetir lo ya evaluado
+"""
+import os
+import glob
+import json
+import time
+import tempfile
+
+try:
+    from path_utils import path_manager
+    PATH_UTILS_AVAILABLE = True
+except ImportError:
+    PATH_UTILS_AVAILABLE = False
+
+VERSION_DIARIO = 1
+
+# Cada cuántas líneas se fuerza la escritura a disco (fsync) además del flush por línea
+INTERVALO_SINCRONIZACION = 50
+
+# Los diarios de búsquedas que no terminaron se conservan para --resume durante este tiempo (segundos)
+ANTIGUEDAD_MAXIMA = 7 * 24 * 3600
+
+PATRON_DIARIOS = "diario_busqueda_*.jsonl"
+
+
+def _directorio_diarios():
+    if PATH_UTILS_AVAILABLE:
+        return path_manager.get_temp_file("")
+
+    directorio = os.path.join(tempfile.gettempdir(), "SAIDI_Analysis_Pro")
+    os.makedirs(directorio, exist_ok=True)
+    return directorio
+
+
+def ruta_diario(huella, estrategia, espacio):
+    """Ruta del diario para una serie, estrategia y espacio de búsqueda"""
+    nombre = f"diario_busqueda_{estrategia}_{espacio}_{huella[:16]}.jsonl"
+    return os.path.join(_directorio_diarios(), nombre)
+
+
+def limpiar_diarios_antiguos(excepto=None, antiguedad_maxima=ANTIGUEDAD_MAXIMA):
+    """
+    Eliminar los diarios de búsquedas interrumpidas que no se modificaron en antiguedad_maxima segundos
+
+    Returns:
+        Número de diarios eliminados
+    """
+    limite = time.time() - antiguedad_maxima
+    excepto = os.path.abspath(excepto) if excepto else None
+    eliminados = 0
+    for ruta in glob.glob(os.path.join(_directorio_diarios(), PATRON_DIARIOS)):
+        try:
+            if os.path.abspath(ruta) != excepto and os.path.getmtime(ruta) < limite:
+                os.remove(ruta)
+                eliminados += 1
+        except OSError:
+            # Otro proceso lo eliminó o lo está usando
+            continue
+    return eliminados
+
+
+def _a_tupla(valores):
+    return tuple(int(v) for v in valores)
+
+
+class DiarioBusqueda:
+    """Diario de una búsqueda: una cabecera y una línea por modelo evaluado"""
+
+    def __init__(self, ruta, huella, estrategia, espacio, **configuracion):
+        """configuracion: opciones que cambian las métricas (validación, perfiles de ajuste)"""
+        self.ruta = ruta
+        self.cabecera = {
+            'tipo': 'cabecera',
+            'version': VERSION_DIARIO,
+            'huella': huella,
+            'estrategia': estrategia,
+            'espacio': espacio,
+            **configuracion
+        }
+        self._archivo = None
+        self._pendientes_sync = 0
+
+    def cargar(self):
+        """
+        Leer un diario existente de la misma búsqueda
+
+        Returns:
+            Lista de (order, seasonal_order, metrics) con las evaluaciones registradas
+        """
+        resultados = {}
+
+        if not os.path.exists(self.ruta):
+            return []
+
+        with open(self.ruta, 'r', encoding='utf-8') as f:
+            primera = f.readline()
+            try:
+                cabecera = json.loads(primera)
+            except json.JSONDecodeError:
+                print(f"Diario ilegible, se ignora: {self.ruta}")
+                return []
+
+            claves = [clave for clave in self.cabecera if clave != 'tipo']
+            if any(cabecera.get(clave) != self.cabecera[clave] for clave in claves):
+                print("El diario existente corresponde a otra búsqueda (datos, estrategia, espacio u opciones) - se ignora")
+                return []
+
+            for numero, linea in enumerate(f, 2):
+                try:
+                    registro = json.loads(linea)
+                    candidato = (_a_tupla(registro['order']), _a_tupla(registro['seasonal_order']))
+                    metrics = registro['metrics']
+                except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                    # Normalmente la última línea, cortada por un cierre abrupto
+                    print(f"Línea {numero} del diario incompleta - se descarta")
+                    continue
+
+                resultados[candidato] = metrics
+
+        return [(order, seasonal_order, metrics) for (order, seasonal_order), metrics in resultados.items()]
+
+    def abrir(self, reanudar=False):
+        """Abrir el diario para agregar líneas (sin reanudar se empieza uno nuevo)"""
+        existe = reanudar and os.path.exists(self.ruta)
+        self._archivo = open(self.ruta, 'a' if existe else 'w', encoding='utf-8')
+
+        if existe:
+            # Asegurar que la primera línea nueva no quede pegada a una línea cortada
+            self._archivo.write('\n')
+        else:
+            self._archivo.write(json.dumps(dict(self.cabecera, inicio=time.time())) + '\n')
+        self._archivo.flush()
+
+    def registrar(self, order, seasonal_order, metrics):
+        """Agregar una evaluación al diario"""
+        if self._archivo is None:
+            return
+
+        registro = {'order': list(order), 'seasonal_order': list(seasonal_order), 'metrics': metrics}
+
+        try:
+            self._archivo.write(json.dumps(registro, separators=(',', ':'), default=float) + '\n')
+            self._archivo.flush()
+
+            self._pendientes_sync += 1
+            if self._pendientes_sync >= INTERVALO_SINCRONIZACION:
+                os.fsync(self._archivo.fileno())
+                self._pendientes_sync = 0
+        except (OSError, ValueError) as e:
+            print(f"Warning: No se pudo escribir en el diario de búsqueda: {e}")
+
+    def cerrar(self):
+        if self._archivo is not None:
+            try:
+                self._archivo.flush()
+                os.fsync(self._archivo.fileno())
+            except (OSError, ValueError):
+                pass
+            self._archivo.close()
+            self._archivo = None
+
+    def eliminar(self):
+        """Cerrar y borrar el diario: una búsqueda terminada no tiene nada que reanudar"""
+        self.cerrar()
+        try:
+            os.remove(self.ruta)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Warning: No se pudo eliminar el diario de búsqueda: {e}")
@@ -0,0 +1,475 @@
+# backend/estrategias_busqueda.py - Estrategias de búsqueda de parámetros SARIMAX
+"""
+Capa de estrategias de búsqueda para Parametro.py
+Cada estrategia decide qué combinaciones (order, seasonal_order) evaluar y en qué orden,
+usando el motor de búsqueda paralela para ejecutar los ajustes.
+Todas puntúan con la precisión de validación del proyecto (precision_final).
+"""
+import math
+import random
+import time
+from itertools import product
+
+# Se usa al leer la precisión de un resultado sin métricas
+PRECISION_FALLIDA = 0.0
+
+
+class EspacioBusqueda:
+    """Rangos de (p, d, q)(P, D, Q, s) que puede explorar una estrategia"""
+
+    DIMENSIONES = ('p', 'd', 'q', 'P', 'D', 'Q')
+
+    def __init__(self, p=range(0, 6), d=range(0, 2), q=range(0, 6),
+                 P=range(0, 6), D=range(0, 2), Q=range(0, 6), s=12):
+        self.rangos = {
+            'p': list(p), 'd': list(d), 'q': list(q),
+            'P': list(P), 'D': list(D), 'Q': list(Q)
+        }
+        self.s = s
+
+    def __len__(self):
+        return math.prod(len(valores) for valores in self.rangos.values())
+
+    def describir(self):
+        partes = [f"{nombre}={valores[0]}..{valores[-1]}" for nombre, valores in self.rangos.items()]
+        return f"{', '.join(partes)}, s={self.s} ({len(self)} combinaciones)"
+
+    def candidatos(self):
+        """Toda la grilla en el orden original de Parametro.py"""
+        r = self.rangos
+        return [
+            ((p, d, q), (P, D, Q, self.s))
+            for p, d, q in product(r['p'], r['d'], r['q'])
+            for P, D, Q in product(r['P'], r['D'], r['Q'])
+        ]
+
+    def candidatos_por_complejidad(self):
+        """
+        La grilla de los modelos más simples a los más complejos (número de términos AR/MA,
+        luego diferenciaciones), para que una búsqueda cortada por tiempo cubra primero lo barato
+        """
+        def complejidad(candidato):
+            (p, d, q), (P, D, Q, _) = candidato
+            return (p + q + P + Q, d + D)
+
+        return sorted(self.candidatos(), key=complejidad)
+
+    def desde_valores(self, valores):
+        """Convertir un dict {dimensión: valor} en (order, seasonal_order)"""
+        return ((valores['p'], valores['d'], valores['q']),
+                (valores['P'], valores['D'], valores['Q'], self.s))
+
+    def a_valores(self, candidato):
+        (p, d, q), (P, D, Q, _) = candidato
+        return {'p': p, 'd': d, 'q': q, 'P': P, 'D': D, 'Q': Q}
+
+    def contiene(self, candidato):
+        valores = self.a_valores(candidato)
+        return candidato[1][3] == self.s and all(
+            valores[nombre] in self.rangos[nombre] for nombre in self.DIMENSIONES
+        )
+
+    def vecinos(self, candidato):
+        """Vecindario del stepwise: cada término ±1 y los pares (p, q) y (P, Q) ±1 a la vez"""
+        valores = self.a_valores(candidato)
+        movimientos = [{nombre: delta} for nombre in self.DIMENSIONES for delta in (-1, 1)]
+        movimientos += [{'p': delta, 'q': delta} for delta in (-1, 1)]
+        movimientos += [{'P': delta, 'Q': delta} for delta in (-1, 1)]
+
+        resultado = []
+        for movimiento in movimientos:
+            nuevo = dict(valores)
+            for nombre, delta in movimiento.items():
+                nuevo[nombre] += delta
+            vecino = self.desde_valores(nuevo)
+            if self.contiene(vecino) and vecino not in resultado:
+                resultado.append(vecino)
+        return resultado
+
+
+# Espacios disponibles desde la línea de comandos
+ESPACIOS_BUSQUEDA = {
+    # Grilla original de Parametro.py
+    'standard': EspacioBusqueda(),
+    # Límites que acepta validate_model_parameters del bridge
+    'wide': EspacioBusqueda(p=range(0, 11), d=range(0, 3), q=range(0, 11),
+                            P=range(0, 6), D=range(0, 2), Q=range(0, 6)),
+}
+
+
+def precision_de(metrics):
+    if not metrics:
+        return PRECISION_FALLIDA
+    precision = metrics.get('precision_final', PRECISION_FALLIDA)
+    return precision if precision == precision else PRECISION_FALLIDA
+
+
+class EstrategiaBusqueda:
+    """
+    Base de las estrategias. Una estrategia recibe el motor de búsqueda y una función
+    registrar(order, seasonal_order, metrics, error) -> metrics que incorpora cada evaluación
+    completa al evaluador (TOP 3, progreso, ranking para el ajuste final)
+    """
+
+    nombre = ""
+    descripcion = ""
+    # True si la estrategia considera toda la grilla (las evaluaciones precargadas no consumen presupuesto)
+    cubre_grilla = False
+
+    def __init__(self, espacio, **opciones):
+        self.espacio = espacio
+        self.opciones = opciones
+        self.evaluados = {}
+        self.ultimo_lote = []
+
+    def total_evaluaciones(self):
+        """Evaluaciones previstas (para la barra de progreso)"""
+        raise NotImplementedError
+
+    def ejecutar(self, motor, registrar):
+        """Ejecutar la búsqueda. Retorna True si terminó, False si se canceló"""
+        raise NotImplementedError
+
+    def precargar(self, evaluados):
+        """
+        Incorporar evaluaciones de una ejecución anterior (diario de búsqueda) para no repetirlas.
+        evaluados: {candidato: metrics}
+        """
+        self.evaluados.update(evaluados)
+
+    def siguientes_candidatos(self, cantidad):
+        """Candidatos sin evaluar que la estrategia ajustaría a continuación, los más prometedores primero"""
+        siguientes = []
+        for candidato in self.ultimo_lote + self.espacio.candidatos_por_complejidad():
+            if len(siguientes) >= cantidad:
+                break
+            if candidato not in self.evaluados and candidato not in siguientes:
+                siguientes.append(candidato)
+        return siguientes
+
+    def evaluar_lote(self, motor, candidatos, registrar):
+        """
+        Evaluar un lote de candidatos nuevos en el motor.
+        Retorna {candidato: metrics} o None si se canceló
+        """
+        nuevos = [c for c in candidatos if c not in self.evaluados]
+        self.ultimo_lote = nuevos
+        resultados = {}
+
+        def al_completar(order, seasonal_order, metrics, error):
+            metrics = registrar(order, seasonal_order, metrics, error)
+            resultados[(order, seasonal_order)] = metrics
+            self.evaluados[(order, seasonal_order)] = metrics
+
+        if nuevos and not motor.evaluar(nuevos, al_completar):
+            return None
+        return resultados
+
+
+class BusquedaExhaustiva(EstrategiaBusqueda):
+    """Toda la grilla. Opción por_complejidad: recorrerla de simple a complejo (búsqueda con presupuesto)"""
+
+    nombre = "exhaustive"
+    descripcion = "toda la grilla"
+    cubre_grilla = True
+
+    def total_evaluaciones(self):
+        return len(self.espacio)
+
+    def ejecutar(self, motor, registrar):
+        if self.opciones.get('por_complejidad'):
+            candidatos = self.espacio.candidatos_por_complejidad()
+        else:
+            candidatos = self.espacio.candidatos()
+        return self.evaluar_lote(motor, candidatos, registrar) is not None
+
+
+def correlacion_rangos(a, b):
+    """Correlación de Spearman (sin corrección de empates) entre dos listas de valores"""
+    def rangos(valores):
+        orden = sorted(range(len(valores)), key=lambda i: valores[i])
+        posiciones = [0] * len(valores)
+        for posicion, i in enumerate(orden):
+            posiciones[i] = posicion
+        return posiciones
+
+    n = len(a)
+    if n < 3:
+        return float('nan')
+    ra, rb = rangos(a), rangos(b)
+    suma_cuadrados = sum((x - y) ** 2 for x, y in zip(ra, rb))
+    return 1 - 6 * suma_cuadrados / (n * (n ** 2 - 1))
+
+
+class BusquedaPrefiltro(EstrategiaBusqueda):
+    """
+    Prefiltro sin filtro de Kalman: toda la grilla se puntúa con una estimación cerrada
+    (opción funcion_prefiltro(candidatos) -> {candidato: metrics}) y solo los no dominados
+    pasan al ajuste completo. Una muestra de descartados también se ajusta para medir
+    cuántos buenos modelos elimina el prefiltro.
+    Opciones: fraccion_conservada, muestra_auditoria, semilla, tiempo_restante.
+    Con presupuesto de tiempo los no dominados se ajustan del mejor puntaje al peor, de modo que
+    el tiempo se gasta primero en los más prometedores
+    """
+
+    nombre = "prescreen"
+    descripcion = "prefiltro Hannan-Rissanen y ajuste completo de los no dominados"
+    cubre_grilla = True
+
+    FRACCION_CONSERVADA = 0.25
+    MIN_CONSERVADOS = 30
+    MUESTRA_AUDITORIA = 10
+
+    def conservados(self):
+        fraccion = self.opciones.get('fraccion_conservada', self.FRACCION_CONSERVADA)
+        return min(len(self.espacio), max(self.MIN_CONSERVADOS, math.ceil(len(self.espacio) * fraccion)))
+
+    def auditados(self):
+        muestra = self.opciones.get('muestra_auditoria', self.MUESTRA_AUDITORIA)
+        return min(len(self.espacio) - self.conservados(), muestra)
+
+    def total_evaluaciones(self):
+        return self.conservados() + self.auditados()
+
+    @staticmethod
+    def seleccionar_sobrevivientes(resultados, cantidad, por_ranking=False):
+        """
+        Conservar los mejores candidatos según el prefiltro. Cada candidato se ordena por su
+        mejor posición entre el ranking de precisión (criterio del TOP 3) y el de score compuesto
+        (criterio del modelo final), para no perder a ninguno de los dos ganadores.
+        resultados: lista de (candidato, metrics del prefiltro) en el orden de la grilla
+        por_ranking: devolverlos del más prometedor al menos (búsqueda con presupuesto) en lugar
+                     de en el orden de la grilla
+        """
+        indices = range(len(resultados))
+        por_precision = sorted(indices, key=lambda i: -precision_de(resultados[i][1]))
+        por_composite = sorted(indices, key=lambda i: resultados[i][1]['composite_score'])
+
+        mejor_posicion = {}
+        for ranking in (por_precision, por_composite):
+            for posicion, i in enumerate(ranking):
+                mejor_posicion[i] = min(posicion, mejor_posicion.get(i, posicion))
+
+        elegidos = sorted(mejor_posicion, key=lambda i: (mejor_posicion[i], i))[:cantidad]
+        if not por_ranking:
+            # Mantener el orden de la grilla para aprovechar el arranque en caliente
+            elegidos.sort()
+        return [resultados[i][0] for i in elegidos]
+
+    def ejecutar(self, motor, registrar):
+        candidatos = self.espacio.candidatos()
+        inicio = time.perf_counter()
+        puntajes = self.opciones['funcion_prefiltro'](candidatos)
+        segundos = time.perf_counter() - inicio
+
+        resultados = [(candidato, puntajes[candidato]) for candidato in candidatos]
+        con_presupuesto = self.opciones.get('tiempo_restante') is not None
+        sobrevivientes = self.seleccionar_sobrevivientes(resultados, self.conservados(),
+                                                         por_ranking=con_presupuesto)
+        inviables = sum(1 for _, metrics in resultados if metrics['composite_score'] == float('inf'))
+        descartados = len(candidatos) - len(sobrevivientes)
+        print(f"Prefiltro: {len(candidatos)} combinaciones puntuadas en {segundos:.2f} s "
+              f"({segundos / len(candidatos) * 1000:.2f} ms/combinación, {inviables} sin muestra suficiente)")
+        print(f"Prefiltro: {len(sobrevivientes)} pasan al ajuste completo, {descartados} descartadas "
+              f"(poda {descartados / len(candidatos):.0%})")
+
+        if self.evaluar_lote(motor, sobrevivientes, registrar) is None:
+            return False
+
+        # Auditoría: ajuste completo de una muestra de descartados
+        conjunto = set(sobrevivientes)
+        rng = random.Random(self.opciones.get('semilla', 0))
+        auditoria = rng.sample([c for c in candidatos if c not in conjunto], self.auditados())
+        if auditoria:
+            print(f"Prefiltro: auditando {len(auditoria)} combinaciones descartadas con ajuste completo")
+            if self.evaluar_lote(motor, auditoria, registrar) is None:
+                return False
+
+        self.reportar_discrepancias(puntajes, sobrevivientes, auditoria)
+        return True
+
+    def reportar_discrepancias(self, puntajes, sobrevivientes, auditoria):
+        """Concordancia entre el ranking del prefiltro y el del ajuste completo"""
+        evaluados = [c for c in sobrevivientes + auditoria if c in self.evaluados]
+        if not evaluados:
+            return
+
+        correlacion = correlacion_rangos([precision_de(puntajes[c]) for c in evaluados],
+                                         [precision_de(self.evaluados[c]) for c in evaluados])
+        print(f"Prefiltro vs ajuste completo: correlación de rangos {correlacion:.3f} "
+              f"en {len(evaluados)} modelos")
+
+        ranking_prefiltro = sorted(puntajes, key=lambda c: -precision_de(puntajes[c]))
+        posicion = {candidato: i + 1 for i, candidato in enumerate(ranking_prefiltro)}
+        top = sorted(evaluados, key=lambda c: -precision_de(self.evaluados[c]))[:3]
+        for i, candidato in enumerate(top, 1):
+            print(f"  #{i} del ajuste completo: order={candidato[0]}, seasonal_order={candidato[1]} "
+                  f"(precisión {precision_de(self.evaluados[candidato]):.1f}%, "
+                  f"posición {posicion[candidato]} en el prefiltro)")
+
+        if auditoria:
+            umbral = precision_de(self.evaluados[top[-1]])
+            perdidos = [c for c in auditoria if c in self.evaluados
+                        and precision_de(self.evaluados[c]) >= umbral]
+            print(f"  Descartados auditados que habrían entrado al TOP 3: {len(perdidos)}/{len(auditoria)}")
+
+
+class BusquedaStepwise(EstrategiaBusqueda):
+    """
+    Búsqueda por vecindario (estilo Hyndman-Khandakar de auto_arima) pero maximizando
+    precision_final en validación en lugar de minimizar AIC. Opción max_evaluaciones
+    """
+
+    nombre = "stepwise"
+    descripcion = "búsqueda por vecindario desde modelos iniciales"
+
+    def total_evaluaciones(self):
+        return min(len(self.espacio), self.opciones.get('max_evaluaciones', 300))
+
+    def modelos_iniciales(self):
+        """Puntos de partida de auto_arima para cada combinación de diferencias (d, D)"""
+        r = self.espacio.rangos
+        iniciales = []
+        for d, D in product(r['d'], r['D']):
+            for p, q, P, Q in ((2, 2, 1, 1), (0, 0, 0, 0), (1, 0, 1, 0), (0, 1, 0, 1)):
+                candidato = ((p, d, q), (P, D, Q, self.espacio.s))
+                if self.espacio.contiene(candidato) and candidato not in iniciales:
+                    iniciales.append(candidato)
+        return iniciales
+
+    def ejecutar(self, motor, registrar):
+        presupuesto = self.total_evaluaciones()
+
+        resultados = self.evaluar_lote(motor, self.modelos_iniciales()[:presupuesto], registrar)
+        if resultados is None:
+            return False
+
+        actual = max(self.evaluados, key=lambda c: precision_de(self.evaluados[c]))
+        paso = 0
+
+        while len(self.evaluados) < presupuesto:
+            vecinos = [v for v in self.espacio.vecinos(actual) if v not in self.evaluados]
+            if not vecinos:
+                break
+
+            vecinos = vecinos[:presupuesto - len(self.evaluados)]
+            if self.evaluar_lote(motor, vecinos, registrar) is None:
+                return False
+
+            mejor_vecino = max(vecinos, key=lambda c: precision_de(self.evaluados[c]))
+            paso += 1
+            if precision_de(self.evaluados[mejor_vecino]) <= precision_de(self.evaluados[actual]):
+                print(f"Stepwise: sin mejora en el paso {paso}, búsqueda finalizada")
+                break
+
+            actual = mejor_vecino
+            print(f"Stepwise paso {paso}: nuevo mejor order={actual[0]}, seasonal_order={actual[1]} "
+                  f"(precisión {precision_de(self.evaluados[actual]):.1f}%)")
+
+        print(f"Stepwise: {len(self.evaluados)} modelos evaluados")
+        return True
+
+
+class BusquedaBayesiana(EstrategiaBusqueda):
+    """
+    Optimización secuencial basada en modelos (estimador de Parzen estilo TPE) sobre las
+    dimensiones enteras del espacio. Tras una muestra aleatoria inicial, cada lote propone los
+    candidatos con mayor cociente l(x)/g(x) entre la densidad de los mejores modelos y la del resto.
+    Opciones: max_evaluaciones, semilla
+    """
+
+    nombre = "bayesian"
+    descripcion = "optimización secuencial basada en modelos (TPE)"
+
+    GAMMA = 0.25             # fracción de modelos considerados "buenos"
+    MUESTRAS_PROPUESTA = 256  # candidatos muestreados de l(x) en cada lote
+    PESO_PREVIO = 1.0         # suavizado de las frecuencias por dimensión
+
+    def total_evaluaciones(self):
+        return min(len(self.espacio), self.opciones.get('max_evaluaciones', 200))
+
+    def _densidades(self, candidatos):
+        """Frecuencia suavizada de cada valor por dimensión"""
+        densidades = {}
+        for nombre in EspacioBusqueda.DIMENSIONES:
+            valores = self.espacio.rangos[nombre]
+            conteo = {v: self.PESO_PREVIO for v in valores}
+            for candidato in candidatos:
+                conteo[self.espacio.a_valores(candidato)[nombre]] += 1
+            total = sum(conteo.values())
+            densidades[nombre] = {v: c / total for v, c in conteo.items()}
+        return densidades
+
+    def proponer(self, rng, cantidad):
+        """Candidatos no evaluados con mayor cociente l(x)/g(x)"""
+        ordenados = sorted(self.evaluados, key=lambda c: -precision_de(self.evaluados[c]))
+        n_buenos = max(1, int(math.ceil(self.GAMMA * len(ordenados))))
+        l = self._densidades(ordenados[:n_buenos])
+        g = self._densidades(ordenados[n_buenos:])
+
+        puntuados = {}
+        for _ in range(self.MUESTRAS_PROPUESTA):
+            valores = {
+                nombre: rng.choices(list(l[nombre]), weights=list(l[nombre].values()))[0]
+                for nombre in EspacioBusqueda.DIMENSIONES
+            }
+            candidato = self.espacio.desde_valores(valores)
+            if candidato in self.evaluados or candidato in puntuados:
+                continue
+            puntuados[candidato] = math.prod(
+                l[nombre][valores[nombre]] / g[nombre][valores[nombre]]
+                for nombre in EspacioBusqueda.DIMENSIONES
+            )
+
+        propuestos = sorted(puntuados, key=lambda c: -puntuados[c])[:cantidad]
+        if len(propuestos) < cantidad:
+            # Región de l(x) agotada: completar con candidatos aleatorios
+            restantes = [c for c in self.espacio.candidatos()
+                         if c not in self.evaluados and c not in propuestos]
+            propuestos += rng.sample(restantes, min(len(restantes), cantidad - len(propuestos)))
+        return propuestos
+
+    def ejecutar(self, motor, registrar):
+        rng = random.Random(self.opciones.get('semilla', 0))
+        presupuesto = self.total_evaluaciones()
+        lote = max(4, motor.workers)
+
+        n_inicial = min(presupuesto, max(20, 2 * lote))
+        iniciales = rng.sample(self.espacio.candidatos(), n_inicial)
+        print(f"Búsqueda bayesiana: {n_inicial} modelos aleatorios iniciales, presupuesto {presupuesto}")
+        if self.evaluar_lote(motor, iniciales, registrar) is None:
+            return False
+
+        while len(self.evaluados) < presupuesto:
+            propuestos = self.proponer(rng, min(lote, presupuesto - len(self.evaluados)))
+            if not propuestos:
+                break
+            if self.evaluar_lote(motor, propuestos, registrar) is None:
+                return False
+
+        mejor = max(self.evaluados, key=lambda c: precision_de(self.evaluados[c]))
+        print(f"Búsqueda bayesiana: {len(self.evaluados)} modelos evaluados, mejor order={mejor[0]}, "
+              f"seasonal_order={mejor[1]} (precisión {precision_de(self.evaluados[mejor]):.1f}%)")
+        return True
+
+
+# Registro de estrategias disponibles (nombre de línea de comandos -> clase)
+ESTRATEGIAS = {}
+
+
+def registrar_estrategia(clase):
+    """Agregar una estrategia al registro (se puede usar como decorador)"""
+    ESTRATEGIAS[clase.nombre] = clase
+    return clase
+
+
+for _clase in (BusquedaExhaustiva, BusquedaPrefiltro, BusquedaStepwise, BusquedaBayesiana):
+    registrar_estrategia(_clase)
+
+
+def crear_estrategia(nombre, espacio, **opciones):
+    """Instanciar una estrategia registrada por su nombre"""
+    if nombre not in ESTRATEGIAS:
+        raise ValueError(f"Estrategia de búsqueda desconocida: {nombre}. "
+                         f"Disponibles: {', '.join(ESTRATEGIAS)}")
+    return ESTRATEGIAS[nombre](espacio, **opciones)
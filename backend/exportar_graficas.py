@@ -0,0 +1,186 @@
+# backend/exportar_graficas.py - Exportación desatendida de gráficas SAIDI (informes mensuales)
+"""
+Genera sin ventanas las gráficas de predicción (Modelo.py) y de validación (visual.py) de uno
+o muchos libros Excel SAIDI y las guarda en PNG, SVG o PDF. Cada gráfica es un trabajo de un
+pool de procesos con backend Agg: no hay pantalla, bucle de eventos ni maximización de
+ventanas, y el fallo de un libro queda registrado sin detener el resto.
+
+Uso:
+    python exportar_graficas.py --input circuitos/ --output-dir informe_octubre
+                                [--charts forecast validation] [--format png] [--workers 4]
+
+Los archivos se nombran <libro>_prediccion.<formato> y <libro>_validacion.<formato>.
+"""
+import warnings
+warnings.filterwarnings('ignore')
+
+# Backend sin ventana antes de importar pyplot (también en los workers del pool)
+import matplotlib
+matplotlib.use('Agg')
+
+import argparse
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+
+import Modelo
+import visual
+from graficas import FORMATOS_EXPORTACION
+from motor_busqueda import obtener_workers_por_defecto
+
+try:
+    from cache_ajustes import desactivar_cache
+    CACHE_AJUSTES_AVAILABLE = True
+except ImportError:
+    CACHE_AJUSTES_AVAILABLE = False
+
+EXTENSIONES_EXCEL = ('.xlsx', '.xlsm', '.xls')
+
+# Tipo de gráfica -> sufijo del archivo exportado
+GRAFICAS = {'forecast': 'prediccion', 'validation': 'validacion'}
+
+
+def listar_libros(ruta):
+    """Libro Excel indicado o todos los libros de una carpeta (sin temporales de Excel)"""
+    if not os.path.isdir(ruta):
+        return [ruta]
+    return sorted(
+        os.path.join(ruta, nombre) for nombre in os.listdir(ruta)
+        if nombre.lower().endswith(EXTENSIONES_EXCEL) and not nombre.startswith('~$')
+    )
+
+
+def _inicializar_worker(usar_cache):
+    if not usar_cache and CACHE_AJUSTES_AVAILABLE:
+        desactivar_cache()
+
+
+def exportar_grafica(libro, grafica, ruta_salida, order, seasonal_order):
+    """
+    Generar y exportar una gráfica en el proceso actual
+
+    Returns:
+        Dict con estado ('ok' o 'error'), ruta, segundos y el error si lo hubo
+    """
+    inicio = time.perf_counter()
+    resultado = {'libro': libro, 'grafica': grafica, 'ruta': ruta_salida}
+    # Los scripts imprimen su resumen en consola; en el pool solo interesa el error
+    salida = io.StringIO()
+    try:
+        with redirect_stdout(salida):
+            if grafica == 'forecast':
+                Modelo.analizar_saidi(libro, order, seasonal_order, salida=ruta_salida)
+            else:
+                visual.generar_grafica_validacion(libro, order, seasonal_order, salida=ruta_salida)
+        resultado['estado'] = 'ok'
+    except SystemExit:
+        # Modelo.py y visual.py terminan con sys.exit(1) tras imprimir "ERROR: ..."
+        errores = [linea for linea in salida.getvalue().splitlines() if linea.startswith('ERROR')]
+        resultado['estado'] = 'error'
+        resultado['error'] = errores[-1].split(':', 1)[-1].strip() if errores else 'terminó sin exportar la gráfica'
+    except Exception as e:
+        resultado['estado'] = 'error'
+        resultado['error'] = f"{type(e).__name__}: {e}"
+    resultado['segundos'] = round(time.perf_counter() - inicio, 2)
+    return resultado
+
+
+def exportar_lote(ruta_entrada, carpeta_salida, graficas=('forecast', 'validation'), formato='png',
+                  order=(4, 0, 0), seasonal_order=(1, 0, 0, 8), workers=None, usar_cache=True):
+    """
+    Exportar las gráficas de todos los libros en un pool de procesos
+
+    Returns:
+        Lista de resultados por gráfica en el orden de entrada (vacía si no hay libros)
+    """
+    libros = listar_libros(ruta_entrada)
+    if not libros:
+        print(f"No se encontraron libros Excel en {ruta_entrada}")
+        return []
+
+    trabajos = []
+    for libro in libros:
+        nombre = os.path.splitext(os.path.basename(libro))[0]
+        for grafica in graficas:
+            ruta_salida = os.path.join(carpeta_salida, f"{nombre}_{GRAFICAS[grafica]}.{formato}")
+            trabajos.append((libro, grafica, ruta_salida))
+
+    workers = max(1, min(workers or obtener_workers_por_defecto(), len(trabajos)))
+    os.makedirs(carpeta_salida, exist_ok=True)
+    print(f"Exportación: {len(libros)} libros | {len(trabajos)} gráficas {formato.upper()} | {workers} workers "
+          f"| SARIMAX{order}x{seasonal_order}")
+    print("=" * 80)
+
+    inicio = time.perf_counter()
+    resultados = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_inicializar_worker,
+                             initargs=(usar_cache,)) as executor:
+        pendientes = {
+            executor.submit(exportar_grafica, libro, grafica, ruta_salida, order, seasonal_order): posicion
+            for posicion, (libro, grafica, ruta_salida) in enumerate(trabajos)
+        }
+        for futuro in as_completed(pendientes):
+            posicion = pendientes[futuro]
+            libro, grafica, ruta_salida = trabajos[posicion]
+            try:
+                resultado = futuro.result()
+            except Exception as e:
+                # Worker finalizado abruptamente: la gráfica se registra como fallida
+                resultado = {'libro': libro, 'grafica': grafica, 'ruta': ruta_salida, 'estado': 'error',
+                             'error': f"{type(e).__name__}: {e}", 'segundos': 0}
+            resultados[posicion] = resultado
+
+            detalle = os.path.basename(ruta_salida) if resultado['estado'] == 'ok' else f"ERROR {resultado['error']}"
+            print(f"[{len(resultados):4d}/{len(trabajos)}] {os.path.basename(libro)} ({GRAFICAS[grafica]}): "
+                  f"{detalle} ({resultado['segundos']:.1f} s)")
+
+    segundos = time.perf_counter() - inicio
+    ordenados = [resultados[posicion] for posicion in sorted(resultados)]
+    exitosas = sum(1 for r in ordenados if r['estado'] == 'ok')
+    print("=" * 80)
+    print(f"Gráficas exportadas: {exitosas} de {len(trabajos)} | con error {len(trabajos) - exitosas}")
+    print(f"Tiempo total: {segundos:.1f} s | rendimiento {len(ordenados) / max(segundos, 1e-9) * 60:.1f} "
+          f"gráficas/minuto")
+    print(f"Carpeta de salida: {os.path.abspath(carpeta_salida)}")
+    return ordenados
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Exportación de gráficas SAIDI sin ventanas')
+    parser.add_argument('--input', required=True, help='Libro Excel SAIDI o carpeta de libros')
+    parser.add_argument('--output-dir', default=None,
+                       help='Carpeta de las gráficas exportadas. Default: graficas junto a la entrada')
+    parser.add_argument('--charts', nargs='+', choices=list(GRAFICAS), default=list(GRAFICAS),
+                       help='Gráficas a exportar por libro: forecast (Modelo.py) y/o validation (visual.py). '
+                            'Default: ambas')
+    parser.add_argument('--format', choices=[extension[1:] for extension in FORMATOS_EXPORTACION], default='png',
+                       help='Formato de las gráficas. Default: png')
+    parser.add_argument('--order', nargs=3, type=int, default=[4, 0, 0],
+                       help='Parámetros order (p d q) para SARIMAX. Default: 4 0 0')
+    parser.add_argument('--seasonal-order', nargs=4, type=int, default=[1, 0, 0, 8],
+                       help='Parámetros seasonal_order (P D Q s) para SARIMAX. Default: 1 0 0 8')
+    parser.add_argument('--workers', type=int, default=None,
+                       help=f'Gráficas generadas en paralelo. Default: núcleos disponibles ({obtener_workers_por_defecto()})')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='No usar la cache persistente de ajustes SARIMAX')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"ERROR: La entrada {args.input} no existe.")
+        sys.exit(1)
+
+    carpeta_salida = args.output_dir or os.path.join(
+        os.path.dirname(os.path.abspath(args.input.rstrip(os.sep))), 'graficas')
+
+    resultados = exportar_lote(args.input, carpeta_salida, graficas=args.charts, formato=args.format,
+                               order=tuple(args.order), seasonal_order=tuple(args.seasonal_order),
+                               workers=args.workers, usar_cache=not args.no_cache)
+    if not resultados or all(r['estado'] == 'error' for r in resultados):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# backend/graficas.py - Ventana interactiva o exportación sin ventana de las gráficas de Modelo.py y visual.py
+import os
+import sys
+import matplotlib.pyplot as plt
+
+# Formatos que admite --output (el formato se deduce de la extensión)
+FORMATOS_EXPORTACION = ('.png', '.svg', '.pdf')
+
+# Resolución de las imágenes exportadas (la figura es de 16x10 pulgadas)
+DPI_EXPORTACION = 120
+
+
+def validar_ruta_salida(ruta):
+    """Comprobar la extensión de una ruta de exportación (ValueError si no es PNG, SVG o PDF)"""
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension not in FORMATOS_EXPORTACION:
+        raise ValueError(f"Formato de salida no admitido: '{extension or ruta}'. "
+                         f"Use {', '.join(FORMATOS_EXPORTACION)}")
+    return ruta
+
+
+def usar_backend_sin_ventana():
+    """Cambiar a Agg: las figuras se dibujan en memoria, sin pantalla ni loop de eventos"""
+    plt.switch_backend('Agg')
+
+
+def maximizar_ventana(fig):
+    """Forzar pantalla completa de manera segura sin errores (solo con backend interactivo)"""
+    mng = fig.canvas.manager
+    try:
+        # Para TkAgg (Windows/Linux) - más común y estable
+        if hasattr(mng, 'window') and hasattr(mng.window, 'state'):
+            mng.window.state('zoomed')
+
+            # Intentar deshabilitar redimensionamiento de manera segura
+            try:
+                mng.window.resizable(False, False)
+            except:
+                print("Info: La ventana se maximizó pero puede ser redimensionable")
+
+        # Para Qt backends (solo si están disponibles)
+        elif hasattr(mng, 'window') and hasattr(mng.window, 'showMaximized'):
+            mng.window.showMaximized()
+
+            # Fijar tamaño solo si Qt está cargado
+            try:
+                if 'PyQt5' in sys.modules or 'PyQt4' in sys.modules or 'PySide' in sys.modules:
+                    mng.window.setFixedSize(mng.window.size())
+            except:
+                pass
+
+        # Para otros backends
+        else:
+            if hasattr(mng, 'full_screen_toggle'):
+                mng.full_screen_toggle()
+
+    except Exception as e:
+        print(f"Info: Usando configuración de ventana estándar: {e}")
+
+
+def mantener_maximizada(fig):
+    """Volver a maximizar la ventana si el usuario la restaura"""
+    mng = fig.canvas.manager
+
+    def on_resize(event):
+        try:
+            if hasattr(mng, 'window') and hasattr(mng.window, 'state'):
+                current_state = str(mng.window.state()).lower()
+                if 'zoom' not in current_state and 'normal' in current_state:
+                    mng.window.state('zoomed')
+        except:
+            pass
+
+    # Conectar el evento de redimensionamiento de manera segura
+    try:
+        fig.canvas.mpl_connect('resize_event', on_resize)
+    except:
+        pass
+
+
+def exportar_figura(fig, ruta, dpi=DPI_EXPORTACION):
+    """Guardar la figura en PNG/SVG/PDF y liberarla"""
+    carpeta = os.path.dirname(os.path.abspath(ruta))
+    os.makedirs(carpeta, exist_ok=True)
+    # bbox 'tight' incluye la leyenda y el texto inferior, colocados fuera de los ejes
+    fig.savefig(ruta, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    print(f"Gráfica exportada: {ruta}")
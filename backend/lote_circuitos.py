@@ -0,0 +1,412 @@
+# backend/lote_circuitos.py - Pronóstico por lotes de muchos circuitos SAIDI
+"""
+Búsqueda de parámetros y pronóstico de muchas series SAIDI (una por circuito) en una sola ejecución
+La entrada es un libro Excel o una carpeta de libros; cada columna numérica de cada hoja
+(con la fecha en la columna "Fecha" o en la primera) es un circuito. Los circuitos se reparten
+en un pool de procesos, cada uno con su búsqueda secuencial, y los resultados se escriben en un
+único archivo consolidado (hoja Resumen y hoja Pronosticos). El fallo de un circuito queda
+registrado en el resumen sin detener el lote.
+
+Uso:
+    python lote_circuitos.py --input circuitos.xlsx [--output resultados_lote.xlsx] [--workers 4]
+                             [--strategy stepwise] [--max-evals 60] [--progress progreso.json]
+                             [--cancel-stdin]
+"""
+import warnings
+warnings.filterwarnings('ignore')
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from functools import partial
+import numpy as np
+import pandas as pd
+
+import cache_ajustes
+from motor_busqueda import MotorBusquedaParalela, obtener_workers_por_defecto
+from estrategias_busqueda import ESTRATEGIAS, ESPACIOS_BUSQUEDA, crear_estrategia
+from perfiles_ajuste import PERFILES_AJUSTE
+from prefiltro_arma import puntuar_candidatos
+from datos_saidi import leer_hojas_excel
+from cancelacion import (obtener_evento, instalar_evento, cancelacion_solicitada, aviso_cancelacion,
+                         vigilar_cancelacion, CancelacionSolicitada)
+from canal_progreso import obtener_publicador
+from motor_autorregresivo import es_autorregresivo, evaluar_autorregresivos
+from Parametro import (evaluar_modelo_completo, metricas_modelo_fallido,
+                       ajustar_modelo_final, update_progress, check_cancellation,
+                       cleanup_cancellation_files, formatear_duracion)
+
+EXTENSIONES_EXCEL = ('.xlsx', '.xlsm', '.xls')
+
+# Columnas de referencia de los libros SAIDI que no son circuitos
+COLUMNAS_AUXILIARES = ('Esperados', 'Estandar de calidad')
+
+# Observaciones mínimas para buscar parámetros (dos ciclos estacionales)
+MIN_OBSERVACIONES = 24
+
+# Meses pronosticados cuando una serie no tiene meses faltantes
+HORIZONTE_POR_DEFECTO = 12
+
+COLUMNAS_RESUMEN = ['circuito', 'estado', 'order', 'seasonal_order', 'precision_final', 'rmse', 'mape',
+                    'r2_score', 'aic', 'observaciones', 'meses_pronosticados', 'modelos_evaluados',
+                    'segundos', 'error']
+
+
+def series_de_hoja(df):
+    """
+    Series de circuitos de una hoja: columnas numéricas indexadas por la fecha
+
+    Returns:
+        Dict {columna: serie} (vacío si la hoja no tiene una columna de fechas)
+    """
+    if df.empty:
+        return {}
+    columna_fecha = "Fecha" if "Fecha" in df.columns else df.columns[0]
+    fechas = pd.to_datetime(df[columna_fecha], errors='coerce')
+    if fechas.isna().all():
+        return {}
+
+    df = df[fechas.notna()].set_index(fechas[fechas.notna()])
+    series = {}
+    for columna in df.columns:
+        if columna == columna_fecha or columna in COLUMNAS_AUXILIARES:
+            continue
+        valores = pd.to_numeric(df[columna], errors='coerce')
+        if valores.notna().any():
+            series[str(columna)] = valores.astype(float).sort_index()
+    return series
+
+
+def descubrir_series(ruta):
+    """
+    Circuitos de un libro Excel o de todos los libros de una carpeta
+
+    Returns:
+        Lista de (nombre, serie). El nombre incluye el libro, la hoja y la columna
+        solo cuando hace falta para distinguir los circuitos.
+    """
+    if os.path.isdir(ruta):
+        archivos = sorted(
+            os.path.join(ruta, nombre) for nombre in os.listdir(ruta)
+            if nombre.lower().endswith(EXTENSIONES_EXCEL) and not nombre.startswith('~$')
+        )
+    else:
+        archivos = [ruta]
+
+    circuitos = []
+    for archivo in archivos:
+        try:
+            hojas = leer_hojas_excel(archivo)
+        except Exception as e:
+            print(f"No se pudo leer {archivo}: {e}")
+            continue
+
+        series_por_hoja = {}
+        for hoja, df in hojas.items():
+            series_por_hoja[hoja] = series_de_hoja(df)
+            if not series_por_hoja[hoja]:
+                print(f"Hoja sin series con fechas omitida: {os.path.basename(archivo)} / {hoja}")
+        hojas_con_series = sum(1 for series in series_por_hoja.values() if series)
+
+        for hoja, series in series_por_hoja.items():
+            for columna, serie in series.items():
+                partes = []
+                if os.path.isdir(ruta):
+                    partes.append(os.path.splitext(os.path.basename(archivo))[0])
+                if hojas_con_series > 1:
+                    partes.append(str(hoja))
+                if len(series) > 1 or not partes:
+                    partes.append(columna)
+                circuitos.append(("/".join(partes), serie))
+    return circuitos
+
+
+def _buscar_y_pronosticar(serie, estrategia, espacio, max_evaluaciones, validacion, perfil_busqueda,
+                          fraccion_prefiltro, motor_ar, horizonte):
+    """Búsqueda de parámetros, ajuste final y pronóstico de una serie (en el proceso actual)"""
+    historico = serie[serie.notna()]
+    if len(historico) < MIN_OBSERVACIONES:
+        raise ValueError(f"solo {len(historico)} observaciones (mínimo {MIN_OBSERVACIONES})")
+    faltantes = serie.index[serie.isna() & (serie.index > historico.index[0])]
+
+    espacio_busqueda = ESPACIOS_BUSQUEDA[espacio]
+    opciones_estrategia = {
+        'funcion_prefiltro': partial(puntuar_candidatos, historico)
+    }
+    if max_evaluaciones:
+        opciones_estrategia['max_evaluaciones'] = max_evaluaciones
+    if fraccion_prefiltro:
+        opciones_estrategia['fraccion_conservada'] = fraccion_prefiltro
+    estrategia_busqueda = crear_estrategia(estrategia, espacio_busqueda, **opciones_estrategia)
+
+    evaluados = {}
+
+    def registrar(order, seasonal_order, metrics, error):
+        if error is not None or metrics is None:
+            metrics = metricas_modelo_fallido()
+        evaluados[(order, seasonal_order)] = metrics
+        return metrics
+
+    if motor_ar == 'levinson' and estrategia_busqueda.cubre_grilla:
+        autorregresivos = [c for c in espacio_busqueda.candidatos() if es_autorregresivo(c)]
+        resultados_ar = evaluar_autorregresivos(historico, autorregresivos, validacion)
+        evaluados.update(resultados_ar)
+        estrategia_busqueda.precargar(resultados_ar)
+
+    # Un solo proceso por circuito: el paralelismo del lote es entre circuitos
+    with MotorBusquedaParalela(historico, partial(evaluar_modelo_completo, validacion=validacion,
+                                                  perfil=perfil_busqueda), workers=1,
+                               verificar_cancelacion=cancelacion_solicitada) as motor:
+        # Una búsqueda cancelada no llega al ajuste final con el ranking incompleto
+        if not estrategia_busqueda.ejecutar(motor, registrar):
+            raise CancelacionSolicitada()
+
+    ranking = sorted((c for c in evaluados if np.isfinite(evaluados[c]['composite_score'])),
+                     key=lambda c: evaluados[c]['composite_score'])
+    results, params = ajustar_modelo_final(historico, ranking)
+    if results is None:
+        raise RuntimeError("ningún modelo del ranking se pudo ajustar sobre todo el histórico")
+
+    if len(faltantes):
+        pred_mean = results.get_prediction(start=faltantes[0], end=faltantes[-1]).predicted_mean
+        fechas = faltantes if len(pred_mean) == len(faltantes) else pred_mean.index
+    else:
+        pred_mean = results.forecast(steps=horizonte)
+        fechas = pd.date_range(historico.index[-1] + pd.DateOffset(months=1), periods=horizonte, freq='MS')
+
+    metrics = evaluados[params]
+    return {
+        'order': str(params[0]),
+        'seasonal_order': str(params[1]),
+        'precision_final': metrics['precision_final'],
+        'rmse': metrics['rmse'],
+        'mape': metrics['mape'],
+        'r2_score': metrics['r2_score'],
+        'aic': results.aic,
+        'observaciones': len(historico),
+        'meses_pronosticados': len(pred_mean),
+        'modelos_evaluados': len(evaluados),
+        'pronostico': list(zip(fechas, np.asarray(pred_mean, dtype=float)))
+    }
+
+
+def pronosticar_circuito(nombre, serie, opciones):
+    """
+    Tarea del pool: un circuito completo. Nunca lanza excepciones; un fallo queda
+    como estado 'error' con su mensaje para no detener el lote y una búsqueda
+    interrumpida por la cancelación como estado 'cancelado'
+    """
+    inicio = time.perf_counter()
+    try:
+        # La salida detallada de la búsqueda de cada circuito no se mezcla con la del lote
+        with contextlib.redirect_stdout(io.StringIO()):
+            resultado = _buscar_y_pronosticar(serie, **opciones)
+        resultado['estado'] = 'ok'
+    except InterruptedError:
+        resultado = {'estado': 'cancelado'}
+    except Exception as e:
+        resultado = {'estado': 'error', 'error': f"{type(e).__name__}: {e}"}
+    resultado['circuito'] = nombre
+    resultado['segundos'] = round(time.perf_counter() - inicio, 2)
+    return resultado
+
+
+def escribir_resultados(resultados, ruta_salida):
+    """
+    Archivo consolidado: resumen por circuito y pronósticos (una columna por circuito)
+    Con extensión .csv se escriben dos archivos: el resumen y <nombre>_pronosticos.csv
+    """
+    resumen = pd.DataFrame([{columna: r.get(columna) for columna in COLUMNAS_RESUMEN} for r in resultados],
+                           columns=COLUMNAS_RESUMEN)
+    pronosticos = pd.DataFrame({
+        r['circuito']: pd.Series(dict(r['pronostico'])) for r in resultados if r['estado'] == 'ok'
+    })
+    pronosticos.index.name = 'Fecha'
+
+    directorio = os.path.dirname(os.path.abspath(ruta_salida))
+    os.makedirs(directorio, exist_ok=True)
+    if ruta_salida.lower().endswith('.csv'):
+        resumen.to_csv(ruta_salida, index=False)
+        pronosticos.to_csv(os.path.splitext(ruta_salida)[0] + '_pronosticos.csv')
+    else:
+        with pd.ExcelWriter(ruta_salida) as writer:
+            resumen.to_excel(writer, sheet_name='Resumen', index=False)
+            pronosticos.to_excel(writer, sheet_name='Pronosticos')
+
+
+def ejecutar_lote(ruta_entrada, ruta_salida, workers=None, progress_file=None, **opciones):
+    """
+    Procesar todos los circuitos de la entrada en un pool de procesos
+
+    Returns:
+        Lista de resultados por circuito en el orden de la entrada (vacía si no hay circuitos)
+    """
+    circuitos = descubrir_series(ruta_entrada)
+    if not circuitos:
+        print(f"No se encontraron series de circuitos en {ruta_entrada}")
+        return []
+
+    workers = max(1, min(workers or obtener_workers_por_defecto(), len(circuitos)))
+    print(f"Lote: {len(circuitos)} circuitos | {workers} workers | estrategia {opciones['estrategia']} "
+          f"| espacio {opciones['espacio']} | validación {opciones['validacion']}")
+    print("=" * 80)
+    if progress_file:
+        update_progress(progress_file, 0, f"Procesando {len(circuitos)} circuitos...", "")
+
+    inicio = time.perf_counter()
+    resultados = {}
+    cancelado = False
+
+    # Los workers comparten el evento de cancelación: un circuito en curso abandona su ajuste
+    # en la siguiente iteración del optimizador en lugar de terminar su búsqueda completa
+    aviso = aviso_cancelacion()
+    with ProcessPoolExecutor(max_workers=workers, initializer=instalar_evento,
+                             initargs=(obtener_evento(),)) as executor:
+        pendientes = {
+            executor.submit(pronosticar_circuito, nombre, serie, opciones): posicion
+            for posicion, (nombre, serie) in enumerate(circuitos)
+        }
+        while pendientes:
+            completados, _ = wait([*pendientes, aviso], return_when=FIRST_COMPLETED)
+            for futuro in completados:
+                if futuro is aviso:
+                    continue
+                posicion = pendientes.pop(futuro)
+                if cancelacion_solicitada():
+                    # Circuito interrumpido por la cancelación: no se registra como fallido
+                    cancelado = True
+                    continue
+                try:
+                    resultado = futuro.result()
+                except Exception as e:
+                    # Worker finalizado abruptamente: el circuito se registra como fallido
+                    resultado = {'circuito': circuitos[posicion][0], 'estado': 'error',
+                                 'error': f"{type(e).__name__}: {e}"}
+                if resultado['estado'] == 'cancelado':
+                    # La búsqueda del circuito informó la cancelación: se detiene el lote
+                    cancelado = True
+                    continue
+                resultados[posicion] = resultado
+
+                hechos = len(resultados)
+                if resultado['estado'] == 'ok':
+                    detalle = (f"SARIMAX{resultado['order']}x{resultado['seasonal_order']} "
+                               f"precisión {resultado['precision_final']:.1f}%")
+                else:
+                    detalle = f"ERROR {resultado['error']}"
+                print(f"[{hechos:4d}/{len(circuitos)}] {resultado['circuito']}: {detalle} "
+                      f"({resultado.get('segundos', 0):.1f} s)")
+
+                if progress_file and not update_progress(progress_file, hechos / len(circuitos) * 100,
+                                                         f"Circuitos procesados: {hechos} de {len(circuitos)}",
+                                                         resultado['circuito'], intermedio=True):
+                    cancelado = True
+
+            if cancelado or check_cancellation(progress_file):
+                # Los circuitos en curso se interrumpen; los pendientes se descartan
+                cancelado = True
+                print("Cancelación detectada - se guardan los circuitos ya procesados")
+                executor.shutdown(wait=True, cancel_futures=True)
+                break
+
+    segundos = time.perf_counter() - inicio
+    ordenados = [resultados[posicion] for posicion in sorted(resultados)]
+    escribir_resultados(ordenados, ruta_salida)
+
+    exitosos = sum(1 for r in ordenados if r['estado'] == 'ok')
+    print("=" * 80)
+    print(f"Circuitos procesados: {len(ordenados)} de {len(circuitos)} | correctos {exitosos} | "
+          f"con error {len(ordenados) - exitosos}")
+    print(f"Tiempo total: {formatear_duracion(segundos)} | "
+          f"rendimiento {len(ordenados) / max(segundos, 1e-9) * 60:.1f} circuitos/minuto")
+    print(f"Resultados consolidados: {os.path.abspath(ruta_salida)}")
+    if cancelado:
+        if progress_file and os.path.dirname(progress_file):
+            # update_progress ya no publica una vez cancelado
+            try:
+                obtener_publicador(progress_file).publicar({
+                    'progress': len(ordenados) / len(circuitos) * 100,
+                    'status': f"Lote cancelado: {len(ordenados)} de {len(circuitos)} circuitos guardados",
+                    'current_model': "",
+                    'cancelled': True
+                })
+            except Exception as e:
+                print(f"Error actualizando progreso: {e}")
+    elif progress_file:
+        update_progress(progress_file, 100,
+                        f"Lote completado: {exitosos} de {len(circuitos)} circuitos pronosticados", "")
+    return ordenados
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pronóstico SAIDI por lotes de circuitos')
+    parser.add_argument('--input', required=True,
+                       help='Libro Excel o carpeta de libros; cada columna numérica de cada hoja es un circuito')
+    parser.add_argument('--output', default=None,
+                       help='Archivo consolidado .xlsx (hojas Resumen y Pronosticos) o .csv. '
+                            'Default: resultados_lote.xlsx junto a la entrada')
+    parser.add_argument('--workers', type=int, default=None,
+                       help=f'Circuitos procesados en paralelo. Default: núcleos disponibles ({obtener_workers_por_defecto()})')
+    parser.add_argument('--strategy', choices=list(ESTRATEGIAS), default='stepwise',
+                       help='Estrategia de búsqueda de cada circuito (ver Parametro.py). Default: stepwise')
+    parser.add_argument('--search-space', choices=list(ESPACIOS_BUSQUEDA), default='standard',
+                       help='Rangos de parámetros. Default: standard')
+    parser.add_argument('--max-evals', type=int, default=60,
+                       help='Máximo de modelos por circuito con stepwise/bayesian. Default: 60')
+    parser.add_argument('--validation', choices=['holdout', 'rolling'], default='holdout',
+                       help='Validación de cada modelo. Default: holdout')
+    parser.add_argument('--search-profile', choices=list(PERFILES_AJUSTE), default='fast',
+                       help='Perfil de ajuste de la búsqueda; el modelo final de cada circuito se ajusta '
+                            'siempre con accurate. Default: fast')
+    parser.add_argument('--prescreen-keep', type=float, default=None,
+                       help='Fracción de la grilla que conserva el prefiltro de prescreen. Default: 0.25')
+    parser.add_argument('--ar-engine', choices=['sarimax', 'levinson'], default='sarimax',
+                       help='Motor de los candidatos AR puros con exhaustive o prescreen. Default: sarimax')
+    parser.add_argument('--horizon', type=int, default=HORIZONTE_POR_DEFECTO,
+                       help=f'Meses a pronosticar en las series sin meses faltantes. Default: {HORIZONTE_POR_DEFECTO}')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='No usar la cache persistente de ajustes SARIMAX')
+    parser.add_argument('--progress', type=str, help='Archivo de progreso para comunicación con frontend')
+    parser.add_argument('--cancel-stdin', action='store_true',
+                       help='Cancelar al recibir una línea (o el cierre) por la entrada estándar, '
+                            'en lugar de vigilar el archivo de cancelación. Lo usa la interfaz')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"Error: {args.input} no existe.")
+        sys.exit(1)
+    if args.horizon < 1:
+        parser.error("--horizon debe ser mayor que 0")
+    if args.prescreen_keep is not None and not 0 < args.prescreen_keep <= 1:
+        parser.error("--prescreen-keep debe estar entre 0 y 1")
+
+    if args.no_cache:
+        cache_ajustes.desactivar_cache()
+
+    ruta_salida = args.output
+    if ruta_salida is None:
+        base = args.input if os.path.isdir(args.input) else os.path.dirname(os.path.abspath(args.input))
+        ruta_salida = os.path.join(base, 'resultados_lote.xlsx')
+
+    cleanup_cancellation_files(args.progress)
+    vigilar_cancelacion(args.progress, usar_entrada=args.cancel_stdin)
+    resultados = ejecutar_lote(
+        args.input, ruta_salida, workers=args.workers, progress_file=args.progress,
+        estrategia=args.strategy, espacio=args.search_space, max_evaluaciones=args.max_evals,
+        validacion=args.validation, perfil_busqueda=args.search_profile,
+        fraccion_prefiltro=args.prescreen_keep,
+        motor_ar=args.ar_engine, horizonte=args.horizon
+    )
+    if cancelacion_solicitada():
+        # Mismo código que Parametro.py: la interfaz distingue la cancelación de un fallo
+        sys.exit(130)
+    if not resultados:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
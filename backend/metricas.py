@@ -0,0 +1,75 @@
+# backend/metricas.py - Métricas de validación compartidas por Parametro, Modelo y visual
+"""
+Cálculo vectorizado de RMSE, MAE, MAPE, R² y precisión compuesta
+Recibe una matriz de pronósticos (candidatos x horizonte) y el vector de valores reales,
+y calcula todas las métricas en una sola pasada de NumPy
+"""
+import numpy as np
+
+EPSILON = 1e-8
+
+# Ponderación de la precisión final: MAPE, R² y RMSE
+PESO_MAPE = 0.4
+PESO_R2 = 0.4
+PESO_RMSE = 0.2
+
+
+def calcular_metricas_lote(reales, pronosticos):
+    """
+    Métricas de validación de varios candidatos a la vez
+
+    Args:
+        reales: Vector de valores reales (horizonte,)
+        pronosticos: Matriz de pronósticos (candidatos, horizonte) o vector (horizonte,)
+
+    Returns:
+        Dict de arrays (candidatos,) con rmse, mae, mape, r2_score, precision_mape,
+        precision_r2, precision_rmse y precision_final. Un candidato con pronósticos
+        no finitos queda con métricas NaN.
+    """
+    reales = np.asarray(reales, dtype=np.float64)
+    pronosticos = np.atleast_2d(np.asarray(pronosticos, dtype=np.float64))
+
+    errores = reales[None, :] - pronosticos
+    rmse = np.sqrt(np.mean(errores ** 2, axis=1))
+    mae = np.mean(np.abs(errores), axis=1)
+    mape = np.mean(np.abs(errores / (reales + EPSILON)), axis=1) * 100
+
+    # El denominador de R² y la media real son comunes a todos los candidatos
+    media_real = np.mean(reales)
+    ss_tot = np.sum((reales - media_real) ** 2)
+    ss_res = np.sum(errores ** 2, axis=1)
+    r2_score = 1 - (ss_res / (ss_tot + EPSILON))
+
+    precision_mape = np.maximum(0, 100 - mape)
+    precision_r2 = np.maximum(0, r2_score * 100)
+    precision_rmse = np.maximum(0, (1 - rmse / media_real) * 100)
+
+    precision_final = precision_mape * PESO_MAPE + precision_r2 * PESO_R2 + precision_rmse * PESO_RMSE
+    precision_final = np.clip(precision_final, 0, 100)
+
+    return {
+        'rmse': rmse,
+        'mae': mae,
+        'mape': mape,
+        'r2_score': r2_score,
+        'precision_mape': precision_mape,
+        'precision_r2': precision_r2,
+        'precision_rmse': precision_rmse,
+        'precision_final': precision_final
+    }
+
+
+def calcular_metricas_pronostico(reales, pronostico):
+    """
+    Métricas de un único pronóstico como floats de Python
+
+    Raises:
+        ValueError: Si el pronóstico contiene valores no finitos (modelo divergente)
+    """
+    pronostico = np.asarray(pronostico, dtype=np.float64)
+    if not np.all(np.isfinite(pronostico)):
+        raise ValueError("El pronóstico contiene valores no finitos")
+
+    lote = calcular_metricas_lote(reales, pronostico)
+    return {nombre: float(valores[0]) for nombre, valores in lote.items()}
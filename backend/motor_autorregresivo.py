@@ -0,0 +1,239 @@
+# backend/motor_autorregresivo.py - Motor Levinson-Durbin para los candidatos AR puros
+"""
+Evaluación conjunta de todos los candidatos autorregresivos puros (q = 0, Q = 0) de la grilla
+Para cada corte (d, D, s) de la serie de entrenamiento diferenciada:
+1. Una recursión de Levinson-Durbin con rezagos s, 2s, ... da los coeficientes estacionales
+   de todos los órdenes P a la vez
+2. Para cada P, la serie filtrada por el polinomio estacional pasa por una segunda recursión
+   que da los coeficientes de todos los órdenes p a la vez (con P > 0 se alternan ambas
+   partes unas pocas veces para acercarse a la estimación conjunta)
+3. Los pronósticos de validación de todos los (p, P) se calculan juntos, como matrices
+Los coeficientes de reflexión son los de Burg (menos sesgados que los de Yule-Walker en
+series cortas y casi no estacionarias). No son de máxima verosimilitud y el AIC/BIC es el de
+la verosimilitud gaussiana condicional; el modelo final se sigue ajustando con SARIMAX.
+"""
+import numpy as np
+from statsmodels.tsa.statespace.tools import diff
+
+from cortes_grilla import preparar_corte
+from metricas import calcular_metricas_lote
+from prefiltro_arma import polinomio_diferencias, integrar_pronostico
+from validacion_origen_movil import HORIZONTE_POR_DEFECTO
+
+# Alternancias entre la parte estacional y la no estacional de cada modelo con P > 0
+REFINAMIENTOS_ESTACIONALES = 3
+
+
+def es_autorregresivo(candidato):
+    """Candidato sin términos de media móvil (q = 0 y Q = 0)"""
+    (_, _, q), (_, _, Q, _) = candidato
+    return q == 0 and Q == 0
+
+
+def levinson_burg(x, orden_max, paso=1):
+    """
+    Coeficientes de todos los AR(0..orden_max) en una sola recursión de Levinson-Durbin, con los
+    coeficientes de reflexión de Burg (errores hacia adelante y hacia atrás de cada orden)
+    paso: separación de los rezagos (s para un AR puramente estacional en B^s)
+
+    Returns:
+        Tupla (coeficientes, varianzas): fila k de coeficientes (orden_max + 1, orden_max) con
+        los k coeficientes del AR(k), y varianza de innovación de cada orden. Los órdenes que
+        la muestra no alcanza a estimar quedan en NaN.
+    """
+    n = len(x)
+    coeficientes = np.full((orden_max + 1, orden_max), np.nan)
+    coeficientes[0] = 0.0
+    varianzas = np.full(orden_max + 1, np.nan)
+    varianzas[0] = x @ x / n
+
+    adelante = np.array(x, dtype=np.float64)
+    atras = adelante.copy()
+    phi = np.zeros(0)
+
+    for k in range(1, orden_max + 1):
+        if k * paso >= n:
+            break
+        f = adelante[k * paso:]
+        b = atras[(k - 1) * paso:n - paso]
+        denominador = f @ f + b @ b
+        if not denominador > 0:
+            break
+        reflexion = 2 * (f @ b) / denominador
+        adelante[k * paso:], atras[k * paso:] = f - reflexion * b, b - reflexion * f
+
+        phi = np.concatenate([phi - reflexion * phi[::-1], [reflexion]])
+        coeficientes[k] = 0.0
+        coeficientes[k, :k] = phi
+        varianzas[k] = varianzas[k - 1] * (1 - reflexion ** 2)
+
+    return coeficientes, varianzas
+
+
+def filtrar_ar(x, coeficientes, paso=1):
+    """Residuos x_t - suma c_j x_{t - j*paso} (se pierden los primeros len(coeficientes)*paso valores)"""
+    k = len(coeficientes)
+    n = len(x)
+    return x[k * paso:] - sum(coeficientes[j - 1] * x[k * paso - j * paso:n - j * paso] for j in range(1, k + 1))
+
+
+def coeficientes_rezagos(phi, Phi, s):
+    """Coeficientes por rezago (1..p+P*s) de w_t = suma c_k w_{t-k} + e_t para (1 - phi(B))(1 - Phi(B^s))"""
+    no_estacional = np.concatenate([[1.0], -phi])
+    estacional = np.zeros(len(Phi) * s + 1)
+    estacional[0] = 1.0
+    estacional[s::s] = -Phi
+    return -np.convolve(no_estacional, estacional)[1:]
+
+
+def pronosticar_ar(coeficientes, historia_w, horizonte):
+    """
+    Pronóstico recursivo de varios AR a la vez sobre la misma historia
+
+    Args:
+        coeficientes: Matriz (modelos, rezagos), columna k-1 = coeficiente del rezago k
+        historia_w: Serie diferenciada hasta el origen (al menos 'rezagos' valores)
+        horizonte: Pasos a pronosticar
+
+    Returns:
+        Matriz (modelos, horizonte)
+    """
+    modelos, rezagos = coeficientes.shape
+    if rezagos == 0:
+        return np.zeros((modelos, horizonte))
+
+    W = np.zeros((modelos, rezagos + horizonte))
+    W[:, :rezagos] = historia_w[len(historia_w) - rezagos:]
+    invertidos = coeficientes[:, ::-1]  # columna j multiplica a w_{t - rezagos + j}
+    for h in range(horizonte):
+        W[:, rezagos + h] = np.einsum('ij,ij->i', invertidos, W[:, h:rezagos + h])
+    return W[:, rezagos:]
+
+
+def _modelos_del_corte(w, s, pares):
+    """
+    Coeficientes y verosimilitud condicional de todos los (p, P) de un corte
+
+    Returns:
+        {(p, P): (coeficientes_por_rezago, varianza, n_efectivo)} para los pares con muestra suficiente
+    """
+    n = len(w)
+    P_max = min(max(P for _, P in pares), (n - 1) // s)
+    estacionales, _ = levinson_burg(w, P_max, paso=s)
+
+    modelos = {}
+    for P in sorted({P for _, P in pares if P <= P_max}):
+        Phi_inicial = estacionales[P, :P]
+        if not np.all(np.isfinite(Phi_inicial)):
+            continue
+        u = filtrar_ar(w, Phi_inicial, s)
+        p_max = min(max(p for p, P_par in pares if P_par == P), len(u) - 1)
+        if p_max < 0:
+            continue
+        no_estacionales, varianzas = levinson_burg(u, p_max)
+
+        for p, P_par in pares:
+            if P_par != P or p > p_max:
+                continue
+            phi, Phi, varianza, n_efectivo = no_estacionales[p, :p], Phi_inicial, varianzas[p], len(u) - p
+            # Las dos partes se estimaron por separado: alternar entre ellas acerca la estimación a la conjunta
+            for _ in range(REFINAMIENTOS_ESTACIONALES if P > 0 else 0):
+                Phi = levinson_burg(filtrar_ar(w, phi), P, paso=s)[0][P, :P]
+                u_refinada = filtrar_ar(w, Phi, s)
+                coeficientes, varianzas_refinadas = levinson_burg(u_refinada, p)
+                phi, varianza, n_efectivo = coeficientes[p, :p], varianzas_refinadas[p], len(u_refinada) - p
+
+            # Misma exigencia de muestra que el prefiltro: al menos dos grados de libertad
+            if n_efectivo < p + P + 2 or not varianza > 0 \
+                    or not np.all(np.isfinite(phi)) or not np.all(np.isfinite(Phi)):
+                continue
+            modelos[(p, P)] = (coeficientes_rezagos(phi, Phi, s), varianza, n_efectivo)
+    return modelos
+
+
+def _metricas_modelo(metricas, indice, order, seasonal_order, varianza, n_efectivo, corte):
+    """Métricas con la misma estructura que calcular_metricas de Parametro.py"""
+    metrics = {nombre: float(valores[indice]) for nombre, valores in metricas.items()}
+
+    k = order[0] + seasonal_order[0] + 1  # coeficientes AR y varianza
+    log_verosimilitud = -0.5 * n_efectivo * (np.log(2 * np.pi * varianza) + 1)
+    complexity_penalty = sum(order) + sum(seasonal_order[:3])
+
+    metrics.update({
+        'aic': float(-2 * log_verosimilitud + 2 * k),
+        'bic': float(-2 * log_verosimilitud + k * np.log(n_efectivo)),
+        'composite_score': float(metrics['rmse'] + complexity_penalty * 0.1),
+        'n_params': complexity_penalty,
+        'n_test': corte.n_test,
+        'pct_validacion': corte.pct_validacion,
+        'motor': 'levinson'
+    })
+    return metrics
+
+
+def evaluar_autorregresivos(serie, candidatos, validacion='holdout', horizonte=HORIZONTE_POR_DEFECTO):
+    """
+    Evaluar los candidatos AR puros con Levinson-Durbin
+
+    Args:
+        serie: Serie SAIDI histórica
+        candidatos: Lista de (order, seasonal_order); los que no son AR puros se ignoran
+        validacion: 'holdout' o 'rolling' (origen móvil con los coeficientes del entrenamiento)
+        horizonte: Pasos desde cada origen en la validación con origen móvil
+
+    Returns:
+        {(order, seasonal_order): metrics}. Los candidatos sin muestra suficiente o con pronósticos
+        no finitos no se incluyen (deben evaluarse con SARIMAX)
+    """
+    por_corte = {}
+    for candidato in candidatos:
+        if es_autorregresivo(candidato):
+            order, seasonal_order = candidato
+            clave = (order[1], seasonal_order[1], seasonal_order[3])
+            por_corte.setdefault(clave, []).append(candidato)
+
+    resultados = {}
+    for (d, D, s), miembros in por_corte.items():
+        corte, _ = preparar_corte(serie, *miembros[0])
+        modelos = _modelos_del_corte(corte.train_diferenciada, s,
+                                     [(order[0], seasonal_order[0]) for order, seasonal_order in miembros])
+        incluidos = [c for c in miembros if (c[0][0], c[1][0]) in modelos]
+        if not incluidos:
+            continue
+
+        # Matriz de coeficientes (modelos, rezagos) completada con ceros
+        rezagos = max(len(modelos[(c[0][0], c[1][0])][0]) for c in incluidos)
+        coeficientes = np.zeros((len(incluidos), rezagos))
+        for i, (order, seasonal_order) in enumerate(incluidos):
+            c = modelos[(order[0], seasonal_order[0])][0]
+            coeficientes[i, :len(c)] = c
+
+        polinomio = polinomio_diferencias(d, D, s)
+        if validacion == 'rolling':
+            # Mismo orden (origen, paso) que pronosticos_origen_movil
+            completa = np.concatenate([corte.train, corte.test])
+            w_completa = diff(completa, k_diff=d, k_seasonal_diff=D, seasonal_periods=s)
+            perdidos = len(polinomio) - 1
+            pasos = max(1, min(horizonte, corte.n_test))
+            reales, pronosticos = [], []
+            for origen in range(corte.n_test):
+                fin = len(corte.train) + origen
+                h = min(pasos, corte.n_test - origen)
+                pronostico_w = pronosticar_ar(coeficientes, w_completa[:fin - perdidos], h)
+                pronosticos.append(integrar_pronostico(pronostico_w, completa[:fin], polinomio))
+                reales.append(corte.test[origen:origen + h])
+            reales = np.concatenate(reales)
+            pronosticos = np.concatenate(pronosticos, axis=1)
+        else:
+            reales = corte.test
+            pronostico_w = pronosticar_ar(coeficientes, corte.train_diferenciada, corte.n_test)
+            pronosticos = integrar_pronostico(pronostico_w, corte.train, polinomio)
+
+        metricas = calcular_metricas_lote(reales, pronosticos)
+        for i, (order, seasonal_order) in enumerate(incluidos):
+            if not np.all(np.isfinite(pronosticos[i])):
+                continue
+            _, varianza, n_efectivo = modelos[(order[0], seasonal_order[0])]
+            resultados[(order, seasonal_order)] = _metricas_modelo(metricas, i, order, seasonal_order,
+                                                                   varianza, n_efectivo, corte)
+    return resultados
@@ -0,0 +1,240 @@
+# backend/motor_busqueda.py - Motor de búsqueda paralela para Parametro.py
+"""
+Motor de evaluación paralela de combinaciones SARIMAX
+Reparte las evaluaciones en un pool de procesos y entrega cada resultado
+al proceso principal a medida que termina. Los workers reciben el evento de
+cancelación: sus ajustes en curso se detienen solos en la siguiente iteración
+del optimizador
+"""
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+from cancelacion import obtener_evento, instalar_evento, cancelacion_solicitada, aviso_cancelacion
+
+# Segundos que se espera a que los workers terminen solos tras una cancelación
+TIEMPO_DETENCION = 5.0
+
+# Estado propio de cada proceso trabajador (se inicializa una sola vez por proceso)
+_SERIE_TRABAJADOR = None
+_FUNCION_TRABAJADOR = None
+
+
+def _inicializar_trabajador(serie, funcion_evaluacion, evento_cancelacion):
+    """Inicializador de cada proceso del pool: recibe la serie y el evento de cancelación una única vez"""
+    global _SERIE_TRABAJADOR, _FUNCION_TRABAJADOR
+
+    # La cancelación llega por el evento compartido con el proceso principal;
+    # SIGTERM vuelve a su comportamiento por defecto para que terminar() sea inmediato
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    if hasattr(signal, 'SIGBREAK'):
+        signal.signal(signal.SIGBREAK, signal.SIG_DFL)
+
+    instalar_evento(evento_cancelacion)
+    _SERIE_TRABAJADOR = serie
+    _FUNCION_TRABAJADOR = funcion_evaluacion
+
+
+def _ejecutar_tarea(order, seasonal_order):
+    """Tarea ejecutada dentro de un proceso trabajador"""
+    return _FUNCION_TRABAJADOR(_SERIE_TRABAJADOR, order, seasonal_order)
+
+
+def obtener_workers_por_defecto():
+    """Número de procesos por defecto: un worker por núcleo disponible"""
+    return os.cpu_count() or 1
+
+
+class MotorBusquedaParalela:
+    """Evalúa combinaciones (order, seasonal_order) en paralelo con cancelación"""
+
+    def __init__(self, serie, funcion_evaluacion, workers=None, verificar_cancelacion=None,
+                 intervalo_verificacion=0.5):
+        """
+        Args:
+            serie: Serie histórica que se envía a cada worker
+            funcion_evaluacion: Función de nivel de módulo f(serie, order, seasonal_order)
+            workers: Número de procesos (None = número de núcleos, 1 = secuencial)
+            verificar_cancelacion: Función sin argumentos que retorna True si se canceló
+            intervalo_verificacion: Segundos entre verificaciones de cancelación
+        """
+        self.serie = serie
+        self.funcion_evaluacion = funcion_evaluacion
+        self.workers = max(1, int(workers)) if workers else obtener_workers_por_defecto()
+        self.verificar_cancelacion = verificar_cancelacion or (lambda: False)
+        self.intervalo_verificacion = intervalo_verificacion
+        self.max_pendientes = self.workers * 2
+        self.cancelado = False
+        self._executor = None
+
+    @property
+    def es_paralelo(self):
+        return self.workers > 1
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.cerrar()
+        else:
+            # Cualquier interrupción (cancelación, SystemExit, error) detiene los workers de inmediato
+            self.terminar()
+        return False
+
+    def iniciar(self):
+        """Crear el pool de procesos (no hace nada en modo secuencial)"""
+        if self.es_paralelo and self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_inicializar_trabajador,
+                initargs=(self.serie, self.funcion_evaluacion, obtener_evento())
+            )
+            print(f"Motor de búsqueda paralela iniciado con {self.workers} workers")
+
+    def cerrar(self):
+        """Cerrar el pool esperando a que terminen las tareas en curso"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def terminar(self, espera=0.0):
+        """
+        Detener todos los workers descartando tareas pendientes
+
+        Args:
+            espera: Segundos que se deja a los workers terminar solos (tras una cancelación
+                    abandonan su ajuste en curso) antes de forzar su finalización
+        """
+        if self._executor is None:
+            return
+
+        executor = self._executor
+        self._executor = None
+
+        procesos = list(getattr(executor, '_processes', {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        if espera > 0:
+            limite = time.monotonic() + espera
+            for proceso in procesos:
+                try:
+                    proceso.join(timeout=max(0.0, limite - time.monotonic()))
+                except Exception:
+                    pass
+
+        for proceso in procesos:
+            try:
+                if proceso.is_alive():
+                    proceso.terminate()
+            except Exception as e:
+                print(f"Error deteniendo worker: {e}")
+
+        for proceso in procesos:
+            try:
+                proceso.join(timeout=2)
+            except Exception:
+                pass
+
+        forzados = sum(1 for proceso in procesos if proceso.exitcode is not None and proceso.exitcode < 0)
+        print(f"Workers detenidos: {len(procesos)}" + (f" ({forzados} forzados)" if forzados else ""))
+
+    def _comprobar_cancelacion(self):
+        if not self.cancelado and self.verificar_cancelacion():
+            self.cancelado = True
+        return self.cancelado
+
+    def evaluar(self, candidatos, al_completar):
+        """
+        Evaluar todas las combinaciones entregando cada resultado al terminar
+
+        Args:
+            candidatos: Iterable de tuplas (order, seasonal_order)
+            al_completar: Callback f(order, seasonal_order, resultado, error)
+                          llamado en el proceso principal por cada combinación
+
+        Returns:
+            True si se evaluaron todos los candidatos, False si se canceló
+        """
+        if not self.es_paralelo:
+            return self._evaluar_secuencial(candidatos, al_completar)
+
+        self.iniciar()
+        iterador = iter(candidatos)
+        pendientes = {}
+        agotado = False
+        # Completado por el hilo que recibe la cancelación: despierta la espera sin sondeos
+        aviso = aviso_cancelacion()
+
+        while True:
+            if self._comprobar_cancelacion():
+                # Con cancelación del usuario los workers ya están abandonando sus ajustes;
+                # con el presupuesto de tiempo agotado no la ven y se detienen de inmediato
+                self.terminar(espera=TIEMPO_DETENCION if cancelacion_solicitada() else 0.0)
+                return False
+
+            # Mantener una ventana acotada de tareas en vuelo para poder cancelar rápido
+            while not agotado and len(pendientes) < self.max_pendientes:
+                try:
+                    order, seasonal_order = next(iterador)
+                except StopIteration:
+                    agotado = True
+                    break
+                futuro = self._executor.submit(_ejecutar_tarea, order, seasonal_order)
+                pendientes[futuro] = (order, seasonal_order)
+
+            if not pendientes:
+                return True
+
+            # El intervalo solo importa para el presupuesto de tiempo; la cancelación despierta por el aviso
+            completados, _ = wait([*pendientes, aviso], timeout=self.intervalo_verificacion,
+                                  return_when=FIRST_COMPLETED)
+
+            pool_roto = False
+            for futuro in completados:
+                if futuro is aviso:
+                    continue
+                order, seasonal_order = pendientes.pop(futuro)
+                if cancelacion_solicitada():
+                    # Lo que termina después de cancelar no se reporta: los resultados parciales
+                    # son los entregados antes de la cancelación
+                    self.cancelado = True
+                    continue
+                try:
+                    resultado = futuro.result()
+                    al_completar(order, seasonal_order, resultado, None)
+                except BrokenProcessPool as e:
+                    pool_roto = True
+                    al_completar(order, seasonal_order, None, e)
+                except Exception as e:
+                    al_completar(order, seasonal_order, None, e)
+
+            if pool_roto:
+                # Un worker murió de forma abrupta: reportar lo pendiente y recrear el pool
+                print("Pool de procesos dañado - reiniciando workers")
+                for futuro, (order, seasonal_order) in list(pendientes.items()):
+                    al_completar(order, seasonal_order, None, BrokenProcessPool("Worker finalizado abruptamente"))
+                pendientes.clear()
+                self.terminar()
+                self.iniciar()
+
+    def _evaluar_secuencial(self, candidatos, al_completar):
+        """Ruta de un solo proceso (workers=1), equivalente al comportamiento original"""
+        for order, seasonal_order in candidatos:
+            if self._comprobar_cancelacion():
+                return False
+            try:
+                resultado = self.funcion_evaluacion(self.serie, order, seasonal_order)
+            except InterruptedError:
+                self.cancelado = True
+                return False
+            except Exception as e:
+                al_completar(order, seasonal_order, None, e)
+                continue
+            al_completar(order, seasonal_order, resultado, None)
+        return True
+
@@ -0,0 +1,57 @@
+# backend/perfiles_ajuste.py - Perfiles de ajuste SARIMAX por etapa
+"""
+Perfiles con nombre para construir y ajustar modelos SARIMAX
+accurate: valores por defecto de statsmodels (modelo final, Modelo.py y visual.py)
+fast: varianza concentrada, menos iteraciones y sin matriz de covarianzas (búsqueda)
+
+No se incluyen simple_differencing (los pronósticos quedarían en la escala diferenciada y la
+muestra efectiva cambia) ni low_memory (no guarda los estados predichos que necesita la
+validación con origen móvil y altera el AIC reportado).
+"""
+import numpy as np
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+from cancelacion import punto_interrupcion
+
+PERFIL_POR_DEFECTO = 'accurate'
+
+PERFILES_AJUSTE = {
+    'accurate': {
+        'descripcion': "valores por defecto de statsmodels",
+        'modelo': {},
+        'ajuste': {}
+    },
+    'fast': {
+        'descripcion': "varianza concentrada, maxiter=30, sin covarianzas",
+        'modelo': {'concentrate_scale': True},
+        'ajuste': {'maxiter': 30, 'cov_type': 'none'}
+    }
+}
+
+
+def crear_modelo_sarimax(datos, order, seasonal_order, perfil=PERFIL_POR_DEFECTO):
+    """Construir el SARIMAX de la aplicación con las opciones de modelo del perfil"""
+    return SARIMAX(
+        datos,
+        order=order,
+        seasonal_order=seasonal_order,
+        enforce_stationarity=False,
+        enforce_invertibility=False,
+        **PERFILES_AJUSTE[perfil]['modelo']
+    )
+
+
+def ajustar_con_perfil(model, perfil=PERFIL_POR_DEFECTO, **opciones):
+    """
+    Ajustar un modelo con las opciones de ajuste del perfil
+    opciones: sobrescriben las del perfil (por ejemplo un maxiter distinto)
+    El optimizador comprueba la cancelación en cada iteración (cancelacion.punto_interrupcion)
+    """
+    if model.k_params == 0:
+        # Con la varianza concentrada un modelo sin términos AR/MA no tiene nada que optimizar
+        return model.filter(np.array([]))
+    if model.loglikelihood_burn >= model.nobs:
+        # Más estados difusos que observaciones: la verosimilitud es constante y el optimizador
+        # se quedaría en los valores iniciales (con varianza concentrada, tras muchas evaluaciones NaN)
+        return model.filter(model.start_params)
+    return model.fit(disp=False, callback=punto_interrupcion, **dict(PERFILES_AJUSTE[perfil]['ajuste'], **opciones))
@@ -0,0 +1,159 @@
+# backend/prefiltro_arma.py - Prefiltro Hannan-Rissanen de la grilla SARIMA
+"""
+Estimación barata (NumPy puro, sin filtro de Kalman) de cada combinación de la grilla
+por regresión de Hannan-Rissanen sobre la serie diferenciada de su corte (d, D, s):
+1. AR largo por mínimos cuadrados para estimar las innovaciones
+2. Regresión de la serie sobre sus rezagos AR y los rezagos de las innovaciones (MA)
+Los rezagos estacionales se incluyen de forma aditiva (1..p y s..P*s), sin los términos
+cruzados del modelo multiplicativo. El pronóstico del período de validación se integra a la
+escala original y se puntúa con las mismas métricas que el ajuste completo.
+"""
+import numpy as np
+
+from cortes_grilla import preparar_corte
+from metricas import calcular_metricas_lote
+
+
+def orden_ar_largo(n, s):
+    """Orden del AR largo de la primera etapa: cubre el rezago estacional si hay datos suficientes"""
+    return max(0, min(n // 2 - 1, max(s + 1, int(np.ceil(np.log(max(n, 2)) ** 2)))))
+
+
+def _columnas_rezagos(x, rezagos, inicio):
+    """Matriz con x[t - rezago] para t = inicio..len(x)-1 (una columna por rezago)"""
+    return np.column_stack([x[inicio - rezago:len(x) - rezago] for rezago in rezagos])
+
+
+def innovaciones_ar_largo(w, s):
+    """Residuos de un AR largo sin constante (ceros antes del orden del AR)"""
+    m = orden_ar_largo(len(w), s)
+    innovaciones = np.zeros(len(w))
+    if m == 0:
+        return innovaciones, 0
+    X = _columnas_rezagos(w, range(1, m + 1), m)
+    coeficientes, *_ = np.linalg.lstsq(X, w[m:], rcond=None)
+    innovaciones[m:] = w[m:] - X @ coeficientes
+    return innovaciones, m
+
+
+def rezagos_modelo(order, seasonal_order):
+    """Rezagos AR y MA aditivos de un SARIMA (p, q no estacionales y P, Q estacionales)"""
+    p, _, q = order
+    P, _, Q, s = seasonal_order
+    ar = list(range(1, p + 1)) + [s * j for j in range(1, P + 1) if s * j > p]
+    ma = list(range(1, q + 1)) + [s * j for j in range(1, Q + 1) if s * j > q]
+    return ar, ma
+
+
+def polinomio_diferencias(d, D, s):
+    """Coeficientes (potencias crecientes de B) de (1 - B)^d (1 - B^s)^D"""
+    polinomio = np.array([1.0])
+    for _ in range(d):
+        polinomio = np.convolve(polinomio, [1.0, -1.0])
+    estacional = np.zeros(s + 1)
+    estacional[0], estacional[s] = 1.0, -1.0
+    for _ in range(D):
+        polinomio = np.convolve(polinomio, estacional)
+    return polinomio
+
+
+def pronostico_hannan_rissanen(w, innovaciones, m, rezagos_ar, rezagos_ma, horizonte):
+    """
+    Pronóstico de la serie diferenciada w para el horizonte dado
+
+    Returns:
+        Array (horizonte,) o None si la muestra no alcanza para estimar los coeficientes
+    """
+    n = len(w)
+    if not rezagos_ar and not rezagos_ma:
+        return np.zeros(horizonte)
+
+    # Las innovaciones anteriores al AR largo se toman como cero
+    inicio = max(max(rezagos_ar, default=0), max(rezagos_ma, default=0), m)
+    columnas = len(rezagos_ar) + len(rezagos_ma)
+    if n - inicio < columnas + 2:
+        return None
+
+    bloques = []
+    if rezagos_ar:
+        bloques.append(_columnas_rezagos(w, rezagos_ar, inicio))
+    if rezagos_ma:
+        bloques.append(_columnas_rezagos(innovaciones, rezagos_ma, inicio))
+    X = np.hstack(bloques)
+    coeficientes, *_ = np.linalg.lstsq(X, w[inicio:], rcond=None)
+    phi = coeficientes[:len(rezagos_ar)]
+    theta = coeficientes[len(rezagos_ar):]
+
+    # Recursión hacia adelante: innovaciones futuras en cero
+    w_ext = np.concatenate([w, np.zeros(horizonte)])
+    e_ext = np.concatenate([innovaciones, np.zeros(horizonte)])
+    indices_ar = np.asarray(rezagos_ar, dtype=int)
+    indices_ma = np.asarray(rezagos_ma, dtype=int)
+    for t in range(n, n + horizonte):
+        w_ext[t] = phi @ w_ext[t - indices_ar] + theta @ e_ext[t - indices_ma]
+    return w_ext[n:]
+
+
+def integrar_pronostico(pronostico_w, historia, polinomio):
+    """
+    Deshacer (1 - B)^d (1 - B^s)^D a partir de la historia en escala original
+    pronostico_w: vector (horizonte,) o matriz (modelos, horizonte) con la misma historia
+    """
+    k = len(polinomio) - 1
+    if k == 0:
+        return pronostico_w
+    pronostico_w = np.asarray(pronostico_w)
+    n = len(historia)
+    y = np.concatenate([np.broadcast_to(historia, pronostico_w.shape[:-1] + (n,)), np.zeros_like(pronostico_w)],
+                       axis=-1)
+    coeficientes = polinomio[1:][::-1]  # c_k ... c_1 para y[t-k] ... y[t-1]
+    for h in range(pronostico_w.shape[-1]):
+        t = n + h
+        y[..., t] = pronostico_w[..., h] - y[..., t - k:t] @ coeficientes
+    return y[..., n:]
+
+
+def metricas_prefiltro_fallido():
+    return {'precision_final': 0.0, 'rmse': float('inf'), 'composite_score': float('inf')}
+
+
+def puntuar_candidatos(serie, candidatos):
+    """
+    Puntuar todas las combinaciones con Hannan-Rissanen y validación holdout
+
+    Returns:
+        {(order, seasonal_order): metrics} con rmse, mae, mape, r2_score, precisiones y composite_score.
+        Las combinaciones con más rezagos de los que la muestra diferenciada permite estimar
+        reciben precisión 0 y composite_score infinito.
+    """
+    por_corte = {}
+    for order, seasonal_order in candidatos:
+        clave = (order[1], seasonal_order[1], seasonal_order[3])
+        por_corte.setdefault(clave, []).append((order, seasonal_order))
+
+    puntajes = {}
+    for (d, D, s), miembros in por_corte.items():
+        corte, _ = preparar_corte(serie, miembros[0][0], miembros[0][1])
+        w = corte.train_diferenciada
+        innovaciones, m = innovaciones_ar_largo(w, s)
+        polinomio = polinomio_diferencias(d, D, s)
+
+        pronosticos = np.full((len(miembros), corte.n_test), np.nan)
+        for i, (order, seasonal_order) in enumerate(miembros):
+            rezagos_ar, rezagos_ma = rezagos_modelo(order, seasonal_order)
+            pronostico_w = pronostico_hannan_rissanen(w, innovaciones, m, rezagos_ar, rezagos_ma, corte.n_test)
+            if pronostico_w is not None:
+                pronosticos[i] = integrar_pronostico(pronostico_w, corte.train, polinomio)
+
+        # Todas las métricas del corte en una sola pasada
+        lote = calcular_metricas_lote(corte.test, pronosticos)
+        for i, (order, seasonal_order) in enumerate(miembros):
+            if not np.all(np.isfinite(pronosticos[i])) or not np.isfinite(lote['rmse'][i]):
+                puntajes[(order, seasonal_order)] = metricas_prefiltro_fallido()
+                continue
+            metrics = {nombre: float(valores[i]) for nombre, valores in lote.items()}
+            complejidad = sum(order) + sum(seasonal_order[:3])
+            metrics['composite_score'] = metrics['rmse'] + complejidad * 0.1
+            puntajes[(order, seasonal_order)] = metrics
+
+    return puntajes
@@ -0,0 +1,123 @@
+# backend/serie_compartida.py - Serie SAIDI preparada por la interfaz, compartida con los scripts por archivo mapeado
+"""
+La interfaz ya tiene el Excel leído y validado; en lugar de que cada script vuelva a abrir el
+libro, escribe una vez la serie indexada por fecha (SAIDI y, si existen, Esperados y Estandar
+de calidad) en un archivo binario y pasa su ruta con --data. Los scripts lo abren con
+np.memmap: las columnas se leen directamente del archivo, sin conversión ni copia.
+
+Formato (little-endian):
+    MAGIA (8 bytes) | longitud de la cabecera (uint32) | cabecera JSON UTF-8 | relleno
+    fechas (int64, n) | una columna float64 (n) por cada nombre de "columnas"
+Los bloques de datos empiezan en "desplazamiento", alineado a ALINEACION bytes.
+"""
+import os
+import json
+import struct
+import tempfile
+import numpy as np
+import pandas as pd
+
+MAGIA = b"SAIDISER"
+VERSION = 1
+
+# Alineación de los bloques de datos (línea de caché)
+ALINEACION = 64
+
+# Columnas de referencia que se comparten además de la columna SAIDI
+COLUMNAS_OPCIONALES = ('Esperados', 'Estandar de calidad')
+
+
+def guardar_serie(datos, ruta):
+    """
+    Escribir la serie preparada (escritura atómica: el script nunca ve un archivo a medias)
+
+    Args:
+        datos: Tupla (df, col_saidi) con el índice de fechas, como la devuelve cargar_excel_saidi
+    """
+    df, col_saidi = datos
+    indice = pd.DatetimeIndex(df.index)
+    # Misma unidad que el índice original: la huella de cache_ajustes depende de ella
+    unidad = np.datetime_data(indice.dtype)[0]
+    columnas = [col_saidi] + [col for col in COLUMNAS_OPCIONALES if col in df.columns and col != col_saidi]
+
+    cabecera = {'version': VERSION, 'filas': len(df), 'col_saidi': col_saidi, 'columnas': columnas,
+                'indice': df.index.name, 'unidad': unidad, 'desplazamiento': 0}
+    # El desplazamiento va dentro de la propia cabecera: se recalcula hasta que no cambie
+    inicio_cabecera = len(MAGIA) + 4
+    while True:
+        cabecera_bytes = json.dumps(cabecera, ensure_ascii=False).encode('utf-8')
+        desplazamiento = -(-(inicio_cabecera + len(cabecera_bytes)) // ALINEACION) * ALINEACION
+        if desplazamiento == cabecera['desplazamiento']:
+            break
+        cabecera['desplazamiento'] = desplazamiento
+    cabecera_bytes = cabecera_bytes.ljust(desplazamiento - inicio_cabecera, b' ')
+
+    carpeta = os.path.dirname(os.path.abspath(ruta))
+    descriptor, temporal = tempfile.mkstemp(dir=carpeta, suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as f:
+            f.write(MAGIA)
+            f.write(struct.pack('<I', len(cabecera_bytes)))
+            f.write(cabecera_bytes)
+            f.write(np.ascontiguousarray(indice.asi8, dtype='<i8').tobytes())
+            for columna in columnas:
+                valores = pd.to_numeric(df[columna], errors='coerce').to_numpy(dtype='<f8', na_value=np.nan)
+                f.write(np.ascontiguousarray(valores).tobytes())
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+    return ruta
+
+
+def leer_cabecera(ruta):
+    """
+    Cabecera del archivo
+
+    Raises:
+        ValueError: si el archivo no tiene el formato esperado
+    """
+    with open(ruta, 'rb') as f:
+        if f.read(len(MAGIA)) != MAGIA:
+            raise ValueError(f"{ruta} no es un archivo de serie SAIDI compartida")
+        longitud = struct.unpack('<I', f.read(4))[0]
+        try:
+            cabecera = json.loads(f.read(longitud).decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ValueError(f"Cabecera inválida en {ruta}: {e}")
+
+    if cabecera.get('version') != VERSION:
+        raise ValueError(f"Versión de serie compartida no soportada: {cabecera.get('version')}")
+    tamano_esperado = cabecera['desplazamiento'] + 8 * cabecera['filas'] * (1 + len(cabecera['columnas']))
+    if os.path.getsize(ruta) < tamano_esperado:
+        raise ValueError(f"Archivo de serie compartida incompleto: {ruta}")
+    return cabecera
+
+
+def cargar_serie(ruta):
+    """
+    Abrir la serie compartida sin copiar sus columnas
+
+    Returns:
+        Tupla (df, col_saidi) equivalente a cargar_excel_saidi; las columnas son de solo lectura
+        (quien necesite modificarlas trabaja sobre df.copy(), como Modelo.py y visual.py)
+
+    Raises:
+        ValueError: si el archivo no tiene el formato esperado
+    """
+    cabecera = leer_cabecera(ruta)
+    filas = cabecera['filas']
+    desplazamiento = cabecera['desplazamiento']
+
+    # Un solo mapeo para todos los bloques: fila 0 las fechas, luego una fila por columna
+    if filas == 0:
+        bloques = np.empty((1 + len(cabecera['columnas']), 0), dtype='<f8')
+    else:
+        bloques = np.memmap(ruta, dtype='<f8', mode='r', offset=desplazamiento,
+                            shape=(1 + len(cabecera['columnas']), filas))
+    indice = pd.DatetimeIndex(np.asarray(bloques[0]).view('<i8').view(f"M8[{cabecera['unidad']}]"),
+                              name=cabecera['indice'])
+    columnas = {columna: bloques[posicion] for posicion, columna in enumerate(cabecera['columnas'], start=1)}
+    df = pd.DataFrame(columnas, index=indice, copy=False)
+    return df, cabecera['col_saidi']
@@ -0,0 +1,121 @@
+# backend/servidor_analisis.py - Trabajador persistente de análisis para la interfaz
+"""
+Proceso de larga duración que la interfaz lanza una sola vez: mantiene importados pandas,
+statsmodels, matplotlib y los scripts de análisis, y ejecuta trabajos recibidos por stdin.
+Así un clic en Predicción o Validación solo paga el ajuste del modelo, no el arranque de
+Python ni las importaciones.
+
+Protocolo: una línea JSON por mensaje en stdin y una por respuesta en stdout
+    {"tipo": "ping"}                                    -> {"tipo": "pong", "pid", "trabajos", "activo_desde"}
+    {"tipo": "trabajo", "id", "script", "args": [...]}  -> {"tipo": "resultado", "id", "codigo", "salida", "segundos"}
+    {"tipo": "salir"}                                   -> fin del proceso
+La salida impresa por cada trabajo se devuelve en "salida"; el resto de impresiones va a stderr
+para no mezclarse con las respuestas.
+
+La optimización (Parametro.py) no se ejecuta aquí: dura horas, usa su propio pool de procesos
+y estado global por ejecución, y su arranque es despreciable frente a la búsqueda.
+"""
+import io
+import os
+import sys
+import json
+import time
+import importlib
+import traceback
+from contextlib import redirect_stdout
+
+# Scripts que acepta el trabajador (módulos con una función main() que lee sys.argv)
+SCRIPTS_TRABAJADOR = ('Modelo', 'visual', 'analisis_combinado')
+
+
+def precargar_modulos():
+    """Importar la pila científica y los scripts una sola vez"""
+    inicio = time.time()
+    for nombre in ('pandas', 'matplotlib.pyplot', 'statsmodels.tsa.statespace.sarimax', *SCRIPTS_TRABAJADOR):
+        importlib.import_module(nombre)
+    return time.time() - inicio
+
+
+def ejecutar_trabajo(script, args):
+    """
+    Ejecutar main() de un script como si se hubiera lanzado con esos argumentos
+
+    Returns:
+        Tupla (codigo de salida, salida impresa)
+    """
+    if script not in SCRIPTS_TRABAJADOR:
+        return 2, f"ERROR: Script no admitido por el trabajador: {script}\n"
+
+    modulo = importlib.import_module(script)
+    argv_original, entorno_original = sys.argv, dict(os.environ)
+    salida = io.StringIO()
+    codigo = 0
+    try:
+        sys.argv = [f"{script}.py"] + [str(arg) for arg in args]
+        with redirect_stdout(salida):
+            try:
+                modulo.main()
+            except SystemExit as e:
+                codigo = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            except Exception:
+                traceback.print_exc(file=salida)
+                codigo = 1
+    finally:
+        # Un trabajo no debe dejar estado para el siguiente (--no-cache, figuras abiertas)
+        sys.argv = argv_original
+        os.environ.clear()
+        os.environ.update(entorno_original)
+        try:
+            import matplotlib.pyplot as plt
+            plt.close('all')
+        except Exception:
+            pass
+    return codigo, salida.getvalue()
+
+
+def servir(entrada, respuestas):
+    """Atender mensajes hasta recibir 'salir' o el cierre de stdin"""
+    activo_desde = time.time()
+    trabajos = 0
+
+    def responder(mensaje):
+        respuestas.write(json.dumps(mensaje) + "\n")
+        respuestas.flush()
+
+    for linea in entrada:
+        if not linea.strip():
+            continue
+        try:
+            mensaje = json.loads(linea)
+        except json.JSONDecodeError:
+            print(f"Mensaje inválido ignorado: {linea[:80]!r}", file=sys.stderr)
+            continue
+
+        tipo = mensaje.get('tipo')
+        if tipo == 'ping':
+            responder({'tipo': 'pong', 'pid': os.getpid(), 'trabajos': trabajos, 'activo_desde': activo_desde})
+        elif tipo == 'trabajo':
+            inicio = time.time()
+            codigo, salida = ejecutar_trabajo(mensaje.get('script'), mensaje.get('args', []))
+            trabajos += 1
+            responder({'tipo': 'resultado', 'id': mensaje.get('id'), 'codigo': codigo,
+                       'salida': salida, 'segundos': time.time() - inicio})
+        elif tipo == 'salir':
+            break
+
+
+def main():
+    # El canal de respuestas es el stdout original; cualquier otra impresión va a stderr
+    respuestas = sys.stdout
+    sys.stdout = sys.stderr
+
+    segundos = precargar_modulos()
+    print(f"Trabajador de análisis listo (pid {os.getpid()}, importaciones {segundos:.2f} s)", file=sys.stderr)
+    respuestas.write(json.dumps({'tipo': 'listo', 'pid': os.getpid(), 'segundos_importacion': segundos}) + "\n")
+    respuestas.flush()
+
+    servir(sys.stdin, respuestas)
+
+
+if __name__ == "__main__":
+    main()
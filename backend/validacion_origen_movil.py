@@ -0,0 +1,59 @@
+# backend/validacion_origen_movil.py - Validación cruzada con origen móvil sin reajustar
+"""
+Validación con origen móvil (rolling origin) para modelos SARIMAX ya ajustados
+El modelo se ajusta una sola vez sobre el entrenamiento; el período de validación se
+filtra una vez con los mismos parámetros (extend) y los pronósticos de cada origen se
+obtienen propagando los estados predichos con las matrices del espacio de estados
+"""
+import numpy as np
+
+# Pasos pronosticados desde cada origen (un ciclo estacional mensual)
+HORIZONTE_POR_DEFECTO = 12
+
+
+def _matriz_invariante(ssm, nombre):
+    """Matriz del espacio de estados sin la dimensión temporal (el modelo debe ser invariante)"""
+    matriz = getattr(ssm, nombre)
+    if matriz.shape[-1] != 1:
+        raise ValueError(f"La matriz '{nombre}' varía en el tiempo: no se puede validar con origen móvil")
+    return matriz[..., 0]
+
+
+def pronosticos_origen_movil(results, test_data, horizonte=HORIZONTE_POR_DEFECTO):
+    """
+    Pronósticos desde cada origen del período de validación sin reestimar parámetros
+
+    Args:
+        results: Resultados SARIMAX ajustados sobre el entrenamiento
+        test_data: Serie de validación (continúa al entrenamiento)
+        horizonte: Pasos pronosticados desde cada origen
+
+    Returns:
+        Tupla (reales, pronosticos) de arrays 1-D con todos los pares (origen, paso)
+        que caen dentro del período de validación
+    """
+    reales = np.asarray(test_data, dtype=float)
+    n_test = len(reales)
+    horizonte = max(1, min(horizonte, n_test))
+
+    extendido = results.extend(test_data)
+    ssm = extendido.model.ssm
+
+    diseno = _matriz_invariante(ssm, 'design')[0]
+    transicion = _matriz_invariante(ssm, 'transition')
+    intercepto_estado = _matriz_invariante(ssm, 'state_intercept')[:, None]
+    intercepto_obs = _matriz_invariante(ssm, 'obs_intercept')[0]
+
+    # Estado predicho al inicio de cada origen: a[t|t-1] con datos hasta el origen
+    estados = extendido.predicted_state[:, :n_test]
+
+    pronosticos = np.empty((n_test, horizonte))
+    for paso in range(horizonte):
+        pronosticos[:, paso] = intercepto_obs + diseno @ estados
+        estados = intercepto_estado + transicion @ estados
+
+    # Índice del valor real de cada (origen, paso); fuera del período de validación se descarta
+    indices = np.arange(n_test)[:, None] + np.arange(horizonte)[None, :]
+    validos = indices < n_test
+
+    return reales[indices[validos]], pronosticos[validos]
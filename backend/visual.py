@@ -20,48 +20,50 @@ import argparse
 import sys
 import os
 from statsmodels.tsa.statespace.sarimax import SARIMAX
-import numpy as np
-from sklearn.metrics import mean_squared_error
+from metricas import calcular_metricas_pronostico
+from datos_saidi import cargar_excel_saidi, cargar_datos_compartidos
+from graficas import (validar_ruta_salida, usar_backend_sin_ventana, maximizar_ventana,
+                      mantener_maximizada, exportar_figura)
 
+# Cache persistente de ajustes SARIMAX (compartida con Parametro.py)
+try:
+    import cache_ajustes
+    from cache_ajustes import ajustar_sarimax, desactivar_cache, guardar_metricas, describir_artefacto
+    CACHE_AJUSTES_AVAILABLE = True
+except ImportError:
+    CACHE_AJUSTES_AVAILABLE = False
 
-def calcular_metricas_validacion(datos_reales, predicciones):
-    """Calcula las métricas de validación del modelo usando la MISMA fórmula del script principal."""
-    rmse = np.sqrt(mean_squared_error(datos_reales, predicciones))
-    mae = np.mean(np.abs(datos_reales - predicciones))
-    
-    # Calcular MAPE (Error Porcentual Absoluto Medio) - IGUAL que el script principal
-    epsilon = 1e-8
-    mape = np.mean(np.abs((datos_reales - predicciones) / (datos_reales + epsilon))) * 100
-    
-    # Calcular R² para validación - IGUAL que el script principal
-    ss_res = np.sum((datos_reales - predicciones) ** 2)
-    ss_tot = np.sum((datos_reales - np.mean(datos_reales)) ** 2)
-    r2_score = 1 - (ss_res / (ss_tot + epsilon))
-    
-    # Calcular porcentaje de precisión - EXACTAMENTE IGUAL que el script principal
-    precision_mape = max(0, 100 - mape)
-    precision_r2 = max(0, r2_score * 100)
-    mean_actual = np.mean(datos_reales)
-    precision_rmse = max(0, (1 - rmse/mean_actual) * 100)
-    
-    # Precisión compuesta - MISMA PONDERACIÓN que el script principal
-    precision_final = (precision_mape * 0.4 + precision_r2 * 0.4 + precision_rmse * 0.2)
-    precision_final = max(0, min(100, precision_final))
+
+def ajustar_modelo(datos, order, seasonal_order):
+    """Ajustar SARIMAX reutilizando la cache de ajustes cuando está disponible"""
+    if CACHE_AJUSTES_AVAILABLE:
+        results = ajustar_sarimax(datos, order, seasonal_order)
+        print(f"Modelo sobre {len(datos)} observaciones: {describir_artefacto(cache_ajustes.ULTIMO_AJUSTE)}")
+        return results
     
-    return {
-        'rmse': rmse,
-        'mae': mae,
-        'mape': mape,
-        'r2_score': r2_score,
-        'precision_mape': precision_mape,
-        'precision_r2': precision_r2,
-        'precision_rmse': precision_rmse,
-        'precision_final': precision_final
-    }
-
-
-def generar_grafica_validacion(file_path, order=(4, 0, 0), seasonal_order=(1, 0, 0, 8)):
-    """Genera la gráfica de validación del modelo SARIMAX con parámetros dinámicos."""
+    model = SARIMAX(
+        datos,
+        order=order,
+        seasonal_order=seasonal_order,
+        enforce_stationarity=False,
+        enforce_invertibility=False
+    )
+    return model.fit(disp=False)
+
+
+def calcular_metricas_validacion(datos_reales, predicciones):
+    """Calcula las métricas de validación del modelo con el módulo compartido (MISMA fórmula del script principal)."""
+    return calcular_metricas_pronostico(datos_reales, predicciones)
+
+
+def generar_grafica_validacion(file_path, order=(4, 0, 0), seasonal_order=(1, 0, 0, 8), datos=None, mostrar=True,
+                               salida=None):
+    """
+    Genera la gráfica de validación del modelo SARIMAX con parámetros dinámicos.
+    datos: Tupla (df, col_saidi) ya leída con cargar_excel_saidi (evita releer el Excel)
+    mostrar: False deja la figura abierta sin llamar a plt.show (la muestra quien llama)
+    salida: Ruta .png/.svg/.pdf; exporta la figura y la cierra en lugar de mostrarla
+    """
     try:
         # Información del modo de ejecución
         execution_mode = "PyInstaller" if (PATH_UTILS_AVAILABLE and is_frozen()) else "Desarrollo"
@@ -77,22 +79,14 @@ def generar_grafica_validacion(file_path, order=(4, 0, 0), seasonal_order=(1, 0,
                 print(f"Warning: No se pudieron limpiar archivos temporales: {e}")
         
         # === Cargar datos ===
-        df = pd.read_excel(file_path, sheet_name="Hoja1")
-        print("Columnas encontradas en el Excel:", df.columns.tolist())
-
-        # Detectar columna de fecha
-        if "Fecha" in df.columns:
-            df["Fecha"] = pd.to_datetime(df["Fecha"])
-            df.set_index("Fecha", inplace=True)
+        if datos is not None:
+            df, col_saidi = datos[0].copy(), datos[1]
         else:
-            df.iloc[:, 0] = pd.to_datetime(df.iloc[:, 0])
-            df.set_index(df.columns[0], inplace=True)
-
-        # Detectar columna de SAIDI
-        col_saidi = "SAIDI" if "SAIDI" in df.columns else "SAIDI Histórico"
-        if col_saidi not in df.columns:
-            print("ERROR: No se encontró la columna SAIDI ni SAIDI Histórico.")
-            sys.exit(1)
+            try:
+                df, col_saidi = cargar_excel_saidi(file_path)
+            except ValueError as e:
+                print(f"ERROR: {e}")
+                sys.exit(1)
 
         # Obtener solo datos históricos (sin NaN)
         historico = df[df[col_saidi].notna()]
@@ -125,14 +119,7 @@ def generar_grafica_validacion(file_path, order=(4, 0, 0), seasonal_order=(1, 0,
         
         # Ajustar modelo con datos de entrenamiento
         try:
-            model = SARIMAX(
-                datos_entrenamiento,
-                order=order,
-                seasonal_order=seasonal_order,
-                enforce_stationarity=False,
-                enforce_invertibility=False
-            )
-            results = model.fit(disp=False)
+            results = ajustar_modelo(datos_entrenamiento, order, seasonal_order)
             print("Modelo ajustado exitosamente")
         except Exception as e:
             print(f"ERROR: No se pudo ajustar el modelo: {e}")
@@ -151,6 +138,12 @@ def generar_grafica_validacion(file_path, order=(4, 0, 0), seasonal_order=(1, 0,
         # Calcular métricas
         metricas = calcular_metricas_validacion(datos_validacion.values, predicciones_validacion.values)
         
+        # Dejar las métricas junto al artefacto: Modelo.py las reutiliza sin volver a validar
+        if CACHE_AJUSTES_AVAILABLE:
+            guardar_metricas(datos_entrenamiento, datos_validacion, order, seasonal_order,
+                             dict(metricas, aic=results.aic, bic=results.bic,
+                                  n_test=n_test, pct_validacion=pct_validacion))
+        
         print(f"\n=== MÉTRICAS DEL MODELO ===")
         print(f"RMSE: {metricas['rmse']:.4f}")
         print(f"MAE: {metricas['mae']:.4f}")
@@ -165,47 +158,9 @@ def generar_grafica_validacion(file_path, order=(4, 0, 0), seasonal_order=(1, 0,
         # Crear figura con tamaño optimizado para pantalla completa
         fig = plt.figure(figsize=(16, 10))
         
-        # Forzar pantalla completa de manera segura sin errores
-        mng = fig.canvas.manager
-        try:
-            # Para TkAgg (Windows/Linux) - más común y estable
-            if hasattr(mng, 'window') and hasattr(mng.window, 'state'):
-                # Maximizar ventana
-                mng.window.state('zoomed')
-                
-                # Intentar deshabilitar redimensionamiento de manera segura
-                try:
-                    mng.window.resizable(False, False)
-                except:
-                    # Si no se puede deshabilitar redimensionamiento, continuar
-                    print("Info: La ventana se maximizó pero puede ser redimensionable")
-                    
-            # Para Qt backends (solo si están disponibles)
-            elif hasattr(mng, 'window') and hasattr(mng.window, 'showMaximized'):
-                mng.window.showMaximized()
-                
-                # Intentar fijar tamaño solo si Qt está disponible
-                try:
-                    # Verificar si QtCore está disponible antes de importar
-                    import sys
-                    if 'PyQt5' in sys.modules or 'PyQt4' in sys.modules or 'PySide' in sys.modules:
-                        mng.window.setFixedSize(mng.window.size())
-                except ImportError:
-                    # Qt no está disponible, usar alternativa
-                    pass
-                except:
-                    # Cualquier otro error de Qt, continuar sin fijar tamaño
-                    pass
-            
-            # Para otros backends
-            else:
-                # Intentar maximizar de forma genérica
-                if hasattr(mng, 'full_screen_toggle'):
-                    mng.full_screen_toggle()
-                    
-        except Exception as e:
-            print(f"Info: Usando configuración de ventana estándar (no se pudo configurar pantalla completa): {e}")
-            # Continuar normalmente sin pantalla completa forzada
+        # Pantalla completa solo con ventana interactiva (no al exportar con --output)
+        if salida is None:
+            maximizar_ventana(fig)
 
         # Línea azul sólida: Datos de entrenamiento
         plt.plot(datos_entrenamiento.index, datos_entrenamiento.values, 
@@ -382,27 +337,13 @@ def generar_grafica_validacion(file_path, order=(4, 0, 0), seasonal_order=(1, 0,
                    ha='center', fontsize=12, style='italic', color='darkblue', weight='bold',
                    bbox=dict(boxstyle='round,pad=0.4', facecolor='lightyellow', alpha=0.8))
         
-        # Configurar evento para mantener maximización (de manera segura)
-        def on_resize(event):
-            """Intentar mantener la ventana maximizada sin causar errores"""
-            try:
-                if hasattr(mng, 'window') and hasattr(mng.window, 'state'):
-                    current_state = str(mng.window.state()).lower()
-                    if 'zoom' not in current_state and 'normal' in current_state:
-                        mng.window.state('zoomed')
-            except:
-                # Si hay cualquier error, simplemente continuar sin intervenir
-                pass
-        
-        # Conectar el evento de redimensionamiento de manera segura
-        try:
-            fig.canvas.mpl_connect('resize_event', on_resize)
-        except:
-            # Si no se puede conectar el evento, continuar normalmente
-            pass
-        
-        # Mostrar la gráfica
-        plt.show()
+        # Exportar sin ventana, o mostrar la ventana maximizada
+        if salida is not None:
+            exportar_figura(fig, salida)
+        else:
+            mantener_maximizada(fig)
+            if mostrar:
+                plt.show()
 
         # === RESUMEN EN CONSOLA ===
         print(f"\n" + "="*70)
@@ -429,6 +370,7 @@ def generar_grafica_validacion(file_path, order=(4, 0, 0), seasonal_order=(1, 0,
             print("El modelo tiene baja precisión, considere ajustar parámetros")
         
         print("="*70)
+        return fig
 
     except Exception as e:
         print(f"ERROR: Ocurrió un error: {str(e)}")
@@ -443,13 +385,36 @@ def main():
                        help='Parámetros order (p d q) para SARIMAX. Default: 4 0 0')
     parser.add_argument('--seasonal-order', nargs=4, type=int, default=[1, 0, 0, 8],
                        help='Parámetros seasonal_order (P D Q s) para SARIMAX. Default: 1 0 0 8')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='No usar la cache persistente de ajustes SARIMAX')
+    parser.add_argument('--data', default=None,
+                       help='Serie ya preparada por la interfaz (archivo binario mapeado en memoria); '
+                            'evita releer el Excel. Si no se puede abrir se lee --file')
+    parser.add_argument('--output', default=None,
+                       help='Exportar la gráfica sin abrir ventana (backend Agg). El formato se toma de la '
+                            'extensión: .png, .svg o .pdf')
     
     args = parser.parse_args()
     
+    if args.no_cache and CACHE_AJUSTES_AVAILABLE:
+        desactivar_cache()
+    
+    if args.output:
+        try:
+            validar_ruta_salida(args.output)
+        except ValueError as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
+        # Sin ventana: Agg no necesita pantalla ni bucle de eventos
+        usar_backend_sin_ventana()
+    
     if not os.path.exists(args.file):
         print(f"ERROR: El archivo {args.file} no existe.")
         sys.exit(1)
     
+    # Serie compartida por la interfaz (si se pasó --data)
+    datos = cargar_datos_compartidos(args.data) if args.data else None
+    
     # Convertir argumentos a tuplas
     order = tuple(args.order)
     seasonal_order = tuple(args.seasonal_order)
@@ -461,7 +426,7 @@ def main():
     print(f"Parámetros: SARIMAX{order}x{seasonal_order}")
     print("="*50)
     
-    generar_grafica_validacion(args.file, order, seasonal_order)
+    generar_grafica_validacion(args.file, order, seasonal_order, datos=datos, salida=args.output)
     print("Proceso completado exitosamente.")
 
 
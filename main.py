@@ -1,7 +1,14 @@
 # main.py - Lanzador Principal con Soporte PyInstaller
 
+import time
+
+# Inicio del lanzador (antes de cualquier otra importación) para medir el tiempo hasta la primera ventana
+INICIO_LANZADOR = time.perf_counter()
+
 import sys
 import os
+import builtins
+import importlib.util
 import tkinter as tk
 from tkinter import messagebox
 import traceback
@@ -9,10 +16,71 @@ import logging
 import tempfile
 
 
+class PerfilArranque:
+    """
+    Tiempos de las fases del arranque y, con --profile-startup, de cada importación de primer nivel
+    Los tiempos de importación son inclusivos: pandas incluye el de numpy si lo importa por primera vez
+    """
+    
+    def __init__(self, detallado=False):
+        self.detallado = detallado
+        self.fases = []
+        self.importaciones = {}
+        self._ultimo = INICIO_LANZADOR
+        self._import_original = None
+        if detallado:
+            self._activar_medicion_importaciones()
+    
+    def _activar_medicion_importaciones(self):
+        self._import_original = builtins.__import__
+        importaciones = self.importaciones
+        import_original = self._import_original
+        
+        def importar_medido(name, globals=None, locals=None, fromlist=(), level=0):
+            raiz = name.partition('.')[0]
+            if level != 0 or raiz in sys.modules:
+                return import_original(name, globals, locals, fromlist, level)
+            inicio = time.perf_counter()
+            try:
+                return import_original(name, globals, locals, fromlist, level)
+            finally:
+                importaciones[raiz] = importaciones.get(raiz, 0.0) + time.perf_counter() - inicio
+        
+        builtins.__import__ = importar_medido
+    
+    def fase(self, nombre):
+        """Cerrar la fase actual del arranque"""
+        ahora = time.perf_counter()
+        self.fases.append((nombre, ahora - self._ultimo))
+        self._ultimo = ahora
+    
+    def total(self):
+        return self._ultimo - INICIO_LANZADOR
+    
+    def reporte(self, max_importaciones=15):
+        """Texto con el desglose del arranque"""
+        if self._import_original is not None:
+            builtins.__import__ = self._import_original
+            self._import_original = None
+        
+        lineas = ["DESGLOSE DEL ARRANQUE", "-" * 50]
+        for nombre, segundos in self.fases:
+            lineas.append(f"  {nombre:<32} {segundos * 1000:8.1f} ms")
+        lineas.append(f"  {'Total hasta la primera ventana':<32} {self.total() * 1000:8.1f} ms")
+        
+        if self.importaciones:
+            lineas += ["", f"IMPORTACIONES MÁS COSTOSAS (inclusivas, top {max_importaciones})", "-" * 50]
+            for modulo, segundos in sorted(self.importaciones.items(), key=lambda x: -x[1])[:max_importaciones]:
+                lineas.append(f"  {modulo:<32} {segundos * 1000:8.1f} ms")
+        return "\n".join(lineas)
+
+
 class SAIDILauncher:
     """Lanzador principal con verificación de entorno y soporte PyInstaller"""
     
-    def __init__(self):
+    def __init__(self, profile_startup=False):
+        self.perfil = PerfilArranque(detallado=profile_startup)
+        
         # Detectar si está ejecutándose desde PyInstaller
         self.is_frozen = getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS')
         
@@ -37,6 +105,7 @@ class SAIDILauncher:
         self.logger.info(f"SAIDI Launcher iniciado - Modo: {self.mode}")
         self.logger.info(f"Directorio raíz: {self.project_root}")
         self.logger.info(f"Directorio ejecutable: {self.executable_dir}")
+        self.perfil.fase("Iniciar lanzador")
         
     def setup_logging(self):
         """Configurar sistema de logging adaptativo"""
@@ -266,13 +335,20 @@ class SAIDILauncher:
         
         missing_modules = []
         
+        # Solo se busca la especificación del módulo: importarlos aquí retrasaría la ventana
+        # varios segundos (la interfaz y los scripts los importan cuando los necesitan)
         for module_name, description in critical_modules:
             try:
-                __import__(module_name)
+                spec = importlib.util.find_spec(module_name)
+            except (ImportError, ValueError) as e:
+                spec, error = None, str(e)
+            else:
+                error = f"No module named '{module_name}'"
+            if spec is None:
+                missing_modules.append((module_name, description, error))
+                self.logger.error(f" {module_name}: FALTANTE ({error})")
+            else:
                 self.logger.debug(f"k {module_name}: Disponible")
-            except ImportError as e:
-                missing_modules.append((module_name, description, str(e)))
-                self.logger.error(f" {module_name}: FALTANTE ({e})")
 
         if missing_modules:
             if self.is_frozen:
@@ -353,6 +429,7 @@ class SAIDILauncher:
             try:
                 from main_interface import SAIDIAnalysisApp
                 self.logger.info("Módulos principales importados correctamente")
+                self.perfil.fase("Importar interfaz")
             except ImportError as e:
                 self.logger.error(f"Error importando main_interface: {e}")
                 
@@ -420,6 +497,10 @@ class SAIDILauncher:
             # Crear instancia de la aplicación
             self.logger.info("Inicializando interfaz principal...")
             app = SAIDIAnalysisApp(root)
+            self.perfil.fase("Crear ventana e interfaz")
+            
+            # El primer callback del loop de tkinter llega con la ventana ya dibujada
+            root.after(0, self.report_first_window)
             
             # Información de inicio exitoso
             self.logger.info("="*50)
@@ -477,6 +558,13 @@ class SAIDILauncher:
             self.logger.error(f"TRACEBACK COMPLETO:\n{traceback.format_exc()}")
             self.show_error_dialog("Error de Inicio", error_msg)
             
+    def report_first_window(self):
+        """Registrar el tiempo hasta la primera ventana (y el desglose con --profile-startup)"""
+        self.perfil.fase("Mostrar primera ventana")
+        self.logger.info(f"Tiempo hasta la primera ventana: {self.perfil.total():.2f} s")
+        if self.perfil.detallado:
+            print("\n" + self.perfil.reporte() + "\n")
+    
     def run(self):
         """Ejecutar el launcher completo"""
         print("=" * 60)
@@ -497,10 +585,12 @@ class SAIDILauncher:
             return False
             
         print("Estructura del proyecto verificada")
+        self.perfil.fase("Verificar estructura")
         
         # Paso 2: Configurar paths
         self.setup_python_path()
         print("Paths de Python configurados")
+        self.perfil.fase("Configurar paths")
         
         # Paso 3: Verificar dependencias  
         if not self.verify_dependencies():
@@ -510,6 +600,7 @@ class SAIDILauncher:
             return False
             
         print("Dependencias verificadas")
+        self.perfil.fase("Verificar dependencias")
         
         print()
         print("=" * 60)
@@ -546,7 +637,7 @@ def main():
     """Función principal del launcher"""
     launcher = None
     try:
-        launcher = SAIDILauncher()
+        launcher = SAIDILauncher(profile_startup='--profile-startup' in sys.argv[1:])
         success = launcher.run()
         
         if success:
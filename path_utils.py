@@ -280,6 +280,18 @@ def get_visual_script() -> str:
     """Ruta al script visual.py"""
     return path_manager.get_backend_script("visual.py")
 
+def get_analisis_script() -> str:
+    """Ruta al script analisis_combinado.py"""
+    return path_manager.get_backend_script("analisis_combinado.py")
+
+def get_servidor_script() -> str:
+    """Ruta al script servidor_analisis.py (trabajador persistente de la interfaz)"""
+    return path_manager.get_backend_script("servidor_analisis.py")
+
+def get_lote_script() -> str:
+    """Ruta al script lote_circuitos.py"""
+    return path_manager.get_backend_script("lote_circuitos.py")
+
 def get_bridge_script() -> str:
     """Ruta al script parametros_bridge.py"""
     return path_manager.get_backend_script("parametros_bridge.py")
@@ -0,0 +1,43 @@
+# tests/test_cache_ajustes.py - Arranque en caliente desde la cache de ajustes
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import cache_ajustes
+from cache_ajustes import CacheAjustes, huella_serie, parametros_iniciales
+from perfiles_ajuste import crear_modelo_sarimax, PERFIL_POR_DEFECTO
+
+
+@pytest.fixture
+def cache_temporal(tmp_path, monkeypatch):
+    """Cache de ajustes aislada, sin ajustes recientes en memoria"""
+    monkeypatch.delenv(cache_ajustes.VARIABLE_DESACTIVAR, raising=False)
+    cache = CacheAjustes(ruta=str(tmp_path / "cache.sqlite"))
+    monkeypatch.setattr(cache_ajustes, '_CACHE_GLOBAL', cache)
+    monkeypatch.setattr(cache_ajustes, '_AJUSTES_RECIENTES', type(cache_ajustes._AJUSTES_RECIENTES)())
+    yield cache
+    cache.cerrar()
+
+
+def test_arranque_desde_vecino_guardado_con_serie_fechada(cache_temporal):
+    rng = np.random.default_rng(0)
+    serie = pd.Series(rng.normal(10.0, 1.0, 48), index=pd.date_range('2020-01-01', periods=48, freq='MS'))
+    seasonal_order = (0, 0, 0, 12)
+
+    # Otro worker guardó el vecino (1, 0, 0) ajustado sobre la serie con fechas
+    cache_temporal.guardar(serie, (1, 0, 0), seasonal_order, params=np.array([0.4, 2.5]), aic=1.0, bic=1.0)
+
+    # La grilla ajusta el array sin fechas del corte, con la huella de la serie con fechas
+    datos = serie.to_numpy()
+    assert huella_serie(datos) != huella_serie(serie)
+    model = crear_modelo_sarimax(datos, (1, 0, 1), seasonal_order, PERFIL_POR_DEFECTO)
+
+    start_params, origen = parametros_iniciales(model, datos, (1, 0, 1), seasonal_order, huella_serie(serie))
+
+    assert origen == ((1, 0, 0), seasonal_order)
+    np.testing.assert_allclose(start_params, [0.4, 0.0, 2.5])